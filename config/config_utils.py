@@ -1,7 +1,7 @@
 import datetime
 import os
 
-from config.user_info import UserConfigParser, UserInfo
+from config.user_info import UserConfigParser, UserIndex, UserInfo
 from feature.utils.logs import get_logger
 from feature.utils.common_utils import do_command
 
@@ -78,6 +78,9 @@ def get_users():
 
     logger.info(f"Final user count: {len(users_obj_dict)}")
 
+    # 用户列表(重新)加载后构建关键词索引
+    UserIndex.get(users_obj_dict)
+
     return users_obj_dict
 
 
@@ -10,12 +10,20 @@ import psutil
 from dotenv import dotenv_values, load_dotenv
 from group_center.core import group_center_machine
 from group_center.utils.log import logger as group_center_logger_utils
-from nvitop import Device
 from packaging import version
 
 from feature.utils.python_status import is_debug_mode
 from config.user_info import UserInfo
 from config.config_utils import get_users, set_iptables
+from feature.monitor.gpu.backend.base import (
+    DEVICE_BACKEND_NAME_TUPLE,
+    DeviceBackend,
+    create_device_backend,
+)
+from feature.monitor.gpu.backend.simulated_backend import (
+    SimulatedLoadProfile,
+    parse_utilization_script,
+)
 from feature.monitor.monitor_enum import AllWebhookName
 from feature.utils.logs import get_logger
 
@@ -200,11 +208,92 @@ IPv6 = EnvironmentManager.get_ip("v6")
 # GPU
 NO_NVIDIA_GPU = EnvironmentManager.get_bool("NO_NVIDIA_GPU", False)
 
+# GPU Device Backend("nvml" or "simulated")
+GPU_DEVICE_BACKEND = (
+    EnvironmentManager.get("GPU_DEVICE_BACKEND", "nvml").strip().lower()
+)
+if GPU_DEVICE_BACKEND not in DEVICE_BACKEND_NAME_TUPLE:
+    logger.error(
+        f"[var]GPU_DEVICE_BACKEND: Unsupported backend {GPU_DEVICE_BACKEND}, use nvml."
+    )
+    GPU_DEVICE_BACKEND = "nvml"
+SIMULATED_GPU_COUNT = EnvironmentManager.get_int("SIMULATED_GPU_COUNT", 8)
+SIMULATED_GPU_PROCESSES_PER_DEVICE = EnvironmentManager.get_int(
+    "SIMULATED_GPU_PROCESSES_PER_DEVICE", 4
+)
+SIMULATED_GPU_PROCESS_LIFETIME = EnvironmentManager.get_int(
+    "SIMULATED_GPU_PROCESS_LIFETIME", 600
+)
+SIMULATED_GPU_MEMORY_GB = EnvironmentManager.get_int("SIMULATED_GPU_MEMORY_GB", 24)
+if SIMULATED_GPU_MEMORY_GB <= 0:
+    logger.error(
+        f"[var]SIMULATED_GPU_MEMORY_GB: Must be positive, but get "
+        f"{SIMULATED_GPU_MEMORY_GB}, use 24."
+    )
+    SIMULATED_GPU_MEMORY_GB = 24
+SIMULATED_GPU_USERS = [
+    m.strip()
+    for m in EnvironmentManager.get("SIMULATED_GPU_USERS", "").split(",")
+    if m.strip()
+]
+SIMULATED_GPU_SEED = EnvironmentManager.get_int("SIMULATED_GPU_SEED", 0)
+# Simulated load profile, a sine wave unless a "seconds:utilization,..." script is given
+SIMULATED_GPU_UTILIZATION_BASE = EnvironmentManager.get_int(
+    "SIMULATED_GPU_UTILIZATION_BASE", 60
+)
+SIMULATED_GPU_UTILIZATION_AMPLITUDE = EnvironmentManager.get_int(
+    "SIMULATED_GPU_UTILIZATION_AMPLITUDE", 35
+)
+SIMULATED_GPU_UTILIZATION_PERIOD = EnvironmentManager.get_int(
+    "SIMULATED_GPU_UTILIZATION_PERIOD", 377
+)
+SIMULATED_GPU_UTILIZATION_NOISE = EnvironmentManager.get_int(
+    "SIMULATED_GPU_UTILIZATION_NOISE", 5
+)
+try:
+    SIMULATED_GPU_UTILIZATION_SCRIPT = parse_utilization_script(
+        EnvironmentManager.get("SIMULATED_GPU_UTILIZATION_SCRIPT", "")
+    )
+except ValueError as e:
+    logger.error(f"[var]SIMULATED_GPU_UTILIZATION_SCRIPT: {e}")
+    SIMULATED_GPU_UTILIZATION_SCRIPT = ()
+SIMULATED_GPU_MEMORY_RAMP_SECONDS = EnvironmentManager.get_int(
+    "SIMULATED_GPU_MEMORY_RAMP_SECONDS", 30
+)
+SIMULATED_GPU_MEMORY_WAVE_PERCENT = EnvironmentManager.get_int(
+    "SIMULATED_GPU_MEMORY_WAVE_PERCENT", 5
+)
+
+DEVICE_BACKEND: DeviceBackend = create_device_backend(
+    GPU_DEVICE_BACKEND,
+    **(
+        dict(
+            device_count=SIMULATED_GPU_COUNT,
+            processes_per_device=SIMULATED_GPU_PROCESSES_PER_DEVICE,
+            process_lifetime=SIMULATED_GPU_PROCESS_LIFETIME,
+            memory_total_gb=SIMULATED_GPU_MEMORY_GB,
+            user_name_list=SIMULATED_GPU_USERS,
+            seed=SIMULATED_GPU_SEED,
+            load_profile=SimulatedLoadProfile(
+                utilization_base=SIMULATED_GPU_UTILIZATION_BASE,
+                utilization_amplitude=SIMULATED_GPU_UTILIZATION_AMPLITUDE,
+                utilization_period=SIMULATED_GPU_UTILIZATION_PERIOD,
+                utilization_noise=SIMULATED_GPU_UTILIZATION_NOISE,
+                utilization_script=SIMULATED_GPU_UTILIZATION_SCRIPT,
+                memory_ramp_seconds=SIMULATED_GPU_MEMORY_RAMP_SECONDS,
+                memory_wave=SIMULATED_GPU_MEMORY_WAVE_PERCENT / 100,
+            ),
+        )
+        if GPU_DEVICE_BACKEND == "simulated"
+        else {}
+    ),
+)
+
 NUM_GPU = 0
 
 try:
     if not NO_NVIDIA_GPU:
-        NUM_GPU = Device.count()
+        NUM_GPU = DEVICE_BACKEND.count()
 except Exception:
     pass
 
@@ -246,6 +335,66 @@ GPU_MONITOR_SAMPLING_INTERVAL = EnvironmentManager.get_int(
     "GPU_MONITOR_SAMPLING_INTERVAL", 5
 )
 GPU_MONITOR_AUTO_RESTART = EnvironmentManager.get_bool("GPU_MONITOR_AUTO_RESTART", True)
+GPU_MONITOR_ADAPTIVE_SAMPLING = \
+    EnvironmentManager.get_bool("GPU_MONITOR_ADAPTIVE_SAMPLING", False)
+GPU_MONITOR_SAMPLING_INTERVAL_MIN = EnvironmentManager.get_int(
+    "GPU_MONITOR_SAMPLING_INTERVAL_MIN", 1
+)
+GPU_MONITOR_SAMPLING_INTERVAL_MAX = EnvironmentManager.get_int(
+    "GPU_MONITOR_SAMPLING_INTERVAL_MAX", 30
+)
+GPU_MONITOR_UTILIZATION_CHANGE_THRESHOLD = EnvironmentManager.get_int(
+    "GPU_MONITOR_UTILIZATION_CHANGE_THRESHOLD", 10
+)
+# 没有进程且核心占用低于此值时视为空闲
+GPU_MONITOR_IDLE_UTILIZATION_THRESHOLD = EnvironmentManager.get_int(
+    "GPU_MONITOR_IDLE_UTILIZATION_THRESHOLD", 5
+)
+GPU_MONITOR_CONCURRENT_UPDATE = \
+    EnvironmentManager.get_bool("GPU_MONITOR_CONCURRENT_UPDATE", False)
+GPU_MONITOR_MAX_WORKERS = EnvironmentManager.get_int("GPU_MONITOR_MAX_WORKERS", 8)
+GPU_MONITOR_DEVICE_TIMEOUT = EnvironmentManager.get_int(
+    "GPU_MONITOR_DEVICE_TIMEOUT", 10
+)
+# 新进程信息补全的后台线程数，0表示在监控线程中同步补全
+GPU_PROCESS_ENRICH_WORKERS = EnvironmentManager.get_int("GPU_PROCESS_ENRICH_WORKERS", 4)
+
+# Executable Metadata Cache(Python/CUDA version)
+EXECUTABLE_CACHE_SIZE = EnvironmentManager.get_int("EXECUTABLE_CACHE_SIZE", 256)
+EXECUTABLE_CACHE_FILE = EnvironmentManager.get("EXECUTABLE_CACHE_FILE", "")
+VERSION_DETECT_SUBPROCESS_FALLBACK = \
+    EnvironmentManager.get_bool("VERSION_DETECT_SUBPROCESS_FALLBACK", True)
+
+# GPU Metric History("resolution:retention" in seconds, comma separated)
+GPU_HISTORY_ENABLE = EnvironmentManager.get_bool("GPU_HISTORY_ENABLE", True)
+GPU_HISTORY_TIERS = EnvironmentManager.get(
+    "GPU_HISTORY_TIERS", "5:3600,60:86400,600:2592000"
+)
+
+# Per-task GPU/host memory timeline(number of samples kept per task)
+TASK_MEMORY_TIMELINE_SIZE = EnvironmentManager.get_int("TASK_MEMORY_TIMELINE_SIZE", 256)
+
+# Environment variables read from GPU task processes(comma separated)
+TASK_ENVIRON_KEYS = [
+    key.strip()
+    for key in EnvironmentManager.get(
+        "TASK_ENVIRON_KEYS",
+        "STY,CONDA_DEFAULT_ENV,WORLD_SIZE,LOCAL_RANK,"
+        "CUDA_VISIBLE_DEVICES,CUDA_HOME,CUDAToolkit_ROOT",
+    ).split(",")
+    if key.strip()
+]
+
+# Event Bus(max events queued for each subscriber, the oldest are dropped when full)
+EVENT_BUS_QUEUE_SIZE = EnvironmentManager.get_int("EVENT_BUS_QUEUE_SIZE", 256)
+
+# GPU Static Metadata Cache(name, TDP, driver version...)
+GPU_METADATA_CACHE_FILE = EnvironmentManager.get(
+    "GPU_METADATA_CACHE_FILE", "./sqlite_data/gpu_metadata.json"
+)
+GPU_METADATA_REFRESH_POLICY = EnvironmentManager.get(
+    "GPU_METADATA_REFRESH_POLICY", "driver"
+).lower()
 
 # Hard Disk Monitor
 HARD_DISK_MONITOR_PASS_ROOT_CHECK = \
@@ -275,7 +424,34 @@ GPU_BOARD_WEB_URL = EnvironmentManager.get("GPU_BOARD_WEB_URL", "")
 FLASK_LOG_DISABLE = EnvironmentManager.get_bool("FLASK_LOG_DISABLE", True)
 
 # FastAPI
-FASTAPI_SERVER_PORT = EnvironmentManager.get_int("FASTAPI_SERVER_PORT", 8000)
+FASTAPI_SERVER_PORT = EnvironmentManager.get_int("FASTAPI_SERVER_PORT", 8080)
+FASTAPI_SERVER_KEEP_ALIVE_SECONDS = EnvironmentManager.get_int(
+    "FASTAPI_SERVER_KEEP_ALIVE_SECONDS", 5
+)
+FASTAPI_SERVER_LIMIT_CONCURRENCY = EnvironmentManager.get_int(
+    "FASTAPI_SERVER_LIMIT_CONCURRENCY", 0
+)
+
+# API server backend: "flask"(development server) or "fastapi"(uvicorn)
+API_SERVER_BACKEND = EnvironmentManager.get("API_SERVER_BACKEND", "flask").lower()
+API_SERVER_PORT = (
+    FASTAPI_SERVER_PORT if API_SERVER_BACKEND == "fastapi" else FLASK_SERVER_PORT
+)
+
+# Delta responses(`since=<version>`), number of recent GPU state snapshots kept
+API_DELTA_HISTORY_SIZE = EnvironmentManager.get_int("API_DELTA_HISTORY_SIZE", 60)
+
+# Server-Sent Events(/stream)
+API_STREAM_HEARTBEAT_SECONDS = EnvironmentManager.get_int(
+    "API_STREAM_HEARTBEAT_SECONDS", 15
+)
+
+# /nvitop_output: "render"(in-process from the monitor state) or "command"
+NVITOP_OUTPUT_MODE = EnvironmentManager.get("NVITOP_OUTPUT_MODE", "render").lower()
+NVITOP_OUTPUT_COMMAND = EnvironmentManager.get("NVITOP_OUTPUT_COMMAND", "nvitop -U")
+NVITOP_OUTPUT_CACHE_SECONDS = EnvironmentManager.get_int(
+    "NVITOP_OUTPUT_CACHE_SECONDS", 2
+)
 
 # WebHook
 WEBHOOK_DELAY_SEND_SECONDS = EnvironmentManager.get_int(
@@ -305,7 +481,7 @@ WEBHOOK_LARK_DEV = EnvironmentManager.get("WEBHOOK_LARK_DEV", "")
 # User
 USERS: Dict[str, UserInfo] = get_users()
 if SUDO_PERMISSION:
-    set_iptables(FLASK_SERVER_PORT)
+    set_iptables(API_SERVER_PORT)
 
 # Fix URLs
 GROUP_CENTER_URL = EnvironmentManager.fix_url(GROUP_CENTER_URL)
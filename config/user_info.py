@@ -2,7 +2,10 @@
 
 import json
 import os
+import threading
+from functools import lru_cache
 from glob import glob
+from typing import Optional
 
 import chardet
 import yaml
@@ -25,20 +28,10 @@ class UserInfo:
 
     @staticmethod
     def find_user_by_path(users: dict, path: str, is_project_path: bool = False):
-        if is_project_path:
-            path = path.split("data")[1]
-        for path_unit in reversed(path.split("/")):
-            if path_unit == "":
-                continue
-            for user in users.values():
-                if any(
-                        path_unit.lower() == keyword.lower().strip()
-                        for keyword in user.keywords
-                ):
-                    return user
-        if is_project_path:
+        user = UserIndex.get(users).find_user_by_path(path, is_project_path)
+        if user is None and is_project_path:
             raise RuntimeWarning("未获取到任务用户名")
-        return None
+        return user
 
     @staticmethod
     def get_webhook_info(
@@ -64,6 +57,62 @@ class UserInfo:
         }
 
 
+class UserIndex:
+    """
+    用户关键词索引，将按路径查找用户从 O(用户数·关键词数·路径层级) 降为 O(路径层级)。
+    索引在用户列表加载后构建，用户列表对象替换或数量变化时自动重建。
+    """
+
+    PATH_CACHE_SIZE = 4096
+
+    _instance: Optional["UserIndex"] = None
+    _lock = threading.Lock()
+
+    def __init__(self, users: dict[str, UserInfo]) -> None:
+        self.users: dict[str, UserInfo] = users
+        self.user_count: int = len(users)
+
+        # 关键词(小写) -> 用户，多个用户有相同关键词时取先出现的用户
+        self.keyword_dict: dict[str, UserInfo] = {}
+        for user in users.values():
+            for keyword in user.keywords:
+                self.keyword_dict.setdefault(str(keyword).lower().strip(), user)
+
+        # 同一个工作目录/数据目录会被反复查找
+        self.find_user_by_path = lru_cache(maxsize=self.PATH_CACHE_SIZE)(
+            self._find_user_by_path
+        )
+
+    @classmethod
+    def get(cls, users: dict[str, UserInfo]) -> "UserIndex":
+        index = cls._instance
+        if index is not None and index.is_valid(users):
+            return index
+
+        with cls._lock:
+            index = cls._instance
+            if index is None or not index.is_valid(users):
+                index = cls(users)
+                cls._instance = index
+        return index
+
+    def is_valid(self, users: dict[str, UserInfo]) -> bool:
+        return users is self.users and len(users) == self.user_count
+
+    def _find_user_by_path(
+            self, path: str, is_project_path: bool = False
+    ) -> Optional[UserInfo]:
+        if is_project_path:
+            path = path.split("data")[1]
+        for path_unit in reversed(path.split("/")):
+            if path_unit == "":
+                continue
+            user = self.keyword_dict.get(path_unit.lower())
+            if user is not None:
+                return user
+        return None
+
+
 class UserConfigParser:
     def get_user_info_by_json_from_directory(self):
         pass
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+GPU监控周期(tick)压测。
+
+使用模拟GPU后端与虚拟时钟驱动 `NvidiaMonitor.update_all_gpu`(即 `gpu_monitor_thread`
+中每个周期对所有GPU执行的 `GPU.update`)，按 GPU数量 × 每卡进程数 × 进程更替率 扫描，
+统计每个周期的耗时(p50/p99)、内存分配与子进程数量，并将结果保存为JSON，
+便于在不同提交之间对比。
+
+用法:
+    python dev/benchmark_monitor_tick.py
+    python dev/benchmark_monitor_tick.py --devices 1,8 --processes 4,64 --churn 0,0.2
+    python dev/benchmark_monitor_tick.py --output new.json --compare old.json
+
+进程更替率(churn)为每个周期结束并被新进程替换的进程比例，0表示进程不结束。
+压测在临时目录中运行，不会写入项目的 `log`、`sqlite_data` 目录。
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+path_base = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+SIMULATED_USER_COUNT = 8
+SIMULATED_USER_NAME_LIST = [f"sim_user{idx}" for idx in range(SIMULATED_USER_COUNT)]
+
+
+class VirtualClock:
+    """压测用的虚拟时钟，每个周期手动前进一个采样间隔"""
+
+    def __init__(self, start: float) -> None:
+        self.now: float = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SubprocessCounter:
+    """统计创建的子进程数量(`subprocess.Popen` 是 `os.popen`、`subprocess.run` 等的基础)"""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self._original_init = subprocess.Popen.__init__
+
+    def install(self) -> None:
+        counter = self
+        original_init = self._original_init
+
+        def counting_init(popen_self, *args, **kwargs):
+            counter.count += 1
+            original_init(popen_self, *args, **kwargs)
+
+        subprocess.Popen.__init__ = counting_init
+
+    def uninstall(self) -> None:
+        subprocess.Popen.__init__ = self._original_init
+
+
+def prepare_work_dir(work_dir: str, enrich_workers: int) -> None:
+    """在工作目录中准备模拟用户与环境变量，需在导入项目模块之前调用"""
+    users_dir = os.path.join(work_dir, "config", "users")
+    os.makedirs(users_dir, exist_ok=True)
+
+    user_yaml_line_list = ["version: 200", "enable: True", "", "userList:"]
+    for user_name in SIMULATED_USER_NAME_LIST:
+        user_yaml_line_list.extend(
+            [
+                f'  - name: "{user_name}"',
+                f'    nameEng: "{user_name}"',
+                f'    keywords: [ "{user_name}" ]',
+            ]
+        )
+    with open(os.path.join(users_dir, "simulated.yaml"), "w", encoding="utf-8") as f:
+        f.write("\n".join(user_yaml_line_list) + "\n")
+
+    # 工作目录中的 .env.dev/.env.secure 会覆盖项目 .env 中的配置
+    env_line_list = [
+        'WEBHOOK_NAME=""',
+        "USE_GROUP_CENTER=False",
+        "USER_FROM_LOCAL_FILES=True",
+        "GPU_MONITOR_CONCURRENT_UPDATE=False",
+        f"GPU_PROCESS_ENRICH_WORKERS={enrich_workers}",
+        'EXECUTABLE_CACHE_FILE=""',
+    ]
+    for env_file_name in (".env.dev", ".env.secure"):
+        with open(os.path.join(work_dir, env_file_name), "w", encoding="utf-8") as f:
+            f.write("\n".join(env_line_list) + "\n")
+
+
+def percentile(value_list: list[float], percent: float) -> float:
+    if not value_list:
+        return 0.0
+    sorted_value_list = sorted(value_list)
+    index = (len(sorted_value_list) - 1) * percent / 100
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_value_list) - 1)
+    return sorted_value_list[lower] + (
+            sorted_value_list[upper] - sorted_value_list[lower]
+    ) * (index - lower)
+
+
+def run_case(
+        num_gpu: int,
+        processes_per_device: int,
+        churn: float,
+        ticks: int,
+        warmup_ticks: int,
+        alloc_ticks: int,
+        interval: float,
+        seed: int,
+) -> dict:
+    from feature.global_variable.gpu import global_gpu_history
+    from feature.monitor.gpu.backend.simulated_backend import SimulatedDeviceBackend
+    from feature.monitor.gpu.gpu import enrich_executor
+    from feature.monitor.gpu.monitor import NvidiaMonitor, init_global_gpu_var
+    from feature.sql.sqlite import get_sql
+
+    sql = get_sql()
+
+    # 平均寿命 = 采样间隔 / 更替率
+    process_lifetime = interval / churn if churn > 0 else 1e12
+
+    clock = VirtualClock(time.time())
+    backend = SimulatedDeviceBackend(
+        device_count=num_gpu,
+        processes_per_device=processes_per_device,
+        process_lifetime=process_lifetime,
+        user_name_list=SIMULATED_USER_NAME_LIST,
+        seed=seed,
+        clock=clock,
+    )
+
+    global_gpu_history.clear()
+    init_global_gpu_var(num_gpu)
+    for idx in range(num_gpu):
+        sql.create_table(idx)
+
+    monitor = NvidiaMonitor(num_gpu, backend)
+    # 跳过首个周期的启动检查，只测量稳定运行时的周期
+    monitor.monitor_launch_flag = False
+
+    subprocess_counter = SubprocessCounter()
+    subprocess_counter.install()
+
+    def tick() -> float:
+        clock.advance(interval)
+        start_time = time.perf_counter()
+        monitor.update_all_gpu()
+        return time.perf_counter() - start_time
+
+    def wait_enrich() -> None:
+        # 等待后台补全完成，避免其计入下一个周期
+        for gpu in monitor.gpu_obj_dict.values():
+            for future in list(gpu.enrich_future_dict.values()):
+                future.result()
+
+    try:
+        for _ in range(warmup_ticks):
+            tick()
+            wait_enrich()
+
+        subprocess_counter.count = 0
+        latency_list = []
+        for _ in range(ticks):
+            latency_list.append(tick())
+            if enrich_executor is not None:
+                wait_enrich()
+        subprocess_count = subprocess_counter.count
+
+        # 内存分配单独测量，避免tracemalloc的开销影响耗时统计
+        alloc_peak_list = []
+        alloc_net_list = []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_ticks):
+                wait_enrich()
+                tracemalloc.reset_peak()
+                current_before, _ = tracemalloc.get_traced_memory()
+                tick()
+                current_after, peak = tracemalloc.get_traced_memory()
+                alloc_peak_list.append(peak - current_before)
+                alloc_net_list.append(current_after - current_before)
+        finally:
+            tracemalloc.stop()
+        wait_enrich()
+    finally:
+        subprocess_counter.uninstall()
+
+    latency_ms_list = [latency * 1000 for latency in latency_list]
+    return {
+        "devices": num_gpu,
+        "processes_per_device": processes_per_device,
+        "churn": churn,
+        "ticks": ticks,
+        "tick_ms_p50": round(percentile(latency_ms_list, 50), 4),
+        "tick_ms_p99": round(percentile(latency_ms_list, 99), 4),
+        "tick_ms_mean": round(statistics.fmean(latency_ms_list), 4),
+        "tick_ms_max": round(max(latency_ms_list), 4),
+        "alloc_peak_kib_p50": round(percentile(alloc_peak_list, 50) / 1024, 2),
+        "alloc_net_kib_mean": round(
+            statistics.fmean(alloc_net_list) / 1024 if alloc_net_list else 0.0, 2
+        ),
+        "subprocess_per_tick": round(subprocess_count / max(1, ticks), 4),
+    }
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=path_base,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def get_case_key(result: dict) -> tuple:
+    return result["devices"], result["processes_per_device"], result["churn"]
+
+
+def print_result_table(result_list: list[dict], baseline_list: list[dict]) -> None:
+    baseline_dict = {get_case_key(result): result for result in baseline_list}
+
+    header = (
+        f"{'devices':>7} {'procs':>5} {'churn':>5} "
+        f"{'p50(ms)':>9} {'p99(ms)':>9} {'alloc(KiB)':>10} {'subproc':>7}"
+    )
+    if baseline_dict:
+        header += f" {'p50 diff':>9} {'p99 diff':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for result in result_list:
+        line = (
+            f"{result['devices']:>7} {result['processes_per_device']:>5} "
+            f"{result['churn']:>5} "
+            f"{result['tick_ms_p50']:>9.3f} {result['tick_ms_p99']:>9.3f} "
+            f"{result['alloc_peak_kib_p50']:>10.1f} "
+            f"{result['subprocess_per_tick']:>7.2f}"
+        )
+        baseline = baseline_dict.get(get_case_key(result))
+        if baseline is not None:
+            for key in ("tick_ms_p50", "tick_ms_p99"):
+                if baseline[key] > 0:
+                    diff = (result[key] - baseline[key]) / baseline[key] * 100
+                    line += f" {diff:>+8.1f}%"
+                else:
+                    line += f" {'-':>9}"
+        print(line)
+
+
+def parse_list(text: str, value_type: type) -> list:
+    return [value_type(m.strip()) for m in text.split(",") if m.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GPU monitor tick benchmark")
+    parser.add_argument("--devices", default="1,4,8,16", help="GPU数量，逗号分隔")
+    parser.add_argument("--processes", default="4,32,128", help="每卡进程数，逗号分隔")
+    parser.add_argument("--churn", default="0,0.1,0.5", help="进程更替率，逗号分隔")
+    parser.add_argument("--ticks", type=int, default=50, help="每组测量的周期数")
+    parser.add_argument("--warmup", type=int, default=3, help="预热周期数")
+    parser.add_argument("--alloc-ticks", type=int, default=5, help="测量内存分配的周期数")
+    parser.add_argument("--interval", type=float, default=5.0, help="虚拟采样间隔(秒)")
+    parser.add_argument(
+        "--enrich-workers",
+        type=int,
+        default=0,
+        help="后台补全进程信息的线程数，0表示在周期内同步补全",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output",
+        default=os.path.join(os.getcwd(), "benchmark_monitor_tick.json"),
+        help="结果JSON路径",
+    )
+    parser.add_argument("--compare", default="", help="与之前保存的结果JSON对比")
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else ""
+
+    work_dir = tempfile.mkdtemp(prefix="nvi_notify_benchmark_")
+    prepare_work_dir(work_dir, args.enrich_workers)
+    os.chdir(work_dir)
+    os.environ.setdefault("DEBUG", "0")
+    sys.path.insert(0, path_base)
+
+    from feature.utils.logs import get_logger
+
+    # 压测时只输出警告以上的日志
+    logger = get_logger()
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    result_list = []
+    for num_gpu in parse_list(args.devices, int):
+        for processes_per_device in parse_list(args.processes, int):
+            for churn in parse_list(args.churn, float):
+                result = run_case(
+                    num_gpu=num_gpu,
+                    processes_per_device=processes_per_device,
+                    churn=churn,
+                    ticks=max(1, args.ticks),
+                    warmup_ticks=max(0, args.warmup),
+                    alloc_ticks=max(0, args.alloc_ticks),
+                    interval=args.interval,
+                    seed=args.seed,
+                )
+                result_list.append(result)
+                print(
+                    f"devices={num_gpu} procs={processes_per_device} churn={churn}: "
+                    f"p50={result['tick_ms_p50']:.3f}ms "
+                    f"p99={result['tick_ms_p99']:.3f}ms",
+                    flush=True,
+                )
+
+    output_dict = {
+        "meta": {
+            "commit": get_git_commit(),
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": result_list,
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(output_dict, f, indent=2, ensure_ascii=False)
+
+    baseline_list = []
+    if compare_path:
+        with open(compare_path, "r", encoding="utf-8") as f:
+            baseline_list = json.load(f).get("results", [])
+
+    print()
+    print_result_table(result_list, baseline_list)
+    print()
+    print(f"Saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
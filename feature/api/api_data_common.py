@@ -1,13 +1,22 @@
-import subprocess
-from typing import List
+import time
+from typing import Hashable, Iterable, List, Optional
+
+import numpy as np
 
 from feature.global_variable.gpu import (
-    global_gpu_info,
-    global_gpu_task,
-    global_gpu_usage,
+    GpuStateSnapshot,
+    get_gpu_state_snapshot,
+    get_gpu_state_snapshot_by_version,
+    global_gpu_history,
+)
+from feature.api.api_nvitop_output import get_nvitop_output
+from feature.monitor.gpu.task.memory_timeline import TaskMemoryStats
+from feature.monitor.gpu.task.task_record import TaskRecord
+from feature.global_variable.system import global_system_info, get_system_info_version
+from feature.global_variable.disk_status import (
+    get_disk_info_response_dict,
+    get_disk_info_version,
 )
-from feature.global_variable.system import global_system_info
-from feature.global_variable.disk_status import disk_info_response_dict
 
 from group_center.core.feature.machine_user_message \
     import machine_user_message_directly
@@ -17,16 +26,8 @@ from feature.utils.logs import get_logger
 logger = get_logger()
 
 
-def run_command(command):
-    try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        return result.stdout
-    except Exception as e:
-        return str(e), 500
-
-
 def get_nvitop_result() -> str:
-    return run_command("nvitop -U")
+    return get_nvitop_output()
 
 
 def get_system_info_dict() -> dict:
@@ -43,21 +44,18 @@ def get_system_info_dict() -> dict:
 
 
 def get_gpu_count_backend() -> int:
-    # For debug use
-    current_gpu_task = global_gpu_task
-
-    return len(current_gpu_task)
+    return get_gpu_state_snapshot().gpu_count
 
 
-def get_gpu_usage_dict(gpu_index: int) -> dict:
-    # all_gpu_info = global_gpu_info
-    # all_gpu_usage = global_gpu_usage
-
-    current_gpu_info = global_gpu_info[gpu_index]
-    current_gpu_usage = global_gpu_usage[gpu_index]
+def get_gpu_usage_dict(gpu_index: int, snapshot: GpuStateSnapshot = None) -> dict:
+    """
+    :param snapshot: 读取的状态快照，默认为最新发布的快照
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+    gpu_state = snapshot.gpu_state_list[gpu_index]
 
     response_gpu_usage = {
-        "result": len(global_gpu_usage),
+        "result": snapshot.gpu_count,
         "gpuName": "Test GPU",
         "coreUsage": "0",
         "memoryUsage": "0",
@@ -68,50 +66,302 @@ def get_gpu_usage_dict(gpu_index: int) -> dict:
         "gpuTemperature": "0",
     }
 
-    response_gpu_usage.update(current_gpu_info)
-    response_gpu_usage.update(current_gpu_usage)
+    response_gpu_usage.update(gpu_state.info)
+    response_gpu_usage.update(gpu_state.usage)
 
     return response_gpu_usage
 
 
-def get_gpu_task_dict_list(gpu_index: int) -> List[dict]:
-    from feature.monitor.gpu.gpu_process import GPUProcessInfo
+def get_task_dict(task_record: TaskRecord) -> dict:
+    """任务信息，不含显存/内存统计"""
+    return {
+        "id": task_record.pid,
+        "name": task_record.user.name_cn,
+        "debugMode": task_record.is_debug,
+        "projectDirectory": task_record.cwd,
+        "projectName": task_record.project_name,
+        "pyFileName": task_record.python_file,
+        "runTime": task_record.running_time_human,
+        "startTimestamp": int(task_record.start_time) * 1000,
+        "gpuMemoryUsage": int(task_record.task_gpu_memory >> 10 >> 10),
+        "gpuMemoryUsageMax": int(task_record.task_gpu_memory_max >> 10 >> 10),
+        "worldSize": task_record.world_size,
+        "localRank": task_record.local_rank,
+        "condaEnv": task_record.conda_env,
+        "screenSessionName": task_record.screen_session_name,
+        "pythonVersion": task_record.python_version,
+        "command": task_record.command,
+        "taskMainMemoryMB": int(task_record.task_main_memory_mb),
+        "cudaRoot": str(task_record.cuda_root),
+        "cudaVersion": str(task_record.cuda_version),
+        "cudaVisibleDevices": str(task_record.cuda_visible_devices),
+        "driverVersion": str(task_record.nvidia_driver_version),
+        "environ": dict(task_record.environ),
+    }
+
+
+def get_task_dict_with_memory_stats(task_record: TaskRecord) -> dict:
+    memory_stats = task_record.memory_stats or TaskMemoryStats()
+    return {**get_task_dict(task_record), **memory_stats.to_dict()}
+
 
-    current_gpu_processes: list[GPUProcessInfo] = global_gpu_task[gpu_index]
+def get_gpu_task_dict_list(
+        gpu_index: int, snapshot: GpuStateSnapshot = None
+) -> List[dict]:
+    """
+    :param snapshot: 读取的状态快照，默认为最新发布的快照
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+    gpu_state = snapshot.gpu_state_list[gpu_index]
 
     task_list = []
 
-    for process_obj in current_gpu_processes:
-        task_list.append(
-            {
-                "id": process_obj.pid,
-                "name": process_obj.user.name_cn,
-                "debugMode": process_obj.is_debug,
-                "projectDirectory": process_obj.cwd,
-                "projectName": process_obj.project_name,
-                "pyFileName": process_obj.python_file,
-                "runTime": process_obj.running_time_human,
-                "startTimestamp": int(process_obj.start_time) * 1000,
-                "gpuMemoryUsage": int(process_obj.task_gpu_memory >> 10 >> 10),
-                "gpuMemoryUsageMax": int(process_obj.task_gpu_memory_max >> 10 >> 10),
-                "worldSize": process_obj.world_size,
-                "localRank": process_obj.local_rank,
-                "condaEnv": process_obj.conda_env,
-                "screenSessionName": process_obj.screen_session_name,
-                "pythonVersion": process_obj.python_version,
-                "command": process_obj.command,
-                "taskMainMemoryMB": int(process_obj.task_main_memory_mb),
-                "cudaRoot": str(process_obj.cuda_root),
-                "cudaVersion": str(process_obj.cuda_version),
-                "cudaVisibleDevices": str(process_obj.cuda_visible_devices),
-                "driverVersion": str(process_obj.nvidia_driver_version),
-            }
-        )
+    for task_record in gpu_state.task_list:
+        task_list.append(get_task_dict_with_memory_stats(task_record))
 
     return task_list
 
 
+def get_gpu_state_dict_list(
+        gpu_index_list: Iterable[int],
+        snapshot: GpuStateSnapshot = None,
+        with_usage: bool = True,
+        with_task: bool = True,
+) -> List[dict]:
+    """
+    多个GPU的使用情况与任务列表，用于 `/snapshot` 与 `/stream`。
+    :param snapshot: 读取的状态快照，默认为最新发布的快照
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+
+    gpu_list = []
+    for gpu_index in gpu_index_list:
+        gpu_dict = {"gpuIndex": gpu_index}
+        if with_usage:
+            gpu_dict["usage"] = get_gpu_usage_dict(gpu_index, snapshot)
+        if with_task:
+            gpu_dict["taskList"] = get_gpu_task_dict_list(gpu_index, snapshot)
+        gpu_list.append(gpu_dict)
+
+    return gpu_list
+
+
+# `/snapshot` 可选的字段(`fields=`)
+SNAPSHOT_FIELD_TUPLE: tuple[str, ...] = ("system", "disk", "usage", "task")
+
+
+def parse_snapshot_fields(fields_str: Optional[str]) -> tuple[str, ...]:
+    """
+    :param fields_str: 逗号分隔的字段名，如 `usage,task`，为空表示全部
+    :raise ValueError: 包含未知字段
+    """
+    if fields_str is None or fields_str.strip() == "":
+        return SNAPSHOT_FIELD_TUPLE
+
+    field_set = {field.strip() for field in fields_str.split(",") if field.strip()}
+    invalid_field_list = sorted(field_set.difference(SNAPSHOT_FIELD_TUPLE))
+    if len(invalid_field_list) > 0:
+        raise ValueError(f"Invalid fields: {invalid_field_list}")
+
+    # 按固定顺序排列，相同的字段组合共享一份缓存
+    return tuple(field for field in SNAPSHOT_FIELD_TUPLE if field in field_set)
+
+
+def get_snapshot_version(
+        field_tuple: tuple[str, ...], snapshot: GpuStateSnapshot
+) -> Hashable:
+    """`/snapshot` 的数据版本，只包含所选字段对应的数据源"""
+    return (
+        snapshot.version,
+        get_system_info_version() if "system" in field_tuple else None,
+        get_disk_info_version() if "disk" in field_tuple else None,
+    )
+
+
+def get_snapshot_dict(
+        field_tuple: tuple[str, ...] = SNAPSHOT_FIELD_TUPLE,
+        snapshot: GpuStateSnapshot = None,
+) -> dict:
+    """
+    `/snapshot` 的响应，一次返回系统信息、硬盘使用情况及所有GPU的使用情况与任务列表。
+    :param field_tuple: 见 `parse_snapshot_fields`
+    :param snapshot: 读取的状态快照，默认为最新发布的快照
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+
+    snapshot_dict = {
+        "result": snapshot.gpu_count,
+        "version": snapshot.version,
+        "timestamp": int(snapshot.timestamp * 1000),
+    }
+    if "system" in field_tuple:
+        snapshot_dict["systemInfo"] = get_system_info_dict()
+    if "disk" in field_tuple:
+        snapshot_dict["diskUsage"] = get_disk_usage_dict_list()
+    if "usage" in field_tuple or "task" in field_tuple:
+        snapshot_dict["gpuList"] = get_gpu_state_dict_list(
+            range(snapshot.gpu_count),
+            snapshot,
+            with_usage="usage" in field_tuple,
+            with_task="task" in field_tuple,
+        )
+
+    return snapshot_dict
+
+
+def get_base_snapshot(
+        since: int, snapshot: GpuStateSnapshot
+) -> Optional[GpuStateSnapshot]:
+    """:return: 计算增量的基准快照，无法计算增量时为None"""
+    if since < 0 or since > snapshot.version:
+        return None
+    base_snapshot = get_gpu_state_snapshot_by_version(since)
+    if base_snapshot is None or base_snapshot.gpu_count != snapshot.gpu_count:
+        return None
+    return base_snapshot
+
+
+def get_gpu_usage_response_dict(
+        gpu_index: int, since: int = -1, snapshot: GpuStateSnapshot = None
+) -> dict:
+    """
+    `/gpu_usage_info` 的响应。
+    :param since: 客户端已有的快照版本，指定且仍在保留范围内时只返回变化的字段
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+    usage_dict = get_gpu_usage_dict(gpu_index, snapshot)
+    base_snapshot = get_base_snapshot(since, snapshot)
+    if base_snapshot is None:
+        return {**usage_dict, "version": snapshot.version, "delta": False}
+
+    base_usage_dict = get_gpu_usage_dict(gpu_index, base_snapshot)
+    return {
+        "result": usage_dict["result"],
+        "version": snapshot.version,
+        "since": since,
+        "delta": True,
+        "changed": {
+            key: value
+            for key, value in usage_dict.items()
+            if base_usage_dict.get(key) != value
+        },
+    }
+
+
+def get_gpu_task_response_dict(
+        gpu_index: int, since: int = -1, snapshot: GpuStateSnapshot = None
+) -> dict:
+    """
+    `/gpu_task_info` 的响应。
+    :param since: 客户端已有的快照版本，指定且仍在保留范围内时只返回增量:
+        `removed` 为已结束任务的id，`added` 为新任务的完整信息，
+        `changed` 为仍在运行的任务中变化的字段(含id)。客户端应先处理 `removed`。
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+    base_snapshot = get_base_snapshot(since, snapshot)
+    if base_snapshot is None:
+        task_list = get_gpu_task_dict_list(gpu_index, snapshot)
+        return {
+            "result": len(task_list),
+            "taskList": task_list,
+            "version": snapshot.version,
+            "delta": False,
+        }
+
+    gpu_state = snapshot.gpu_state_list[gpu_index]
+    base_task_dict: dict[str, TaskRecord] = {
+        task_record.task_id: task_record
+        for task_record in base_snapshot.gpu_state_list[gpu_index].task_list
+    }
+
+    added_list = []
+    changed_list = []
+    for task_record in gpu_state.task_list:
+        base_task_record = base_task_dict.pop(task_record.task_id, None)
+        if base_task_record is None:
+            added_list.append(get_task_dict_with_memory_stats(task_record))
+            continue
+        if task_record == base_task_record:
+            continue
+
+        task_dict = get_task_dict_with_memory_stats(task_record)
+        base_dict = get_task_dict_with_memory_stats(base_task_record)
+        changed_dict = {
+            key: value for key, value in task_dict.items() if base_dict[key] != value
+        }
+        if len(changed_dict) > 0:
+            changed_list.append({"id": task_record.pid, **changed_dict})
+
+    return {
+        "result": len(gpu_state.task_list),
+        "version": snapshot.version,
+        "since": since,
+        "delta": True,
+        "added": added_list,
+        "changed": changed_list,
+        "removed": [task_record.pid for task_record in base_task_dict.values()],
+    }
+
+
+# API中的指标名 -> 历史记录中的指标名
+GPU_HISTORY_METRIC_NAME_DICT: dict[str, str] = {
+    "gpuUtilization": "gpu_utilization",
+    "memoryUtilization": "memory_utilization",
+    "memoryPercent": "memory_percent",
+    "memoryUsed": "memory_used",
+    "powerUsage": "power_usage",
+    "temperature": "temperature",
+}
+
+
+def get_gpu_history_dict(
+        gpu_index: int,
+        seconds: int = 3600,
+        resolution: int = 0,
+        metric_name_list: List[str] = None,
+) -> dict:
+    """
+    :param gpu_index: GPU序号
+    :param seconds: 查询最近多少秒
+    :param resolution: 期望的分辨率(秒)，0表示按时间范围自动选择
+    :param metric_name_list: 指标名(见 `GPU_HISTORY_METRIC_NAME_DICT`)，默认全部
+    """
+    history = global_gpu_history[gpu_index]
+    metric_name_list = metric_name_list or list(GPU_HISTORY_METRIC_NAME_DICT.keys())
+
+    end = time.time()
+    start = end - seconds
+    actual_resolution, timestamps, metric_dict, extrema_dict = history.query(
+        start,
+        end,
+        [GPU_HISTORY_METRIC_NAME_DICT[name] for name in metric_name_list],
+        resolution,
+    )
+
+    series_dict = {}
+    stats_dict = {}
+    for name in metric_name_list:
+        values = metric_dict[GPU_HISTORY_METRIC_NAME_DICT[name]]
+        series_dict[name] = [
+            None if np.isnan(value) else round(float(value), 2) for value in values
+        ]
+        stats_dict[name] = history.get_stats(
+            values, *extrema_dict[GPU_HISTORY_METRIC_NAME_DICT[name]]
+        )
+
+    return {
+        "result": len(timestamps),
+        "gpuIndex": gpu_index,
+        "resolution": actual_resolution,
+        "timestamps": [int(timestamp) * 1000 for timestamp in timestamps],
+        "series": series_dict,
+        "stats": stats_dict,
+    }
+
+
 def get_disk_usage_dict_list() -> List[dict]:
+    # 只读取一次引用，整个响应来自同一次发布
+    disk_info_response_dict = get_disk_info_response_dict()
     mount_point_list: List[str] = [
         key
         for key in disk_info_response_dict.keys()
@@ -138,3 +388,25 @@ def machine_user_message_backend(user_name: str, content: str):
         user_name=user_name,
         content=content
     )
+
+
+def get_machine_user_message_response_dict(
+        user_name: Optional[str], content: Optional[str]
+) -> dict:
+    """`/machine_user_message` 的响应，缺少参数时不发送"""
+    if not user_name or not content:
+        return {
+            "haveError": True,
+            "isSucceed": False,
+            "result": "error"
+        }
+
+    machine_user_message_backend(
+        user_name=user_name,
+        content=content,
+    )
+    return {
+        "haveError": False,
+        "isSucceed": True,
+        "result": "success"
+    }
@@ -0,0 +1,220 @@
+"""
+`/nvitop_output` 与首页的文本输出。
+
+默认在进程内由最新发布的GPU状态快照渲染类似 `nvitop -U` 的表格，
+不再为每个请求启动子进程(每次都要重新初始化NVML，耗时数百毫秒)。
+输出按TTL缓存，过期后并发请求只渲染一次，其余请求等待并共享结果。
+`NVITOP_OUTPUT_MODE="command"` 时仍执行外部命令，渲染失败时也回退到外部命令。
+"""
+
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional
+
+from config.settings import (
+    NVITOP_OUTPUT_CACHE_SECONDS,
+    NVITOP_OUTPUT_COMMAND,
+    NVITOP_OUTPUT_MODE,
+    SERVER_NAME,
+)
+from feature.global_variable.gpu import GpuStateSnapshot, get_gpu_state_snapshot
+from feature.global_variable.system import global_system_info
+from feature.utils.logs import get_logger
+
+logger = get_logger()
+
+# 进程表中命令列的最大宽度
+COMMAND_MAX_WIDTH = 48
+UTILIZATION_BAR_WIDTH = 20
+
+
+def run_command(command: str) -> str:
+    try:
+        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        return result.stdout
+    except Exception as e:
+        return str(e)
+
+
+class SingleFlightTtlCache:
+    """单个值的TTL缓存，过期后只有一个线程重新构建"""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds: float = ttl_seconds
+        # (过期时间, 值)，整体替换，读取时无需加锁
+        self._entry: Optional[tuple[float, str]] = None
+        self._lock = threading.Lock()
+
+    def _get_fresh(self) -> Optional[str]:
+        entry = self._entry
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+
+    def get(self, build: Callable[[], str]) -> str:
+        value = self._get_fresh()
+        if value is not None:
+            return value
+
+        with self._lock:
+            # 等待锁期间其他线程可能已经构建完毕
+            value = self._get_fresh()
+            if value is not None:
+                return value
+
+            value = build()
+            self._entry = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def clear(self) -> None:
+        self._entry = None
+
+
+def format_utilization_bar(percent, width: int = UTILIZATION_BAR_WIDTH) -> str:
+    try:
+        percent = min(max(float(percent), 0.0), 100.0)
+    except (TypeError, ValueError):
+        return "N/A".ljust(width + 7)
+    filled = round(percent / 100 * width)
+    return f"{'█' * filled}{'░' * (width - filled)} {percent:5.1f}%"
+
+
+def format_table(
+        title: str,
+        header_list: List[str],
+        row_list: List[List[str]],
+        empty_message: str = "",
+) -> List[str]:
+    """
+    :param title: 表格上方的标题行，为空时不显示
+    :param empty_message: 没有数据行时显示的内容
+    :return: 表格的每一行
+    """
+    width_list = [len(header) for header in header_list]
+    for row in row_list:
+        for i, cell in enumerate(row):
+            width_list[i] = max(width_list[i], len(cell))
+
+    def format_row(cell_list: List[str]) -> str:
+        return (
+                "| "
+                + " | ".join(
+                    cell.ljust(width) for cell, width in zip(cell_list, width_list)
+                )
+                + " |"
+        )
+
+    separator = "+" + "+".join("-" * (width + 2) for width in width_list) + "+"
+
+    line_list = []
+    if title:
+        line_list.append(title)
+    line_list.extend([separator, format_row(header_list), separator])
+    line_list.extend(format_row(row) for row in row_list)
+    if len(row_list) == 0 and empty_message:
+        line_list.append("| " + empty_message.ljust(len(separator) - 4) + " |")
+    line_list.append(separator)
+    return line_list
+
+
+def truncate(text: str, max_width: int) -> str:
+    text = " ".join(str(text).split())
+    if len(text) <= max_width:
+        return text
+    return text[: max_width - 1] + "…"
+
+
+def render_nvitop_output(
+        snapshot: GpuStateSnapshot = None, system_info: dict = None
+) -> str:
+    """
+    由GPU状态快照渲染类似 `nvitop -U` 的文本。
+    :param snapshot: 默认为最新发布的快照
+    :param system_info: 默认为 `global_system_info`
+    """
+    snapshot = snapshot or get_gpu_state_snapshot()
+    system_info = global_system_info if system_info is None else system_info
+
+    driver_version = ""
+    device_row_list = []
+    process_row_list = []
+    for gpu_index, gpu_state in enumerate(snapshot.gpu_state_list):
+        info, usage = gpu_state.info, gpu_state.usage
+        device_row_list.append(
+            [
+                str(gpu_index),
+                str(info.get("gpuName", "")),
+                f"{usage.get('gpuTemperature', 'N/A')}C",
+                f"{usage.get('gpuPowerUsage', 'N/A')}W / {info.get('gpuTDP', 'N/A')}W",
+                f"{usage.get('gpuMemoryUsage', 'N/A')} / {usage.get('gpuMemoryTotal', 'N/A')}",
+                format_utilization_bar(usage.get("memoryUsage")),
+                format_utilization_bar(usage.get("coreUsage")),
+            ]
+        )
+
+        for task_record in gpu_state.task_list:
+            driver_version = driver_version or task_record.nvidia_driver_version
+            user = task_record.user
+            process_row_list.append(
+                [
+                    str(gpu_index),
+                    str(task_record.pid),
+                    (user.name_eng or user.name_cn) if user is not None else "-",
+                    task_record.task_gpu_memory_human,
+                    f"{task_record.task_main_memory_mb}MiB",
+                    task_record.running_time_human,
+                    truncate(task_record.command, COMMAND_MAX_WIDTH),
+                ]
+            )
+
+    title = time.strftime("%a %b %d %H:%M:%S %Y", time.localtime(snapshot.timestamp))
+    if SERVER_NAME and SERVER_NAME != "None":
+        title = f"{SERVER_NAME}    {title}"
+    if driver_version:
+        title += f"    Driver Version: {driver_version}"
+
+    line_list = format_table(
+        title,
+        ["GPU", "Name", "Temp", "Pwr:Usage/Cap", "Memory-Usage", "MEM", "UTL"],
+        device_row_list,
+        empty_message="No devices found.",
+    )
+
+    memory_total = system_info.get("memoryPhysicTotalMb")
+    if memory_total:
+        line_list.append(
+            f"[ CPU MEM: {system_info.get('memoryPhysicUsedMb', 0)}MiB"
+            f" / {memory_total}MiB"
+            f"  SWP: {system_info.get('memorySwapUsedMb', 0)}MiB"
+            f" / {system_info.get('memorySwapTotalMb', 0)}MiB ]"
+        )
+
+    line_list.append("")
+    line_list.extend(
+        format_table(
+            "Processes:",
+            ["GPU", "PID", "USER", "GPU-MEM", "HOST-MEM", "TIME", "COMMAND"],
+            process_row_list,
+            empty_message="No running processes found.",
+        )
+    )
+    return "\n".join(line_list) + "\n"
+
+
+def build_nvitop_output() -> str:
+    if NVITOP_OUTPUT_MODE == "command":
+        return run_command(NVITOP_OUTPUT_COMMAND)
+
+    try:
+        return render_nvitop_output()
+    except Exception as e:
+        logger.warning(f"[nvitop output]Render failed, fallback to command: {e}")
+        return run_command(NVITOP_OUTPUT_COMMAND)
+
+
+nvitop_output_cache = SingleFlightTtlCache(NVITOP_OUTPUT_CACHE_SECONDS)
+
+
+def get_nvitop_output() -> str:
+    return nvitop_output_cache.get(build_nvitop_output)
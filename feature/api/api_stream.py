@@ -0,0 +1,168 @@
+"""
+Server-Sent Events(`/stream`)的公共部分，Flask与FastAPI共用。
+
+每个监控周期(GPU状态快照发布)推送一条 `gpu_state` 事件，包含所选GPU的使用情况与任务列表，
+事件ID为快照版本号。客户端重连时携带 `Last-Event-ID`，若期间没有新的快照则不重复推送。
+相同GPU筛选条件下的事件内容按快照版本缓存，所有连接共享。
+"""
+
+from typing import Iterator, Optional
+
+from config.settings import API_STREAM_HEARTBEAT_SECONDS
+from feature.api.api_data_common import get_gpu_state_dict_list
+from feature.api.response_cache import response_cache
+from feature.global_variable.event_bus import GpuStatePublished, Subscription, event_bus
+from feature.global_variable.gpu import GpuStateSnapshot, get_gpu_state_snapshot
+
+STREAM_EVENT_NAME = "gpu_state"
+# 客户端断开后的重连间隔
+STREAM_RETRY_MILLISECONDS = 3000
+# 只关心最新的快照，无需保留更多事件
+STREAM_QUEUE_SIZE = 2
+
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    # 禁止Nginx等反向代理缓冲
+    "X-Accel-Buffering": "no",
+}
+
+
+def parse_gpu_index_filter(gpu_index_str: Optional[str]) -> Optional[tuple[int, ...]]:
+    """
+    :param gpu_index_str: 逗号分隔的GPU序号，如 `0,2`，为空表示全部
+    :raise ValueError: 格式错误
+    """
+    if gpu_index_str is None or gpu_index_str.strip() == "":
+        return None
+
+    gpu_index_list = []
+    for index_str in gpu_index_str.split(","):
+        index_str = index_str.strip()
+        if not index_str.isdigit():
+            raise ValueError(f"Invalid GPU index: {index_str}")
+        gpu_index_list.append(int(index_str))
+    return tuple(sorted(set(gpu_index_list)))
+
+
+def parse_last_event_id(last_event_id: Optional[str]) -> int:
+    if last_event_id is None or not last_event_id.strip().isdigit():
+        return -1
+    return int(last_event_id.strip())
+
+
+def get_stream_data(
+        snapshot: GpuStateSnapshot, gpu_index_filter: Optional[tuple[int, ...]]
+) -> dict:
+    gpu_index_list = [
+        gpu_index
+        for gpu_index in range(snapshot.gpu_count)
+        if gpu_index_filter is None or gpu_index in gpu_index_filter
+    ]
+
+    gpu_list = get_gpu_state_dict_list(gpu_index_list, snapshot)
+
+    return {
+        "version": snapshot.version,
+        "timestamp": int(snapshot.timestamp * 1000),
+        "result": len(gpu_list),
+        "gpuList": gpu_list,
+    }
+
+
+def format_stream_event(
+        snapshot: GpuStateSnapshot, gpu_index_filter: Optional[tuple[int, ...]]
+) -> str:
+    cached_response = response_cache.get(
+        ("stream", gpu_index_filter),
+        snapshot.version,
+        lambda: get_stream_data(snapshot, gpu_index_filter),
+    )
+    return (
+        f"id: {snapshot.version}\n"
+        f"event: {STREAM_EVENT_NAME}\n"
+        f"data: {cached_response.body.decode('utf-8')}\n\n"
+    )
+
+
+def format_stream_heartbeat() -> str:
+    # 以冒号开头的行是注释，客户端会忽略
+    return ": heartbeat\n\n"
+
+
+class GpuStateStream:
+    """
+    单个SSE连接。
+
+    `subscribe` 后用 `next_event` 逐条获取要发送的文本，连接结束时必须调用 `close`。
+    """
+
+    def __init__(
+            self,
+            gpu_index_filter: Optional[tuple[int, ...]] = None,
+            last_event_id: int = -1,
+    ) -> None:
+        self.gpu_index_filter: Optional[tuple[int, ...]] = gpu_index_filter
+        # 已发送的快照版本
+        self.last_version: int = last_event_id
+        self.subscription: Optional[Subscription] = None
+
+    def subscribe(self, callback=None) -> None:
+        """
+        :param callback: 见 `Subscription`，asyncio中用于唤醒等待
+        """
+        self.subscription = event_bus.subscribe(
+            [GpuStatePublished], max_size=STREAM_QUEUE_SIZE, callback=callback
+        )
+
+    def close(self) -> None:
+        if self.subscription is not None:
+            event_bus.unsubscribe(self.subscription)
+            self.subscription = None
+
+    def get_first_event(self) -> str:
+        """连接建立后立即发送的内容"""
+        return f"retry: {STREAM_RETRY_MILLISECONDS}\n\n" + self.next_event()
+
+    def next_event(self) -> str:
+        """
+        有比已发送版本更新的快照时返回对应事件，否则返回空字符串。
+        事件队列只用于唤醒，始终发送最新发布的快照，中间的周期可能被合并。
+        """
+        if self.subscription is not None:
+            self.subscription.get_all()
+
+        snapshot = get_gpu_state_snapshot()
+        # 服务重启后版本号从头开始，客户端的 `Last-Event-ID` 可能更大，此时同样推送
+        if snapshot.version == self.last_version:
+            return ""
+
+        self.last_version = snapshot.version
+        return format_stream_event(snapshot, self.gpu_index_filter)
+
+    def iter_events(
+            self, heartbeat_seconds: float = API_STREAM_HEARTBEAT_SECONDS
+    ) -> Iterator[str]:
+        """阻塞式迭代，用于Flask等同步框架"""
+        self.subscribe()
+        try:
+            yield self.get_first_event()
+            while True:
+                if self.subscription.get(timeout=heartbeat_seconds) is None:
+                    yield format_stream_heartbeat()
+                    continue
+                event_str = self.next_event()
+                if event_str:
+                    yield event_str
+        finally:
+            self.close()
+
+
+def validate_gpu_index_filter(gpu_index_filter: Optional[tuple[int, ...]]) -> str:
+    """:return: 错误信息，无错误时为空字符串"""
+    if gpu_index_filter is None:
+        return ""
+    gpu_count = get_gpu_state_snapshot().gpu_count
+    invalid_index_list = [index for index in gpu_index_filter if index >= gpu_count]
+    if len(invalid_index_list) > 0:
+        return f"Invalid GPU Index(gpu_index): {invalid_index_list}"
+    return ""
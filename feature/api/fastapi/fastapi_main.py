@@ -1,7 +1,13 @@
+import asyncio
+import os
 from html import escape
+from typing import Optional
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+import requests
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from starlette.responses import RedirectResponse
 
@@ -12,67 +18,135 @@ app = FastAPI(
     docs_url='/docs',
     redoc_url='/redocs',
 )
-templates = Jinja2Templates(directory="templates")
+# 与Flask共用模板
+templates = Jinja2Templates(
+    directory=os.path.join(os.path.dirname(__file__), "..", "flask", "templates")
+)
 
-from config.settings import GPU_BOARD_WEB_URL, SERVER_NAME
+from config.settings import (
+    API_STREAM_HEARTBEAT_SECONDS,
+    GPU_BOARD_WEB_URL,
+    GPU_HISTORY_ENABLE,
+    SERVER_NAME,
+    WEB_SERVER_CORS_ENABLE,
+)
 
 from feature.api.api_data_common import *
+from feature.api.api_stream import (
+    STREAM_HEADERS,
+    GpuStateStream,
+    format_stream_heartbeat,
+    parse_gpu_index_filter,
+    parse_last_event_id,
+    validate_gpu_index_filter,
+)
+from feature.api.response_cache import CachedResponse, is_etag_matched, response_cache
+from feature.global_variable.disk_status import get_disk_info_version
+from feature.global_variable.gpu import get_gpu_state_snapshot
+from feature.global_variable.system import get_system_info_version
 
 from feature.utils.logs import get_logger
 
 logger = get_logger()
 logger.info("FastAPI server is starting...")
 
+if not WEB_SERVER_CORS_ENABLE:
+    # 与Flask一致，允许所有域进行跨源请求
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    logger.info("Set CORS for FastAPI server.")
 
-@app.get("/nvitop_output")
-def get_result():
-    command_result = get_nvitop_result()
+# 读取已发布的快照与缓存不会阻塞，直接在事件循环中处理；
+# 可能阻塞的操作(外部命令、网络请求、历史查询)放到线程池中执行。
+
+
+def get_int_query(request: Request, name_list: list[str], default=None):
+    """与Flask的 `request.args.get(name, type=int)` 一致，格式错误时返回默认值"""
+    for name in name_list:
+        value = request.query_params.get(name, None)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except ValueError:
+            return default
+    return default
+
+
+def get_gpu_index_query(request: Request) -> Optional[int]:
+    return get_int_query(request, ["gpu_index", "gpuIndex"])
+
+
+def error_response(message: str, status_code: int = 400) -> JSONResponse:
     return JSONResponse(
-        content={"result": escape(command_result)},
-        status_code=200,
+        content={"result": message},
+        status_code=status_code,
         media_type="application/json",
     )
 
 
-@app.post("/machine_user_message")
-def machine_user_message(request: Request):
-    final_data: dict = {
-        "haveError": True,
-        "isSucceed": False,
-        "result": "error"
+def cached_json_response(
+        request: Request, cached_response: CachedResponse
+) -> Response:
+    """返回缓存的JSON，客户端的 `If-None-Match` 与ETag一致时返回304"""
+    headers = {
+        "ETag": f'"{cached_response.etag}"',
+        # 允许浏览器缓存，但每次使用前都需要校验ETag
+        "Cache-Control": "no-cache",
     }
+    if is_etag_matched(request.headers.get("if-none-match"), cached_response.etag):
+        return Response(status_code=304, headers=headers)
 
-    user_name = request.form.get('userName')
-    content = request.form.get('content')
+    return Response(
+        content=cached_response.body,
+        status_code=200,
+        media_type="application/json",
+        headers=headers,
+    )
 
-    if user_name and content:
-        machine_user_message_backend(
-            user_name=user_name,
-            content=content,
-        )
-        final_data["haveError"] = False
-        final_data["isSucceed"] = True
-        final_data["result"] = "success"
 
+@app.get("/nvitop_output")
+async def get_nvitop_output():
+    # 使用外部命令时会阻塞
+    command_result = await run_in_threadpool(get_nvitop_result)
     return JSONResponse(
-        content=final_data,
+        content={"result": escape(command_result)},
         status_code=200,
         media_type="application/json",
     )
 
 
-@app.get("/system_info")
-def get_system_info():
-    system_info: dict = get_system_info_dict()
+@app.post("/machine_user_message")
+async def post_machine_user_message(request: Request):
+    form = await request.form()
+    final_data = await run_in_threadpool(
+        get_machine_user_message_response_dict,
+        user_name=form.get('userName'),
+        content=form.get('content'),
+    )
+
     return JSONResponse(
-        content=system_info,
+        content=final_data,
         status_code=200,
         media_type="application/json",
     )
 
 
+@app.get("/system_info")
+async def get_system_info(request: Request):
+    cached_response = response_cache.get(
+        "system_info", get_system_info_version(), get_system_info_dict
+    )
+
+    return cached_json_response(request, cached_response)
+
+
 @app.get("/gpu_count")
-def get_gpu_count():
+async def get_gpu_count():
     return JSONResponse(
         content={"result": get_gpu_count_backend()},
         status_code=200,
@@ -81,39 +155,194 @@ def get_gpu_count():
 
 
 @app.get("/gpu_usage_info")
-def get_gpu_usage(request: Request):
-    gpu_index = request.query_params.get("gpu_index", None)
-    if gpu_index is None or not gpu_index.isdigit() or int(gpu_index) > get_gpu_count_backend():
-        return JSONResponse(
-            content={"result": "Invalid GPU Index(gpu_index)."},
-            status_code=400,
-            media_type="application/json",
+async def get_gpu_usage_info(request: Request):
+    gpu_index = get_gpu_index_query(request)
+
+    snapshot = get_gpu_state_snapshot()
+    if gpu_index is None or not 0 <= gpu_index < snapshot.gpu_count:
+        return error_response("Invalid GPU Index(gpu_index).")
+
+    # 客户端已有的快照版本，只返回此后变化的字段
+    since = get_int_query(request, ["since"], default=-1)
+    cached_response = response_cache.get(
+        ("gpu_usage_info", gpu_index, since),
+        snapshot.version,
+        lambda: get_gpu_usage_response_dict(
+            gpu_index=gpu_index, since=since, snapshot=snapshot
+        ),
+    )
+
+    return cached_json_response(request, cached_response)
+
+
+@app.get("/gpu_task_info")
+async def get_gpu_task_info(request: Request):
+    gpu_index = get_gpu_index_query(request)
+
+    snapshot = get_gpu_state_snapshot()
+    if gpu_index is None or not 0 <= gpu_index < snapshot.gpu_count:
+        return error_response("Invalid GPU Index(gpu_index).")
+
+    # 客户端已有的快照版本，只返回此后新增、结束与变化的任务
+    since = get_int_query(request, ["since"], default=-1)
+    cached_response = response_cache.get(
+        ("gpu_task_info", gpu_index, since),
+        snapshot.version,
+        lambda: get_gpu_task_response_dict(
+            gpu_index=gpu_index, since=since, snapshot=snapshot
+        ),
+    )
+
+    return cached_json_response(request, cached_response)
+
+
+@app.get("/snapshot")
+async def get_snapshot(request: Request):
+    try:
+        field_tuple = parse_snapshot_fields(request.query_params.get("fields", None))
+    except ValueError as e:
+        return error_response(str(e))
+
+    snapshot = get_gpu_state_snapshot()
+    cached_response = response_cache.get(
+        ("snapshot", field_tuple),
+        get_snapshot_version(field_tuple, snapshot),
+        lambda: get_snapshot_dict(field_tuple, snapshot),
+    )
+
+    return cached_json_response(request, cached_response)
+
+
+@app.get("/stream")
+async def get_stream(request: Request):
+    gpu_index_str = request.query_params.get("gpu_index", None)
+    if gpu_index_str is None:
+        gpu_index_str = request.query_params.get("gpuIndex", None)
+
+    try:
+        gpu_index_filter = parse_gpu_index_filter(gpu_index_str)
+        error_message = validate_gpu_index_filter(gpu_index_filter)
+    except ValueError as e:
+        error_message = str(e)
+    if error_message:
+        return error_response(error_message)
+
+    stream = GpuStateStream(
+        gpu_index_filter=gpu_index_filter,
+        last_event_id=parse_last_event_id(request.headers.get("last-event-id")),
+    )
+
+    async def event_generator():
+        # 发布线程通过回调唤醒，等待期间不占用线程
+        loop = asyncio.get_running_loop()
+        wakeup_event = asyncio.Event()
+        stream.subscribe(callback=lambda: loop.call_soon_threadsafe(wakeup_event.set))
+        try:
+            yield stream.get_first_event()
+            while not await request.is_disconnected():
+                try:
+                    await asyncio.wait_for(
+                        wakeup_event.wait(), timeout=API_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield format_stream_heartbeat()
+                    continue
+
+                wakeup_event.clear()
+                event_str = stream.next_event()
+                if event_str:
+                    yield event_str
+        finally:
+            stream.close()
+
+    return StreamingResponse(
+        event_generator(),
+        status_code=200,
+        media_type="text/event-stream",
+        headers=STREAM_HEADERS,
+    )
+
+
+@app.get("/gpu_history")
+async def get_gpu_history(request: Request):
+    if not GPU_HISTORY_ENABLE:
+        return error_response(
+            "GPU history is disabled(GPU_HISTORY_ENABLE=False).", status_code=503
         )
 
-    response_gpu_usage = get_gpu_usage_dict(gpu_index=int(gpu_index))
+    gpu_index = get_gpu_index_query(request)
+    if gpu_index is None or not 0 <= gpu_index < len(global_gpu_history):
+        return error_response("Invalid GPU Index(gpu_index).")
+
+    seconds = get_int_query(request, ["seconds"], default=3600)
+    resolution = get_int_query(request, ["resolution"], default=0)
+    metrics = request.query_params.get("metrics", "")
+    metric_name_list = [m.strip() for m in metrics.split(",") if m.strip()]
+
+    invalid_metric_name_list = [
+        name for name in metric_name_list if name not in GPU_HISTORY_METRIC_NAME_DICT
+    ]
+    if len(invalid_metric_name_list) > 0 or seconds <= 0:
+        return error_response(f"Invalid metrics or seconds: {invalid_metric_name_list}")
+
+    # 长时间范围的降采样查询较耗时
+    response_gpu_history = await run_in_threadpool(
+        get_gpu_history_dict,
+        gpu_index=gpu_index,
+        seconds=seconds,
+        resolution=resolution,
+        metric_name_list=metric_name_list,
+    )
 
     return JSONResponse(
-        content=response_gpu_usage,
+        content=response_gpu_history,
         status_code=200,
         media_type="application/json",
     )
 
 
-@app.get("/gpu_task_info")
-def get_gpu_task(request: Request):
-    gpu_index = request.query_params.get("gpu_index", None)
-
-    if gpu_index is None or not gpu_index.isdigit() or int(gpu_index) > get_gpu_count_backend():
-        return JSONResponse(
-            content={"result": "Invalid GPU Index(gpu_index)."},
-            status_code=400,
-            media_type="application/json",
-        )
+@app.get("/disk_usage")
+async def get_disk_usage(request: Request):
+    def get_response_disk_usage() -> dict:
+        result = get_disk_usage_dict_list()
+        return {"result": len(result), "diskUsage": result}
+
+    cached_response = response_cache.get(
+        "disk_usage", get_disk_info_version(), get_response_disk_usage
+    )
+
+    return cached_json_response(request, cached_response)
 
-    response_gpu_task = get_gpu_task_dict_list(gpu_index=int(gpu_index))
 
+@app.get("/disk_usage_user")
+async def get_disk_usage_user():
+    result = get_disk_usage_user_dict_list()
     return JSONResponse(
-        content=response_gpu_task,
+        content={"result": len(result), "diskUsageUsage": result},
         status_code=200,
         media_type="application/json",
     )
+
+
+def is_gpu_board_available() -> bool:
+    if len(GPU_BOARD_WEB_URL) == 0:
+        logger.info("GPU board URL is not set.")
+        return False
+    try:
+        return requests.get(GPU_BOARD_WEB_URL).status_code == 200
+    except requests.exceptions.RequestException:
+        logger.info("GPU board URL cannot be accessed.")
+        return False
+
+
+@app.get("/")
+async def get_index(request: Request):
+    if await run_in_threadpool(is_gpu_board_available):
+        return RedirectResponse(GPU_BOARD_WEB_URL)
+
+    command_result = await run_in_threadpool(get_nvitop_result)
+    return templates.TemplateResponse(
+        request,
+        "index.html",
+        {"result": command_result, "page_title": SERVER_NAME},
+    )
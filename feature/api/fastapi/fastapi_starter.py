@@ -1,10 +1,13 @@
+import socket
 import threading
 
-from uvicorn import run
+from uvicorn import Config, Server, run
 
 from config.settings import (
-    WEB_SERVER_HOST,
+    FASTAPI_SERVER_KEEP_ALIVE_SECONDS,
+    FASTAPI_SERVER_LIMIT_CONCURRENCY,
     FASTAPI_SERVER_PORT,
+    WEB_SERVER_HOST,
 )
 
 from feature.utils.logs import get_logger
@@ -13,8 +16,9 @@ logger = get_logger()
 
 
 def run_server(log_level="critical"):
+    # 仅用于开发调试，不启动监控
     run(
-        app="feature.api.fastapi_main:app",
+        app="feature.api.fastapi.fastapi_main:app",
         host="0.0.0.0",
         port=8081,
         reload=True,
@@ -22,17 +26,45 @@ def run_server(log_level="critical"):
     )
 
 
-def start_fastapi_server_ipv4(log_level="critical"):
-    logger.info("Starting Fastapi server(IPV4)...")
-    run(
-        app="feature.api.fastapi_main:app",
-        host=WEB_SERVER_HOST,
+def get_server_config(host: str, log_level: str = "critical") -> Config:
+    from feature.api.fastapi.fastapi_main import app
+
+    return Config(
+        # 传入应用对象，与监控共用同一进程(监控状态无法被其他工作进程读取，只能单进程)
+        app=app,
+        host=host,
         port=FASTAPI_SERVER_PORT,
-        reload=True,
+        timeout_keep_alive=FASTAPI_SERVER_KEEP_ALIVE_SECONDS,
+        limit_concurrency=FASTAPI_SERVER_LIMIT_CONCURRENCY or None,
         log_level=log_level,
-        workers=1
     )
 
 
+def start_fastapi_server_ipv4(log_level="critical"):
+    logger.info("Starting Fastapi server(IPV4)...")
+    Server(get_server_config(WEB_SERVER_HOST, log_level)).run()
+
+
+def start_fastapi_server_both(log_level="critical"):
+    if not socket.has_dualstack_ipv6():
+        start_fastapi_server_ipv4(log_level)
+        return
+
+    logger.info("Starting Fastapi server(Both IPV4 and IPV6)...")
+    # asyncio监听 `::` 时只接受IPV6连接，需要自行创建双栈socket
+    sock = socket.create_server(
+        ("::", FASTAPI_SERVER_PORT), family=socket.AF_INET6, dualstack_ipv6=True
+    )
+    Server(get_server_config("::", log_level)).run(sockets=[sock])
+
+
+def start_fastapi_server_both_background():
+    class FastapiThread(threading.Thread):
+        def run(self):
+            start_fastapi_server_both()
+
+    FastapiThread().start()
+
+
 if __name__ == "__main__":
     run_server(log_level="info")
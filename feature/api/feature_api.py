@@ -1,9 +1,24 @@
-from feature.api.flask.flask_starter import start_flask_server_both_background
+from config.settings import API_SERVER_BACKEND
 from feature.utils.logs import get_logger
 
 logger = get_logger()
 
 
 def start_api_server():
+    if API_SERVER_BACKEND == "fastapi":
+        # 未安装FastAPI时不影响默认的Flask后端
+        from feature.api.fastapi.fastapi_starter import (
+            start_fastapi_server_both_background,
+        )
+
+        logger.info("FastAPI Server is starting...")
+        start_fastapi_server_both_background()
+        return
+
+    if API_SERVER_BACKEND != "flask":
+        logger.warning(f"Unknown API_SERVER_BACKEND: {API_SERVER_BACKEND}, use flask.")
+
+    from feature.api.flask.flask_starter import start_flask_server_both_background
+
     logger.info("Flask Server is starting...")
     start_flask_server_both_background()
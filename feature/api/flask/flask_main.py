@@ -7,6 +7,7 @@ from config.settings import (
     WEB_SERVER_CORS_ENABLE,
     FLASK_LOG_DISABLE,
     GPU_BOARD_WEB_URL,
+    GPU_HISTORY_ENABLE,
     SERVER_NAME,
 )
 
@@ -21,9 +22,27 @@ if FLASK_LOG_DISABLE:
 ##################################################
 
 import requests
-from flask import Flask, Response, redirect, render_template, request
+from flask import (
+    Flask,
+    Response,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+)
 
 from feature.api.api_data_common import *
+from feature.api.api_stream import (
+    STREAM_HEADERS,
+    GpuStateStream,
+    parse_gpu_index_filter,
+    parse_last_event_id,
+    validate_gpu_index_filter,
+)
+from feature.api.response_cache import CachedResponse, is_etag_matched, response_cache
+from feature.global_variable.disk_status import get_disk_info_version
+from feature.global_variable.gpu import get_gpu_state_snapshot
+from feature.global_variable.system import get_system_info_version
 
 from feature.utils.logs import get_logger
 
@@ -39,6 +58,24 @@ if not WEB_SERVER_CORS_ENABLE:
     logger.info("Set CORS for Flask server.")
 
 
+def cached_json_response(cached_response: CachedResponse) -> Response:
+    """返回缓存的JSON，客户端的 `If-None-Match` 与ETag一致时返回304"""
+    # 与FastAPI共用比较规则，弱ETag(`W/"..."`)同样匹配
+    if is_etag_matched(request.headers.get("If-None-Match"), cached_response.etag):
+        response = Response(status=304)
+    else:
+        response = Response(
+            response=cached_response.body,
+            status=200,
+            mimetype="application/json",
+        )
+
+    response.set_etag(cached_response.etag)
+    # 允许浏览器缓存，但每次使用前都需要校验ETag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @app.route("/nvitop_output")
 def get_nvitop_output():
     command_result = get_nvitop_result()
@@ -51,20 +88,10 @@ def get_nvitop_output():
 
 @app.route("/machine_user_message", methods=['POST'])
 def post_machine_user_message():
-    final_data: dict = {
-        "haveError": True,
-        "isSucceed": False,
-        "result": "error"
-    }
-
-    if request.method == 'POST':
-        user_name = request.form['userName']
-        content = request.form['content']
-
-        machine_user_message_backend(
-            user_name=user_name,
-            content=content,
-        )
+    final_data = get_machine_user_message_response_dict(
+        user_name=request.form.get('userName'),
+        content=request.form.get('content'),
+    )
 
     return Response(
         response=json.dumps(final_data),
@@ -75,14 +102,12 @@ def post_machine_user_message():
 
 @app.route("/system_info")
 def get_system_info():
-    system_info: dict = get_system_info_dict()
-
-    return Response(
-        response=json.dumps(system_info),
-        status=200,
-        mimetype="application/json",
+    cached_response = response_cache.get(
+        "system_info", get_system_info_version(), get_system_info_dict
     )
 
+    return cached_json_response(cached_response)
+
 
 @app.route("/gpu_count")
 def get_gpu_count():
@@ -103,41 +128,160 @@ def get_gpu_usage_info():
     if gpu_index is None:
         gpu_index = request.args.get("gpuIndex", default=None, type=int)
 
-    if gpu_index is None or gpu_index > get_gpu_count_backend():
+    snapshot = get_gpu_state_snapshot()
+    if gpu_index is None or not 0 <= gpu_index < snapshot.gpu_count:
         return Response(
             response=json.dumps({"result": "Invalid GPU Index(gpu_index)."}),
             status=400,
             mimetype="application/json",
         )
 
-    response_gpu_usage = get_gpu_usage_dict(gpu_index=gpu_index)
+    # 客户端已有的快照版本，只返回此后变化的字段
+    since = request.args.get("since", default=-1, type=int)
+    cached_response = response_cache.get(
+        ("gpu_usage_info", gpu_index, since),
+        snapshot.version,
+        lambda: get_gpu_usage_response_dict(
+            gpu_index=gpu_index, since=since, snapshot=snapshot
+        ),
+    )
+
+    return cached_json_response(cached_response)
+
+
+@app.route("/gpu_task_info")
+def get_gpu_task_info():
+    gpu_index = request.args.get("gpu_index", default=None, type=int)
+    if gpu_index is None:
+        gpu_index = request.args.get("gpuIndex", default=None, type=int)
+
+    snapshot = get_gpu_state_snapshot()
+    if gpu_index is None or not 0 <= gpu_index < snapshot.gpu_count:
+        return Response(
+            response=json.dumps({"result": "Invalid GPU Index(gpu_index)."}),
+            status=400,
+            mimetype="application/json",
+        )
+
+    # 客户端已有的快照版本，只返回此后新增、结束与变化的任务
+    since = request.args.get("since", default=-1, type=int)
+    cached_response = response_cache.get(
+        ("gpu_task_info", gpu_index, since),
+        snapshot.version,
+        lambda: get_gpu_task_response_dict(
+            gpu_index=gpu_index, since=since, snapshot=snapshot
+        ),
+    )
+
+    return cached_json_response(cached_response)
+
+
+@app.route("/snapshot")
+def get_snapshot():
+    try:
+        field_tuple = parse_snapshot_fields(
+            request.args.get("fields", default=None, type=str)
+        )
+    except ValueError as e:
+        return Response(
+            response=json.dumps({"result": str(e)}),
+            status=400,
+            mimetype="application/json",
+        )
+
+    snapshot = get_gpu_state_snapshot()
+    cached_response = response_cache.get(
+        ("snapshot", field_tuple),
+        get_snapshot_version(field_tuple, snapshot),
+        lambda: get_snapshot_dict(field_tuple, snapshot),
+    )
+
+    return cached_json_response(cached_response)
+
+
+@app.route("/stream")
+def get_stream():
+    gpu_index_str = request.args.get("gpu_index", default=None, type=str)
+    if gpu_index_str is None:
+        gpu_index_str = request.args.get("gpuIndex", default=None, type=str)
+
+    try:
+        gpu_index_filter = parse_gpu_index_filter(gpu_index_str)
+        error_message = validate_gpu_index_filter(gpu_index_filter)
+    except ValueError as e:
+        error_message = str(e)
+    if error_message:
+        return Response(
+            response=json.dumps({"result": error_message}),
+            status=400,
+            mimetype="application/json",
+        )
+
+    stream = GpuStateStream(
+        gpu_index_filter=gpu_index_filter,
+        last_event_id=parse_last_event_id(request.headers.get("Last-Event-ID")),
+    )
 
+    # 每个连接占用一个线程，客户端断开后在下一次写入(最迟一个心跳周期)时结束
     return Response(
-        response=json.dumps(response_gpu_usage),
+        stream_with_context(stream.iter_events()),
         status=200,
-        mimetype="application/json",
+        mimetype="text/event-stream",
+        headers=STREAM_HEADERS,
     )
 
 
-@app.route("/gpu_task_info")
-def get_gpu_task_info():
+@app.route("/gpu_history")
+def get_gpu_history():
+    if not GPU_HISTORY_ENABLE:
+        return Response(
+            response=json.dumps(
+                {"result": "GPU history is disabled(GPU_HISTORY_ENABLE=False)."}
+            ),
+            status=503,
+            mimetype="application/json",
+        )
+
     gpu_index = request.args.get("gpu_index", default=None, type=int)
     if gpu_index is None:
         gpu_index = request.args.get("gpuIndex", default=None, type=int)
 
-    if gpu_index is None or gpu_index > get_gpu_count_backend():
+    if (
+            gpu_index is None
+            or not 0 <= gpu_index < len(global_gpu_history)
+    ):
         return Response(
             response=json.dumps({"result": "Invalid GPU Index(gpu_index)."}),
             status=400,
             mimetype="application/json",
         )
 
-    task_list = get_gpu_task_dict_list(gpu_index=gpu_index)
+    seconds = request.args.get("seconds", default=3600, type=int)
+    resolution = request.args.get("resolution", default=0, type=int)
+    metrics = request.args.get("metrics", default="", type=str)
+    metric_name_list = [m.strip() for m in metrics.split(",") if m.strip()]
 
-    response_gpu_tasks = {"result": len(task_list), "taskList": task_list}
+    invalid_metric_name_list = [
+        name for name in metric_name_list if name not in GPU_HISTORY_METRIC_NAME_DICT
+    ]
+    if len(invalid_metric_name_list) > 0 or seconds <= 0:
+        return Response(
+            response=json.dumps(
+                {"result": f"Invalid metrics or seconds: {invalid_metric_name_list}"}
+            ),
+            status=400,
+            mimetype="application/json",
+        )
+
+    response_gpu_history = get_gpu_history_dict(
+        gpu_index=gpu_index,
+        seconds=seconds,
+        resolution=resolution,
+        metric_name_list=metric_name_list,
+    )
 
     return Response(
-        response=json.dumps(response_gpu_tasks),
+        response=json.dumps(response_gpu_history),
         status=200,
         mimetype="application/json",
     )
@@ -145,15 +289,16 @@ def get_gpu_task_info():
 
 @app.route("/disk_usage")
 def get_disk_usage():
-    result = get_disk_usage_dict_list()
-    response_disk_usage = {"result": len(result), "diskUsage": result}
+    def get_response_disk_usage() -> dict:
+        result = get_disk_usage_dict_list()
+        return {"result": len(result), "diskUsage": result}
 
-    return Response(
-        response=json.dumps(response_disk_usage),
-        status=200,
-        mimetype="application/json",
+    cached_response = response_cache.get(
+        "disk_usage", get_disk_info_version(), get_response_disk_usage
     )
 
+    return cached_json_response(cached_response)
+
 
 @app.route("/disk_usage_user")
 def get_disk_usage_user():
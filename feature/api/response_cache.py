@@ -0,0 +1,88 @@
+"""
+API响应缓存。
+
+以数据版本(GPU状态快照版本、硬盘/系统信息版本)为键缓存序列化后的JSON字节串，
+两次监控周期之间的重复请求直接返回缓存，不再构建字典与 `json.dumps`。
+ETag由响应内容计算，内容不变时版本变化也不会使客户端缓存失效。
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    version: Hashable
+    body: bytes
+    # 强ETag，不含引号
+    etag: str
+
+
+def make_cached_response(version: Hashable, data: Any) -> CachedResponse:
+    body = json.dumps(data).encode("utf-8")
+    return CachedResponse(
+        version=version,
+        body=body,
+        etag=hashlib.blake2b(body, digest_size=16).hexdigest(),
+    )
+
+
+def is_etag_matched(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    :param if_none_match: 请求头 `If-None-Match`，如 `"etag1", W/"etag2"` 或 `*`
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"') == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    def __init__(self, max_size: int = 1024) -> None:
+        """
+        :param max_size: 最多缓存的键数(如不同的 `since` 参数)，超出时淘汰最久未使用的
+        """
+        self.max_size: int = max_size
+        self._cache_dict: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+            self, key: Hashable, version: Hashable, build: Callable[[], Any]
+    ) -> CachedResponse:
+        """
+        :param key: 接口及参数，如 `("gpu_task_info", 0)`
+        :param version: 数据版本，变化后重新构建
+        :param build: 构建响应数据的函数
+        """
+        with self._lock:
+            cached_response = self._cache_dict.get(key)
+            if cached_response is not None and cached_response.version == version:
+                self._cache_dict.move_to_end(key)
+                return cached_response
+
+        # 并发请求可能重复构建，结果相同，不加锁构建以免阻塞其他接口
+        cached_response = make_cached_response(version, build())
+        with self._lock:
+            self._cache_dict[key] = cached_response
+            self._cache_dict.move_to_end(key)
+            while len(self._cache_dict) > self.max_size:
+                self._cache_dict.popitem(last=False)
+        return cached_response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache_dict.clear()
+
+
+response_cache = ResponseCache()
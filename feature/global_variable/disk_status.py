@@ -1,2 +1,47 @@
-disk_info_response_dict: dict = {}
+import threading
+from types import MappingProxyType
+
+from feature.global_variable.event_bus import DiskStatusChanged, event_bus
+
+# {挂载点: 硬盘信息}，发布时整体替换引用，已发布的字典之后不会再被修改
+_disk_info_response_dict: dict = {}
+_disk_info_publish_lock = threading.Lock()
+
 disk_info_user_response_dict: dict = {}
+
+# 每次更新加一，用于API响应缓存
+disk_info_version: int = 0
+
+
+def get_disk_info_version() -> int:
+    return disk_info_version
+
+
+def get_disk_info_response_dict() -> dict:
+    """读取方拿到的字典不会被部分更新"""
+    return _disk_info_response_dict
+
+
+def publish_disk_info(disk_info_dict: dict) -> bool:
+    """
+    替换已发布的硬盘信息，先替换引用再增加版本号，最后发布 `DiskStatusChanged`
+    :param disk_info_dict: 新构建的 {挂载点: 硬盘信息}，发布后不应再修改
+    :return: 内容是否有变化，无变化时不发布
+    """
+    global _disk_info_response_dict, disk_info_version
+
+    with _disk_info_publish_lock:
+        if disk_info_dict == _disk_info_response_dict:
+            return False
+        _disk_info_response_dict = disk_info_dict
+        disk_info_version += 1
+
+    event_bus.publish(
+        DiskStatusChanged(
+            disk_list=tuple(
+                MappingProxyType(dict(disk_info_dict[mount_point]))
+                for mount_point in sorted(disk_info_dict.keys())
+            )
+        )
+    )
+    return True
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+进程内的发布/订阅事件总线。
+
+全局状态更新后发布类型化的事件(GPU指标变化、任务新增/结束、硬盘状态变化)，
+流式接口、缓存、导出器与告警可以订阅事件，而不必定时轮询全局变量。
+
+每个订阅者拥有独立的有界队列，队列满时丢弃最旧的事件，
+消费慢的订阅者不会阻塞发布方，也不会影响其他订阅者。
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping, Optional
+
+from config.settings import EVENT_BUS_QUEUE_SIZE
+from feature.monitor.gpu.task.task_record import TaskRecord
+from feature.utils.logs import get_logger
+
+logger = get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    # 对应的GPU状态快照版本，与GPU无关的事件为0
+    version: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True, slots=True)
+class GpuStatePublished(Event):
+    """每个监控周期发布一次，无论状态是否变化"""
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceMetricsChanged(Event):
+    gpu_id: int = 0
+    usage: Optional[Mapping[str, object]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TaskAdded(Event):
+    gpu_id: int = 0
+    task: Optional[TaskRecord] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRemoved(Event):
+    gpu_id: int = 0
+    # 任务结束前最后一次发布的记录
+    task: Optional[TaskRecord] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DiskStatusChanged(Event):
+    disk_list: tuple[Mapping[str, object], ...] = ()
+
+
+class Subscription:
+    """单个订阅者的有界队列，满时丢弃最旧的事件"""
+
+    def __init__(
+            self,
+            event_type_set: Optional[frozenset[type]] = None,
+            max_size: int = EVENT_BUS_QUEUE_SIZE,
+            callback: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        :param event_type_set: 订阅的事件类型，None表示全部
+        :param max_size: 队列容量
+        :param callback: 新事件入队后在发布线程中调用，须快速返回(如唤醒asyncio的等待)
+        """
+        self.event_type_set: Optional[frozenset[type]] = event_type_set
+        self.callback: Optional[Callable[[], None]] = callback
+        self._queue: deque[Event] = deque(maxlen=max(1, max_size))
+        self._condition = threading.Condition()
+        self.dropped_count: int = 0
+        self.closed: bool = False
+
+    def accept(self, event: Event) -> bool:
+        return self.event_type_set is None or type(event) in self.event_type_set
+
+    def put(self, event: Event) -> None:
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped_count += 1
+            self._queue.append(event)
+            self._condition.notify()
+
+        if self.callback is not None:
+            try:
+                self.callback()
+            except Exception as e:
+                logger.warning(f"[EventBus]Subscriber callback error: {e}")
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        取出最早的事件，超时或已取消订阅时返回None。
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                    lambda: len(self._queue) > 0 or self.closed, timeout
+            ):
+                return None
+            if len(self._queue) == 0:
+                return None
+            return self._queue.popleft()
+
+    def get_all(self) -> list[Event]:
+        """不等待，取出队列中的全部事件"""
+        with self._condition:
+            event_list = list(self._queue)
+            self._queue.clear()
+        return event_list
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class EventBus:
+    def __init__(self) -> None:
+        # 发布时复制引用即可遍历，订阅/取消订阅时整体替换
+        self._subscription_list: tuple[Subscription, ...] = ()
+        self._lock = threading.Lock()
+
+    @property
+    def has_subscriber(self) -> bool:
+        return len(self._subscription_list) > 0
+
+    def subscribe(
+            self,
+            event_type_list: Iterable[type] = None,
+            max_size: int = EVENT_BUS_QUEUE_SIZE,
+            callback: Optional[Callable[[], None]] = None,
+    ) -> Subscription:
+        """
+        :param event_type_list: 订阅的事件类型，默认全部
+        :param max_size: 队列容量，满时丢弃最旧的事件
+        :param callback: 见 `Subscription`
+        """
+        subscription = Subscription(
+            frozenset(event_type_list) if event_type_list is not None else None,
+            max_size,
+            callback,
+        )
+        with self._lock:
+            self._subscription_list = self._subscription_list + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscription_list = tuple(
+                s for s in self._subscription_list if s is not subscription
+            )
+        subscription.close()
+
+    def publish(self, event: Event) -> None:
+        self.publish_many((event,))
+
+    def publish_many(self, event_list: Iterable[Event]) -> None:
+        subscription_list = self._subscription_list
+        if len(subscription_list) == 0:
+            return
+
+        for event in event_list:
+            for subscription in subscription_list:
+                if subscription.accept(event):
+                    subscription.put(event)
+
+
+event_bus = EventBus()
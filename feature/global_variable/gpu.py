@@ -1,8 +1,23 @@
 # -*- coding: utf-8 -*-
 
-from typing import List
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional
 
-from feature.monitor.gpu.gpu_process import GPUProcessInfo
+from config.settings import API_DELTA_HISTORY_SIZE
+from feature.global_variable.event_bus import (
+    DeviceMetricsChanged,
+    Event,
+    GpuStatePublished,
+    TaskAdded,
+    TaskRemoved,
+    event_bus,
+)
+from feature.monitor.gpu.metric_history import GpuMetricHistory
+from feature.monitor.gpu.task.task_record import TaskRecord
 from feature.utils.logs import get_logger
 
 logger = get_logger()
@@ -18,25 +33,155 @@ gpu_usage:
 
 gpu_task为一个列表
 包括 用户名、是否为调试模式、工程名、py文件名、显存占用、运行时间
+
+以上三项由监控线程在每个周期结束(所有GPU更新完毕)后整体发布为一个只读快照，
+API线程通过 `get_gpu_state_snapshot` 读取，无需加锁，也不会读到更新了一半的状态。
+最近若干个快照会被保留，用于按版本号计算增量响应。
+
+gpu_history:
+核心使用率、显存、功率、温度的历史记录(多级降采样)
 """
 
-global_gpu_info: List[dict] = []
-global_gpu_usage: List[dict] = []
-global_gpu_task: List[List[GPUProcessInfo]] = []
+
+def _empty_mapping() -> Mapping:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class GpuState:
+    """单张GPU在某个周期结束时的只读状态"""
+
+    gpu_id: int
+    info: Mapping[str, object] = field(default_factory=_empty_mapping)
+    usage: Mapping[str, object] = field(default_factory=_empty_mapping)
+    # 按pid排序，显存/内存统计在构建时已计算，之后不再变化
+    task_list: tuple[TaskRecord, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class GpuStateSnapshot:
+    """所有GPU的状态快照，每次发布版本号加一"""
+
+    version: int = 0
+    timestamp: float = 0.0
+    gpu_state_list: tuple[GpuState, ...] = ()
+
+    @property
+    def gpu_count(self) -> int:
+        return len(self.gpu_state_list)
+
+
+_gpu_state_snapshot: GpuStateSnapshot = GpuStateSnapshot()
+_gpu_state_publish_lock = threading.Lock()
+# 最近发布的快照，版本号连续
+_gpu_state_snapshot_history: deque[GpuStateSnapshot] = deque(
+    maxlen=max(1, API_DELTA_HISTORY_SIZE)
+)
+
+global_gpu_history: List[GpuMetricHistory] = []
+
+
+def get_gpu_state_snapshot() -> GpuStateSnapshot:
+    """发布只替换引用，读取方拿到的快照在之后不会再被修改"""
+    return _gpu_state_snapshot
 
 
-# For Debug Use
-# global_gpu_usage.append({})
-# global_gpu_task.append([])
+def get_gpu_state_snapshot_by_version(version: int) -> Optional[GpuStateSnapshot]:
+    """:return: 指定版本的快照，已不在保留范围内时为None"""
+    history = _gpu_state_snapshot_history
+    try:
+        oldest_version = history[0].version
+        snapshot = history[version - oldest_version]
+    except IndexError:
+        return None
+
+    if version < oldest_version or snapshot.version != version:
+        return None
+    return snapshot
+
+
+def publish_gpu_state(gpu_state_list: Iterable[GpuState]) -> GpuStateSnapshot:
+    global _gpu_state_snapshot
+
+    with _gpu_state_publish_lock:
+        previous_snapshot = _gpu_state_snapshot
+        snapshot = GpuStateSnapshot(
+            version=previous_snapshot.version + 1,
+            timestamp=time.time(),
+            gpu_state_list=tuple(gpu_state_list),
+        )
+        _gpu_state_snapshot = snapshot
+        _gpu_state_snapshot_history.append(snapshot)
+
+    global_variable_gpu_updated(previous_snapshot, snapshot)
+    return snapshot
 
 
 def get_gpu_count():
-    if len(global_gpu_usage) != len(global_gpu_task):
-        raise ValueError(
-            "global_gpu_usage and global_gpu_task should have the same length."
+    return get_gpu_state_snapshot().gpu_count
+
+
+def get_gpu_state_event_list(
+        previous_snapshot: GpuStateSnapshot, snapshot: GpuStateSnapshot
+) -> list[Event]:
+    """对比前后两个快照，生成指标变化与任务新增/结束事件"""
+    event_list: list[Event] = [
+        GpuStatePublished(version=snapshot.version, timestamp=snapshot.timestamp)
+    ]
+    previous_state_list = previous_snapshot.gpu_state_list
+
+    for gpu_state in snapshot.gpu_state_list:
+        gpu_id = gpu_state.gpu_id
+        previous_state = (
+            previous_state_list[gpu_id]
+            if gpu_id < len(previous_state_list)
+            else GpuState(gpu_id)
+        )
+        if gpu_state is previous_state:
+            # 超时的GPU沿用上一周期的状态
+            continue
+
+        if gpu_state.usage != previous_state.usage:
+            event_list.append(
+                DeviceMetricsChanged(
+                    version=snapshot.version,
+                    timestamp=snapshot.timestamp,
+                    gpu_id=gpu_id,
+                    usage=gpu_state.usage,
+                )
+            )
+
+        task_dict = {task.task_id: task for task in gpu_state.task_list}
+        previous_task_dict = {task.task_id: task for task in previous_state.task_list}
+        event_list.extend(
+            TaskAdded(
+                version=snapshot.version,
+                timestamp=snapshot.timestamp,
+                gpu_id=gpu_id,
+                task=task,
+            )
+            for task_id, task in task_dict.items()
+            if task_id not in previous_task_dict
         )
-    return len(global_gpu_task)
+        event_list.extend(
+            TaskRemoved(
+                version=snapshot.version,
+                timestamp=snapshot.timestamp,
+                gpu_id=gpu_id,
+                task=task,
+            )
+            for task_id, task in previous_task_dict.items()
+            if task_id not in task_dict
+        )
+
+    return event_list
+
 
+def global_variable_gpu_updated(
+        previous_snapshot: GpuStateSnapshot, snapshot: GpuStateSnapshot
+):
+    # 没有订阅者时不对比快照
+    if not event_bus.has_subscriber:
+        return
 
-def global_variable_gpu_updated():
-    pass
+    event_bus.publish_many(get_gpu_state_event_list(previous_snapshot, snapshot))
@@ -19,3 +19,15 @@ global_system_info: dict = {
     "memorySwapTotalMb": 0,
     "memorySwapUsedMb": 0,
 }
+
+# 每次更新加一，用于API响应缓存
+global_system_info_version: int = 0
+
+
+def get_system_info_version() -> int:
+    return global_system_info_version
+
+
+def global_variable_system_updated():
+    global global_system_info_version
+    global_system_info_version += 1
@@ -52,8 +52,8 @@ class TaskInfoForGroupCenter:
     commandLine: str = ""
     condaEnvName: str = ""
 
-    def __init__(self, gpu_process_obj):
-        self.update(gpu_process_obj=gpu_process_obj)
+    def __init__(self, record, gpu):
+        self.update(record=record, gpu=gpu)
 
     @staticmethod
     def __fix_data_size_str(size_str: str) -> str:
@@ -70,72 +70,77 @@ class TaskInfoForGroupCenter:
 
         return new_size_str
 
-    def update(self, gpu_process_obj):
+    def update(self, record, gpu):
         from feature.monitor.gpu.gpu import GPU
-        from feature.monitor.gpu.gpu_process import GPUProcessInfo
+        from feature.monitor.gpu.gpu_snapshot import GpuSnapshot
+        from feature.monitor.gpu.task.task_record import TaskRecord
 
-        gpu_process_obj: GPUProcessInfo = gpu_process_obj
+        record: TaskRecord = record
 
         # 任务唯一标识符
-        self.taskId = gpu_process_obj.task_id
+        self.taskId = record.task_id
 
         # 任务类型
         self.taskType = "GPU"
         # 任务状态
-        self.taskStatus = gpu_process_obj.state.value
+        self.taskStatus = record.state.value
 
         # 用户
-        self.taskUser = gpu_process_obj.user.name_cn
+        self.taskUser = record.user.name_cn
 
         # 进程信息
-        self.taskPid = gpu_process_obj.pid
-        self.taskMainMemory = gpu_process_obj.task_main_memory_mb
+        self.taskPid = record.pid
+        self.taskMainMemory = record.task_main_memory_mb
 
         # GPU 信息
-        gpu: GPU = gpu_process_obj.gpu
-        self.gpuUsagePercent = gpu.gpu_utilization
-        self.gpuMemoryUsageString = self.__fix_data_size_str(gpu.memory_used_human)
-        self.gpuMemoryFreeString = self.__fix_data_size_str(gpu.memory_free_human)
-        self.gpuMemoryTotalString = self.__fix_data_size_str(gpu.memory_total_human)
-        self.gpuMemoryPercent = gpu.memory_percent
+        gpu: GPU = gpu
+        gpu_snapshot: GpuSnapshot = gpu.snapshot
+        self.gpuUsagePercent = gpu_snapshot.gpu_utilization
+        self.gpuMemoryUsageString = \
+            self.__fix_data_size_str(gpu_snapshot.memory_used_human)
+        self.gpuMemoryFreeString = \
+            self.__fix_data_size_str(gpu_snapshot.memory_free_human)
+        self.gpuMemoryTotalString = \
+            self.__fix_data_size_str(gpu_snapshot.memory_total_human)
+        self.gpuMemoryPercent = gpu_snapshot.memory_percent
 
         self.allTaskMessage = gpu.all_tasks_msg_body
         self.taskGpuId = gpu.gpu_id
         self.taskGpuName = gpu.name
 
         self.taskGpuMemoryGb = round(
-            (gpu_process_obj.task_gpu_memory >> 10 >> 10) / 1024, 2
+            (record.task_gpu_memory >> 10 >> 10) / 1024, 2
         )
         self.taskGpuMemoryHuman = self.__fix_data_size_str(
-            gpu_process_obj.task_gpu_memory_human
+            record.task_gpu_memory_human
         )
         self.taskGpuMemoryMaxGb = round(
-            (gpu_process_obj.task_gpu_memory_max >> 10 >> 10) / 1024, 2
+            (record.task_gpu_memory_max >> 10 >> 10) / 1024, 2
         )
 
         # 多卡
-        self.isMultiGpu = gpu_process_obj.is_multi_gpu
-        self.multiDeviceLocalRank = gpu_process_obj.local_rank
-        self.multiDeviceWorldSize = gpu_process_obj.world_size
+        self.isMultiGpu = record.is_multi_gpu
+        self.multiDeviceLocalRank = record.local_rank
+        self.multiDeviceWorldSize = record.world_size
 
         # CUDA 信息
-        self.cudaRoot = gpu_process_obj.cuda_root
-        self.cudaVersion = gpu_process_obj.cuda_version
+        self.cudaRoot = record.cuda_root
+        self.cudaVersion = record.cuda_version
 
-        self.isDebugMode = gpu_process_obj.is_debug
+        self.isDebugMode = record.is_debug
 
         # 运行时间
-        self.taskStartTime = int(gpu_process_obj.start_time)
-        self.taskFinishTime = int(gpu_process_obj.finish_time)
-        self.taskRunningTimeString = gpu_process_obj.running_time_human
-        self.taskRunningTimeInSeconds = gpu_process_obj.running_time_in_seconds
+        self.taskStartTime = int(record.start_time)
+        self.taskFinishTime = int(record.finish_time)
+        self.taskRunningTimeString = record.running_time_human
+        self.taskRunningTimeInSeconds = record.running_time_in_seconds
 
         # Name
-        self.projectDirectory = gpu_process_obj.cwd.strip()
-        self.projectName = gpu_process_obj.project_name.strip()
-        self.screenSessionName = gpu_process_obj.screen_session_name.strip()
-        self.pyFileName = gpu_process_obj.python_file.strip()
-
-        self.pythonVersion = gpu_process_obj.python_version.strip()
-        self.commandLine = gpu_process_obj.command.strip()
-        self.condaEnvName = gpu_process_obj.conda_env.strip()
+        self.projectDirectory = record.cwd.strip()
+        self.projectName = record.project_name.strip()
+        self.screenSessionName = record.screen_session_name.strip()
+        self.pyFileName = record.python_file.strip()
+
+        self.pythonVersion = record.python_version.strip()
+        self.commandLine = record.command.strip()
+        self.condaEnvName = record.conda_env.strip()
@@ -20,18 +20,18 @@ def gpu_monitor_start(gpu_id: int):
     logger.info(f"[Group Center] Gpu{gpu_id} Monitor Start")
 
 
-def gpu_task_message(process_obj, task_event: TaskEvent):
+def gpu_task_message(record, gpu, task_event: TaskEvent):
     if not USE_GROUP_CENTER:
         return
 
-    from feature.monitor.gpu.gpu_process import GPUProcessInfo
+    from feature.monitor.gpu.task.task_record import TaskRecord
 
-    process_obj: GPUProcessInfo = process_obj
+    record: TaskRecord = record
 
     logger.info(
         f"[Group Center] Task "
-        f"User:{process_obj.user.name_cn} "
-        f"PID:{process_obj.pid} "
+        f"User:{record.user.name_cn} "
+        f"PID:{record.pid} "
         f"Event:{task_event.value}"
     )
 
@@ -41,7 +41,7 @@ def gpu_task_message(process_obj, task_event: TaskEvent):
         "serverNameEng": SERVER_NAME_SHORT,
     }
 
-    task_info_obj = TaskInfoForGroupCenter(process_obj)
+    task_info_obj = TaskInfoForGroupCenter(record, gpu)
 
     data_dict.update(task_info_obj.__dict__)
 
@@ -0,0 +1,42 @@
+from typing import Any
+
+DEVICE_BACKEND_NAME_TUPLE: tuple[str, ...] = ("nvml", "simulated")
+
+
+class DeviceBackend:
+    """
+    GPU设备后端。
+
+    `get_device` 返回的设备对象需提供与 `nvitop.Device` 相同的方法(监控用到的部分)：
+    `oneshot`、`name`、`uuid`、`bus_id`、`memory_info`、`memory_total`、`memory_percent`、
+    `gpu_utilization`、`memory_utilization`、`power_usage`、`power_limit`、`temperature`、
+    `processes`；`processes` 返回的进程对象需提供与 `nvitop.GpuProcess` 相同的方法。
+    """
+
+    name: str = ""
+
+    def count(self) -> int:
+        raise NotImplementedError(f"{self.name} backend should implement this method.")
+
+    def get_device(self, index: int) -> Any:
+        raise NotImplementedError(f"{self.name} backend should implement this method.")
+
+
+def create_device_backend(backend_name: str, **kwargs) -> DeviceBackend:
+    """
+    :param backend_name: `nvml`(真实GPU) 或 `simulated`(模拟GPU)
+    :param kwargs: 模拟后端的参数，见 `SimulatedDeviceBackend`
+    """
+    backend_name = backend_name.strip().lower()
+
+    if backend_name == "simulated":
+        from feature.monitor.gpu.backend.simulated_backend import SimulatedDeviceBackend
+
+        return SimulatedDeviceBackend(**kwargs)
+
+    if backend_name != "nvml":
+        raise ValueError(f"Unsupported GPU device backend: {backend_name}")
+
+    from feature.monitor.gpu.backend.nvml_backend import NvmlDeviceBackend
+
+    return NvmlDeviceBackend()
@@ -0,0 +1,15 @@
+from nvitop import Device
+
+from feature.monitor.gpu.backend.base import DeviceBackend
+
+
+class NvmlDeviceBackend(DeviceBackend):
+    """通过nvitop(NVML)访问真实GPU"""
+
+    name = "nvml"
+
+    def count(self) -> int:
+        return Device.count()
+
+    def get_device(self, index: int) -> Device:
+        return Device(index)
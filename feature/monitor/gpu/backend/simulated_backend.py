@@ -0,0 +1,351 @@
+"""
+模拟GPU后端，用于在没有GPU的机器上运行、压测监控程序。
+
+设备的核心占用按负载曲线(`SimulatedLoadProfile`，正弦波或分段脚本)变化，
+功率、温度由同一次采样推算；进程显存在启动后逐渐增长到目标值。
+每张卡维持固定数量的模拟进程，进程寿命到期后结束，并由新进程补位，从而产生进程的出现与消失。
+"""
+
+import contextlib
+import datetime
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from nvitop.api.device import MemoryInfo
+from nvitop.api.utils import NA, bytes2human, timedelta2human
+
+from feature.monitor.gpu.backend.base import DeviceBackend
+
+SimulatedHostMemoryInfo = namedtuple("SimulatedHostMemoryInfo", ["rss", "vms"])
+
+GiB = 1024 ** 3
+
+# 模拟进程的pid从这里开始分配，避免与真实进程冲突
+SIMULATED_PID_START = 10_000_000
+
+
+def parse_utilization_script(script: str) -> tuple[tuple[float, int], ...]:
+    """
+    :param script: 逗号分隔的 `持续秒数:核心占用`，如 `300:90,120:5`，按顺序循环
+    :raise ValueError: 格式错误
+    """
+    segment_list = []
+    for segment in script.split(","):
+        segment = segment.strip()
+        if not segment:
+            continue
+        duration, utilization = segment.split(":")
+        duration, utilization = float(duration), int(utilization)
+        if duration <= 0 or not 0 <= utilization <= 100:
+            raise ValueError(f"Invalid utilization script segment: {segment}")
+        segment_list.append((duration, utilization))
+    return tuple(segment_list)
+
+
+@dataclass(frozen=True)
+class SimulatedLoadProfile:
+    """
+    模拟GPU的负载曲线。
+
+    :param utilization_base: 核心占用的中心值(%)
+    :param utilization_amplitude: 正弦波振幅(%)
+    :param utilization_period: 正弦波周期(秒)
+    :param utilization_noise: 每次采样叠加的随机噪声幅度(%)
+    :param utilization_script: 分段脚本，见 `parse_utilization_script`，非空时代替正弦波
+    :param memory_ramp_seconds: 进程启动后显存线性增长到目标值所需的秒数
+    :param memory_wave: 显存达到目标值后的相对波动幅度
+    """
+
+    utilization_base: float = 60.0
+    utilization_amplitude: float = 35.0
+    utilization_period: float = 2 * math.pi * 60
+    utilization_noise: float = 5.0
+    utilization_script: tuple[tuple[float, int], ...] = ()
+    memory_ramp_seconds: float = 30.0
+    memory_wave: float = 0.05
+
+    def get_utilization(self, clock_time: float, phase: float) -> float:
+        """不含噪声的核心占用"""
+        if len(self.utilization_script) > 0:
+            script_duration = sum(duration for duration, _ in self.utilization_script)
+            # 各卡按相位错开
+            offset = (clock_time + phase / (2 * math.pi) * script_duration) % script_duration
+            for duration, utilization in self.utilization_script:
+                if offset < duration:
+                    return utilization
+                offset -= duration
+            return self.utilization_script[-1][1]
+
+        wave = math.sin(2 * math.pi * clock_time / max(1.0, self.utilization_period) + phase)
+        return self.utilization_base + self.utilization_amplitude * wave
+
+
+class SimulatedProcess:
+    """与 `nvitop.GpuProcess` 接口一致的模拟进程"""
+
+    def __init__(
+            self,
+            pid: int,
+            device: "SimulatedDevice",
+            user_name: str,
+            create_time: float,
+            lifetime: float,
+            gpu_memory_target: int,
+            host_memory: int,
+    ) -> None:
+        self.pid: int = pid
+        self.device: "SimulatedDevice" = device
+        self.user_name: str = user_name
+
+        self._create_time: float = create_time
+        self.lifetime: float = lifetime
+        self.gpu_memory_target: int = gpu_memory_target
+        self.host_memory: int = host_memory
+
+        project_name = f"project_{pid % 7}"
+        self._cwd: str = f"/data/{user_name}/{project_name}"
+        self._exe: str = "/opt/conda/envs/simulated/bin/python3.10"
+        self._cmdline: list[str] = [self._exe, "train.py", "--epochs", "100"]
+        self._environ: dict[str, str] = {
+            "CONDA_DEFAULT_ENV": "simulated",
+            "CUDA_VISIBLE_DEVICES": str(device.index),
+            "WORLD_SIZE": "1",
+            "LOCAL_RANK": "0",
+            "STY": f"{pid}.{project_name}",
+        }
+
+    @property
+    def finish_time(self) -> float:
+        return self._create_time + self.lifetime
+
+    def is_running(self) -> bool:
+        return self.device.backend.clock() < self.finish_time
+
+    def name(self) -> str:
+        return "python"
+
+    def username(self) -> str:
+        return self.user_name
+
+    def cwd(self) -> str:
+        return self._cwd
+
+    def exe(self) -> str:
+        return self._exe
+
+    def cmdline(self) -> list[str]:
+        return list(self._cmdline)
+
+    def command(self) -> str:
+        return " ".join(self._cmdline)
+
+    def environ(self) -> dict[str, str]:
+        return dict(self._environ)
+
+    def create_time(self) -> float:
+        return self._create_time
+
+    def running_time_in_seconds(self) -> float:
+        return max(0.0, self.device.backend.clock() - self._create_time)
+
+    def running_time_human(self) -> str:
+        return timedelta2human(
+            datetime.timedelta(seconds=self.running_time_in_seconds())
+        )
+
+    def memory_info(self) -> SimulatedHostMemoryInfo:
+        return SimulatedHostMemoryInfo(rss=self.host_memory, vms=self.host_memory * 2)
+
+    def gpu_memory(self) -> int:
+        # 启动后显存线性增长到目标值，之后小幅波动
+        profile = self.device.backend.load_profile
+        running_time = self.running_time_in_seconds()
+        ramp = min(1.0, running_time / max(1e-6, profile.memory_ramp_seconds))
+        wave = 1.0 + profile.memory_wave * math.sin(running_time / 10.0 + self.pid)
+        return int(self.gpu_memory_target * ramp * wave)
+
+    def gpu_memory_human(self) -> str:
+        return bytes2human(self.gpu_memory())
+
+
+class SimulatedDevice:
+    """与 `nvitop.Device` 接口一致的模拟GPU"""
+
+    def __init__(self, backend: "SimulatedDeviceBackend", index: int) -> None:
+        self.backend: "SimulatedDeviceBackend" = backend
+        self.index: int = index
+        self.random = random.Random(backend.seed * 1000 + index)
+
+        self._memory_total: int = backend.memory_total
+        self._phase: float = self.random.uniform(0, 2 * math.pi)
+        self._processes: dict[int, SimulatedProcess] = {}
+        # `oneshot` 期间固定的核心占用采样
+        self._utilization_sample: Optional[int] = None
+
+        self.refresh_processes(initial=True)
+
+    @contextlib.contextmanager
+    def oneshot(self):
+        """与NVML一致，期间读取的各项指标来自同一次采样，相互吻合"""
+        self._utilization_sample = self.sample_gpu_utilization()
+        try:
+            yield
+        finally:
+            self._utilization_sample = None
+
+    def name(self) -> str:
+        return "NVIDIA GeForce RTX 4090 (Simulated)"
+
+    def uuid(self) -> str:
+        return f"GPU-00000000-0000-0000-0000-{self.index:012d}"
+
+    def bus_id(self) -> str:
+        return f"00000000:{self.index + 1:02X}:00.0"
+
+    def driver_version(self) -> str:
+        return "0.0.0"
+
+    def power_limit(self) -> int:
+        return 450_000  # mW
+
+    def memory_total(self) -> int:
+        return self._memory_total
+
+    def memory_info(self) -> MemoryInfo:
+        used = min(
+            self._memory_total,
+            sum(process.gpu_memory() for process in self.processes().values()),
+        )
+        return MemoryInfo(
+            total=self._memory_total,
+            free=self._memory_total - used,
+            used=used,
+            reserved=NA,
+        )
+
+    def memory_percent(self) -> float:
+        total, _, used, _ = self.memory_info()
+        return round(100.0 * used / total, 1)
+
+    def sample_gpu_utilization(self) -> int:
+        if len(self._processes) == 0:
+            return 0
+        profile = self.backend.load_profile
+        utilization = profile.get_utilization(self.backend.clock(), self._phase)
+        noise = self.random.uniform(-profile.utilization_noise, profile.utilization_noise)
+        return int(min(100, max(0, utilization + noise)))
+
+    def gpu_utilization(self) -> int:
+        if self._utilization_sample is not None:
+            return self._utilization_sample
+        return self.sample_gpu_utilization()
+
+    # 以下指标由核心占用推算，在 `oneshot` 外调用时各自重新采样
+    def memory_utilization(self) -> int:
+        return self.gpu_utilization() // 2
+
+    def power_usage(self) -> int:
+        return int(self.power_limit() * (0.15 + 0.85 * self.gpu_utilization() / 100))
+
+    def temperature(self) -> int:
+        return 35 + self.gpu_utilization() // 2
+
+    def processes(self) -> dict[int, SimulatedProcess]:
+        self.refresh_processes()
+        return dict(self._processes)
+
+    def refresh_processes(self, initial: bool = False) -> None:
+        """结束寿命到期的进程，并补充新进程到目标数量"""
+        with self.backend.lock:
+            for pid, process in list(self._processes.items()):
+                if not process.is_running():
+                    del self._processes[pid]
+
+            while len(self._processes) < self.backend.processes_per_device:
+                process = self.backend.new_process(self, initial)
+                self._processes[process.pid] = process
+
+
+class SimulatedDeviceBackend(DeviceBackend):
+    """
+    模拟GPU后端。
+
+    :param device_count: GPU数量
+    :param processes_per_device: 每张GPU上同时运行的进程数
+    :param process_lifetime: 进程平均寿命(秒)，按指数分布随机
+    :param memory_total_gb: 每张GPU的显存(GiB)
+    :param user_name_list: 模拟进程所属用户，进程工作目录为 `/data/<user>/...`
+    :param seed: 随机种子
+    :param clock: 时间来源，压测时可传入虚拟时钟
+    :param load_profile: 负载曲线
+    """
+
+    name = "simulated"
+
+    def __init__(
+            self,
+            device_count: int = 8,
+            processes_per_device: int = 4,
+            process_lifetime: float = 600.0,
+            memory_total_gb: int = 24,
+            user_name_list: list[str] | None = None,
+            seed: int = 0,
+            clock: Callable[[], float] = time.time,
+            load_profile: SimulatedLoadProfile = SimulatedLoadProfile(),
+    ) -> None:
+        self.device_count: int = max(0, device_count)
+        self.processes_per_device: int = max(0, processes_per_device)
+        self.process_lifetime: float = max(1.0, process_lifetime)
+        # 至少1GiB，避免计算显存占比时除以0
+        self.memory_total: int = max(1, memory_total_gb) * GiB
+        self.user_name_list: list[str] = user_name_list or [
+            f"sim_user{idx}" for idx in range(8)
+        ]
+        self.seed: int = seed
+        self.clock: Callable[[], float] = clock
+        self.load_profile: SimulatedLoadProfile = load_profile
+
+        self.lock = threading.RLock()
+        self.random = random.Random(seed)
+        self._next_pid: int = SIMULATED_PID_START
+
+        self._devices: dict[int, SimulatedDevice] = {}
+
+    def count(self) -> int:
+        return self.device_count
+
+    def get_device(self, index: int) -> SimulatedDevice:
+        if not 0 <= index < self.device_count:
+            raise IndexError(f"Simulated GPU index out of range: {index}")
+
+        with self.lock:
+            if index not in self._devices:
+                self._devices[index] = SimulatedDevice(self, index)
+            return self._devices[index]
+
+    def new_process(
+            self, device: SimulatedDevice, initial: bool = False
+    ) -> SimulatedProcess:
+        with self.lock:
+            pid = self._next_pid
+            self._next_pid += 1
+
+            lifetime = max(1.0, self.random.expovariate(1.0 / self.process_lifetime))
+            now = self.clock()
+            # 启动时已存在的进程随机分布在其生命周期中
+            create_time = now - self.random.uniform(0, lifetime) if initial else now
+
+            return SimulatedProcess(
+                pid=pid,
+                device=device,
+                user_name=self.user_name_list[pid % len(self.user_name_list)],
+                create_time=create_time,
+                lifetime=lifetime,
+                gpu_memory_target=int(self.random.uniform(1, 6) * GiB),
+                host_memory=int(self.random.uniform(2, 8) * GiB),
+            )
@@ -0,0 +1,234 @@
+"""
+GPU静态信息(名称、UUID、显存总量、TDP、驱动版本、PCI总线号)缓存。
+
+静态信息在启动时查询一次，以设备UUID为键持久化到磁盘，重启后直接读取。
+刷新策略:
+- `driver`: 驱动版本变化(如驱动升级)后重新查询，默认；
+- `always`: 每次启动都重新查询；
+- `never`: 只要缓存中存在就不再查询。
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+
+from nvitop.api.utils import NA
+
+from config.settings import GPU_METADATA_CACHE_FILE, GPU_METADATA_REFRESH_POLICY
+from feature.utils.logs import get_logger
+
+logger = get_logger()
+
+REFRESH_POLICY_LIST = ("driver", "always", "never")
+
+NVIDIA_DRIVER_VERSION_FILE = "/proc/driver/nvidia/version"
+NVIDIA_DRIVER_VERSION_PATTERN = re.compile(r"Kernel Module {2}(\d+\.\d+\.\d+)")
+
+
+def get_gpu_name_short(name: str) -> str:
+    """去掉GPU名称中的 NVIDIA、GeForce、Quadro"""
+    current_str = name
+    current_str_upper = name.upper()
+    keywords = ["NVIDIA", "GeForce", "Quadro"]
+
+    for keyword in keywords:
+        keyword_upper = keyword.upper()
+        while keyword_upper in current_str_upper:
+            index = current_str_upper.index(keyword_upper)
+            # 计算关键词在原始字符串中的起始位置
+            index_original = current_str_upper[:index].count(" ") - current_str[
+                                                                    :index
+                                                                    ].count(" ")
+            # 删除原始字符串中的关键词
+            current_str = (
+                    current_str[:index_original]
+                    + current_str[index_original + len(keyword) + 1:]
+            )
+            current_str_upper = current_str.upper()
+    return current_str.strip()
+
+
+def read_kernel_driver_version() -> str:
+    try:
+        with open(NVIDIA_DRIVER_VERSION_FILE, "r") as f:
+            nvidia_driver_version = f.read()
+    except Exception:
+        return ""
+
+    match = NVIDIA_DRIVER_VERSION_PATTERN.search(nvidia_driver_version)
+    return match.group(1).strip() if match else ""
+
+
+def _get_str(value) -> str:
+    return value if isinstance(value, str) and value is not NA else ""
+
+
+@dataclass(frozen=True)
+class DeviceMetadata:
+    uuid: str
+    name: str = ""
+    name_short: str = ""
+    memory_total: int = 0  # bytes
+    tdp: int = 0  # W
+    driver_version: str = ""
+    bus_id: str = ""
+    query_time: float = 0.0  # timestamp
+
+    @classmethod
+    def query(cls, device, uuid: str, driver_version: str) -> "DeviceMetadata":
+        name = _get_str(device.name())
+        memory_total = device.memory_total()
+        power_limit = device.power_limit()  # mW
+
+        return cls(
+            uuid=uuid,
+            name=name,
+            name_short=get_gpu_name_short(name),
+            memory_total=memory_total if isinstance(memory_total, int) else 0,
+            tdp=(
+                int(round(power_limit / 1000, 0))
+                if isinstance(power_limit, int)
+                else 0
+            ),
+            driver_version=driver_version,
+            bus_id=_get_str(device.bus_id()),
+            query_time=time.time(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DeviceMetadata":
+        field_name_set = {field.name for field in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in field_name_set})
+
+
+class DeviceMetadataCache:
+    def __init__(
+            self, persist_file_path: str = "", refresh_policy: str = "driver"
+    ) -> None:
+        self.persist_file_path: str = persist_file_path.strip()
+
+        refresh_policy = refresh_policy.strip().lower()
+        if refresh_policy not in REFRESH_POLICY_LIST:
+            logger.warning(
+                f"[DeviceMetadata]Unknown refresh policy: {refresh_policy}, "
+                f"use 'driver' instead."
+            )
+            refresh_policy = "driver"
+        self.refresh_policy: str = refresh_policy
+
+        # UUID -> 静态信息
+        self._metadata_dict: dict[str, DeviceMetadata] = {}
+        # GPU序号 -> 本次运行中该序号对应的静态信息
+        self._index_dict: dict[int, DeviceMetadata] = {}
+        self._kernel_driver_version: str | None = None
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def is_valid(self, metadata: DeviceMetadata, driver_version: str) -> bool:
+        if self.refresh_policy == "always":
+            return False
+        if self.refresh_policy == "never":
+            return True
+        return metadata.driver_version == driver_version
+
+    def get(self, index: int, device) -> DeviceMetadata:
+        """
+        获取GPU的静态信息，缓存无效时查询设备并写回缓存。
+        :param index: GPU序号
+        :param device: 设备后端提供的设备对象
+        """
+        try:
+            uuid = _get_str(device.uuid())
+            driver_version = _get_str(device.driver_version())
+        except Exception as e:
+            logger.error(f"[DeviceMetadata]GPU:{index} query uuid error: {e}")
+            uuid = ""
+            driver_version = ""
+
+        with self._lock:
+            metadata = self._metadata_dict.get(uuid) if uuid else None
+            if metadata is not None and self.is_valid(metadata, driver_version):
+                self._index_dict[index] = metadata
+                return metadata
+
+        try:
+            metadata = DeviceMetadata.query(device, uuid, driver_version)
+        except Exception as e:
+            logger.error(f"[DeviceMetadata]GPU:{index} query error: {e}")
+            return DeviceMetadata(uuid=uuid, driver_version=driver_version)
+
+        with self._lock:
+            self._index_dict[index] = metadata
+            # 无法获取UUID时不持久化
+            if uuid:
+                self._metadata_dict[uuid] = metadata
+
+        if uuid:
+            self.save()
+        return metadata
+
+    def get_driver_version(self, index: int = -1) -> str:
+        """
+        驱动版本，优先使用已查询过的GPU静态信息，
+        否则读取一次 `/proc/driver/nvidia/version` 并缓存。
+        """
+        with self._lock:
+            metadata = self._index_dict.get(index)
+            if metadata is None and len(self._index_dict) > 0:
+                metadata = next(iter(self._index_dict.values()))
+            if metadata is not None and metadata.driver_version:
+                return metadata.driver_version
+
+            if self._kernel_driver_version is None:
+                self._kernel_driver_version = read_kernel_driver_version()
+            return self._kernel_driver_version
+
+    def load(self) -> None:
+        if not self.persist_file_path or not os.path.exists(self.persist_file_path):
+            return
+
+        try:
+            with open(self.persist_file_path, "r", encoding="utf-8") as f:
+                data_dict: dict = json.load(f)
+        except Exception as e:
+            logger.warning(f"[DeviceMetadata]Load {self.persist_file_path} error: {e}")
+            return
+
+        with self._lock:
+            for uuid, data in data_dict.items():
+                try:
+                    self._metadata_dict[uuid] = DeviceMetadata.from_dict(data)
+                except TypeError:
+                    continue
+
+        logger.info(f"[DeviceMetadata]Loaded {len(self._metadata_dict)} devices.")
+
+    def save(self) -> None:
+        if not self.persist_file_path:
+            return
+
+        with self._lock:
+            data_dict = {
+                uuid: asdict(metadata) for uuid, metadata in self._metadata_dict.items()
+            }
+
+        try:
+            persist_dir = os.path.dirname(os.path.abspath(self.persist_file_path))
+            os.makedirs(persist_dir, exist_ok=True)
+
+            tmp_file_path = self.persist_file_path + ".tmp"
+            with open(tmp_file_path, "w", encoding="utf-8") as f:
+                json.dump(data_dict, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file_path, self.persist_file_path)
+        except Exception as e:
+            logger.warning(f"[DeviceMetadata]Save {self.persist_file_path} error: {e}")
+
+
+device_metadata_cache = DeviceMetadataCache(
+    persist_file_path=GPU_METADATA_CACHE_FILE,
+    refresh_policy=GPU_METADATA_REFRESH_POLICY,
+)
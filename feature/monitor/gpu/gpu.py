@@ -1,50 +1,121 @@
 import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
 
 from nvitop import Device
 from nvitop.api.process import GpuProcess
 from nvitop.api.utils import NaType
 
-from config.settings import WEBHOOK_DELAY_SEND_SECONDS
-from feature.global_variable.gpu import (
-    global_gpu_info,
-    global_gpu_task,
-    global_gpu_usage,
-    global_variable_gpu_updated
-)
+from config.settings import GPU_PROCESS_ENRICH_WORKERS, WEBHOOK_DELAY_SEND_SECONDS
+from feature.global_variable.gpu import GpuState, global_gpu_history
+from feature.monitor.gpu.device_metadata import DeviceMetadata, device_metadata_cache
 from feature.monitor.gpu.gpu_process import GPUProcessInfo
+from feature.monitor.gpu.gpu_snapshot import GpuSnapshot
 from feature.monitor.gpu.task.for_webhook import TaskInfoForWebHook
 from feature.monitor.monitor_enum import TaskState
-from feature.monitor.utils import Converter
 from feature.notify.message_handler import MessageHandler
 from feature.sql.sqlite import get_sql
+from feature.utils.process.proc_reader import proc_reader
 from feature.utils.logs import get_logger
 
 logger = get_logger()
 sql = get_sql()
 
+# 所有GPU共享的进程信息补全线程池
+enrich_executor: ThreadPoolExecutor | None = (
+    ThreadPoolExecutor(
+        max_workers=GPU_PROCESS_ENRICH_WORKERS,
+        thread_name_prefix="gpu_process_enrich",
+    )
+    if GPU_PROCESS_ENRICH_WORKERS > 0
+    else None
+)
+
+
+def submit_enrich(process: GPUProcessInfo) -> Future:
+    if enrich_executor is not None:
+        return enrich_executor.submit(process.enrich)
+
+    future = Future()
+    try:
+        future.set_result(process.enrich())
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
 
 class GPU:
-    def __init__(self, gpu_id: int, multi_gpu_machine_flag: bool):
+    def __init__(self, gpu_id: int, multi_gpu_machine_flag: bool, device=None):
+        """
+        :param device: 设备后端提供的设备对象，默认为真实GPU(`nvitop.Device`)
+        """
         self.gpu_id = gpu_id
         self.is_multi_gpu_machine = multi_gpu_machine_flag
 
         self.processes: dict = {}
-        self.nvidia_i: Device = Device(self.gpu_id)
+        # 本周期的NVML进程表，每周期只查询一次，供各处理步骤共享
+        self.tick_processes: dict[int, GpuProcess] | None = None
+        # 已发现但信息尚未补全的进程，补全完成前不发送任何通知
+        self.enriching_processes: dict[int, GPUProcessInfo] = {}
+        self.enrich_future_dict: dict[int, Future] = {}
+        # 已补全但不是Python任务的进程，进程结束前不再重复补全
+        self.ignored_pids: set[int] = set()
+        self.nvidia_i: Device = device if device is not None else Device(self.gpu_id)
+        self.snapshot: GpuSnapshot = GpuSnapshot(self.gpu_id)
+        self.metadata: DeviceMetadata = device_metadata_cache.get(
+            self.gpu_id, self.nvidia_i
+        )
 
         self._num_task: int = 0
 
+        # 消息片段按需生成并缓存：任务集合变化或进入新的周期后失效
+        self._tick: int = 0
+        self._task_set_version: int = 0
+        self._gpu_tasks_num_msg_header_cache: tuple[int, str] | None = None
+        self._all_tasks_msg_body_cache: tuple[tuple[int, int], str] | None = None
+
+        self.gpu_info: MappingProxyType = MappingProxyType({})
         self.get_gpu_info()
+        # 最近一个周期结束时的只读状态，由监控线程统一发布
+        self.state: GpuState = GpuState(self.gpu_id, info=self.gpu_info)
 
     def update(self):
-        self.update_global_gpu_status()
-        self.update_all_processes_info()
-        self.handle_death_processes()
-        self.update_new_processes_info()
-        self.update_global_gpu_task()
+        self._tick += 1
+        self.update_snapshot()
+        self.update_global_gpu_history()
+        self.update_tick_processes()
+        if self.all_processes is not None:
+            self.update_all_processes_info()
+            self.collect_enriched_processes()
+            self.handle_death_processes()
+            self.update_new_processes_info()
+        self.update_gpu_state()
+
+    def update_snapshot(self):
+        try:
+            self.snapshot = GpuSnapshot.collect(self.gpu_id, self.nvidia_i)
+        except Exception as e:
+            logger.error(f"[GPU:{self.gpu_id}]Collect snapshot error: {e}")
+
+    def update_tick_processes(self):
+        try:
+            self.tick_processes = self.nvidia_i.processes()
+        except Exception as e:
+            self.tick_processes = None
+            logger.error(e)
+            MessageHandler.enqueue_except_warning_msg("process")
 
     def update_all_processes_info(self):
-        for pid in self.processes:
-            self.processes[pid].update_gpu_process_info()
+        cur_gpu_all_processes = self.all_processes
+        # 一次读取所有存活任务的 `/proc` 信息，与其他GPU共享本周期的结果
+        proc_info_dict = proc_reader.read(
+            pid for pid in self.processes if pid in cur_gpu_all_processes
+        )
+        for pid, process in self.processes.items():
+            if pid not in cur_gpu_all_processes:
+                continue
+            process.gpu_process = cur_gpu_all_processes[pid]
+            process.update_gpu_process_info(proc_info_dict.get(pid))
 
     def handle_death_processes(self):
         tmp_process = copy.copy(self.processes)
@@ -52,22 +123,62 @@ class GPU:
         for pid in tmp_process:
             if pid in cur_gpu_all_processes:
                 continue
-            self.processes[pid].set_finish_time()
-            self.get_all_tasks_msg_body_for_task_finish(pid)
+            # 先移出任务列表，结束消息中的任务列表便不再包含该任务
+            death_process = self.processes.pop(pid)
+            self._task_set_version += 1
+            death_process.set_finish_time()
             self.num_task -= 1
-            self.processes[pid].state = TaskState.DEATH
-            del self.processes[pid]
+            death_process.state = TaskState.DEATH
         del tmp_process
 
-        self.get_all_tasks_msg_body()
+        self.ignored_pids.intersection_update(cur_gpu_all_processes.keys())
 
     def update_new_processes_info(self):
-        for pid, gpu_process in self.all_processes.items():
-            if pid in self.processes:
+        new_pid_list = [
+            pid
+            for pid in self.all_processes
+            if pid not in self.processes
+            and pid not in self.enriching_processes
+            and pid not in self.ignored_pids
+        ]
+        # 监控线程只读取status，cmdline、exe、cwd由 `enrich` 在后台线程读取
+        proc_info_dict = proc_reader.read(new_pid_list)
+
+        for pid in new_pid_list:
+            gpu_process = self.all_processes[pid]
+            # 先登记，再交给后台线程补全信息
+            new_process = GPUProcessInfo(
+                pid, self.gpu_id, gpu_process, proc_info_dict.get(pid)
+            )
+            self.enriching_processes[pid] = new_process
+            self.enrich_future_dict[pid] = submit_enrich(new_process)
+
+        if enrich_executor is None:
+            self.collect_enriched_processes()
+
+    def collect_enriched_processes(self):
+        """
+        将补全完成的Python进程加入任务列表。
+
+        补全期间已结束的进程同样会被加入，随后在本周期的死亡检测中结束。
+        """
+        for pid, future in list(self.enrich_future_dict.items()):
+            if not future.done():
+                continue
+
+            new_process = self.enriching_processes.pop(pid)
+            del self.enrich_future_dict[pid]
+
+            exception = future.exception()
+            if exception is not None:
+                logger.warning(
+                    f"[GPU:{self.gpu_id}]Enrich process {pid} error: {exception}"
+                )
+                self.ignored_pids.add(pid)
                 continue
 
-            new_process = GPUProcessInfo(pid, self.gpu_id, gpu_process)
             if not new_process.is_python:
+                self.ignored_pids.add(pid)
                 continue
 
             if new_process.running_time_in_seconds > WEBHOOK_DELAY_SEND_SECONDS:
@@ -77,42 +188,34 @@ class GPU:
 
             new_process.gpu = self
             self.processes[pid] = new_process
+            self._task_set_version += 1
 
         self.num_task: int = len(self.processes)
 
     @property
     def all_processes(self) -> dict[int, GpuProcess] | None:
-        try:
-            return self.nvidia_i.processes()
-        except Exception as e:
-            logger.error(e)
-            MessageHandler.enqueue_except_warning_msg("process")
+        """本周期的进程表，查询失败时为None"""
+        return self.tick_processes
 
     @property
     def name(self) -> str:
-        return self.nvidia_i.name()
+        return self.metadata.name
 
     @property
     def name_short(self) -> str:
-        current_str = self.name
-        current_str_upper = self.name.upper()
-        keywords = ["NVIDIA", "GeForce", "Quadro"]
-
-        for keyword in keywords:
-            keyword_upper = keyword.upper()
-            while keyword_upper in current_str_upper:
-                index = current_str_upper.index(keyword_upper)
-                # 计算关键词在原始字符串中的起始位置
-                index_original = current_str_upper[:index].count(" ") - current_str[
-                                                                        :index
-                                                                        ].count(" ")
-                # 删除原始字符串中的关键词
-                current_str = (
-                        current_str[:index_original]
-                        + current_str[index_original + len(keyword) + 1:]
-                )
-                current_str_upper = current_str.upper()
-        return current_str.strip()
+        return self.metadata.name_short
+
+    @property
+    def uuid(self) -> str:
+        return self.metadata.uuid
+
+    @property
+    def bus_id(self) -> str:
+        return self.metadata.bus_id
+
+    @property
+    def driver_version(self) -> str:
+        return self.metadata.driver_version
 
     @property
     def name_for_msg(self) -> str:
@@ -135,81 +238,96 @@ class GPU:
     @num_task.setter
     def num_task(self, value) -> None:
         self._num_task = value
-        self.get_gpu_tasks_num_msg_header()
 
     @property
     def gpu_utilization(self) -> int | NaType:
-        return self.nvidia_i.gpu_utilization()
+        return self.snapshot.gpu_utilization
 
     @property
     def memory_utilization(self) -> int | NaType:
-        return self.nvidia_i.memory_utilization()
+        return self.snapshot.memory_utilization
 
     @property
     def memory_used_human(self) -> str | NaType:
-        return self.nvidia_i.memory_used_human()
+        return self.snapshot.memory_used_human
 
     @property
     def memory_free_human(self) -> str | NaType:
-        return self.nvidia_i.memory_free_human()
+        return self.snapshot.memory_free_human
 
     @property
     def memory_percent(self) -> float | NaType:
-        return self.nvidia_i.memory_percent()
+        return self.snapshot.memory_percent
 
     @property
     def memory_total(self) -> int | NaType:
         """Total GPU memory in `bytes`."""
-        return self.nvidia_i.memory_total()
+        return self.snapshot.memory_total
 
     @property
     def memory_total_human(self) -> str | NaType:
-        return self.nvidia_i.memory_total_human()
+        return self.snapshot.memory_total_human
 
     @property
-    def power_usage(self) -> int:
-        return int(round(self.nvidia_i.power_usage() / 1000, 0))
+    def power_usage(self) -> int | NaType:
+        return self.snapshot.power_usage
 
     @property
     def TDP(self) -> int:
-        return int(round(self.nvidia_i.power_limit() / 1000, 0))
+        return self.metadata.tdp
 
     @property
-    def temperature(self) -> int:
-        return self.nvidia_i.temperature()
+    def temperature(self) -> int | NaType:
+        return self.snapshot.temperature
 
-    def get_gpu_tasks_num_msg_header(self):
-        if self.num_task == 0:
-            self.gpu_tasks_num_msg_header = f"{self.name_for_msg}当前无任务\n"
+    @property
+    def gpu_tasks_num_msg_header(self) -> str:
+        num_task = self.num_task
+        if (
+                self._gpu_tasks_num_msg_header_cache is not None
+                and self._gpu_tasks_num_msg_header_cache[0] == num_task
+        ):
+            return self._gpu_tasks_num_msg_header_cache[1]
+
+        if num_task == 0:
+            msg_header = f"{self.name_for_msg}当前无任务\n"
         else:
-            self.gpu_tasks_num_msg_header = (
-                f"{TaskInfoForWebHook.get_emoji('呲牙') * self.num_task}"
-                f"{self.name_for_msg}上正在运行{self.num_task}个任务：\n"
+            msg_header = (
+                f"{TaskInfoForWebHook.get_emoji('呲牙') * num_task}"
+                f"{self.name_for_msg}上正在运行{num_task}个任务：\n"
             )
 
+        self._gpu_tasks_num_msg_header_cache = (num_task, msg_header)
+        return msg_header
+
     @property
     def gpu_status_msg(self) -> str:
+        snapshot = self.snapshot
         return (
-            f"🌀{self.name_for_msg}核心占用: {self.gpu_utilization}%\n"
-            f"🌀{self.name_for_msg}显存占用: {self.memory_used_human}/{self.memory_total_human} "
-            f"({self.memory_percent}%)，{self.memory_free_human}空闲\n"
+            f"🌀{self.name_for_msg}核心占用: {snapshot.gpu_utilization}%\n"
+            f"🌀{self.name_for_msg}显存占用: "
+            f"{snapshot.memory_used_human}/{snapshot.memory_total_human} "
+            f"({snapshot.memory_percent}%)，{snapshot.memory_free_human}空闲\n"
         )
 
-    def get_all_tasks_msg_body(self) -> None:
+    @property
+    def all_tasks_msg_body(self) -> str:
         """all tasks msg"""
-        self.get_all_tasks_msg_body_for_task_finish(-1)
-
-    def get_all_tasks_msg_body_for_task_finish(self, finished_pid: int):
-        """all tasks that exclude finished msg"""
-        all_tasks_msg_list = []
-        task_idx = 0
-        for pid, process in self.processes.items():
-            if finished_pid == pid:
-                continue
-            all_tasks_msg_list.append(self.gen_task_msg_lite(task_idx, process))
-            task_idx += 1
+        # 显存、运行时长每个周期都会变化，同一周期内且任务集合未变时复用
+        cache_key = (self._task_set_version, self._tick)
+        if (
+                self._all_tasks_msg_body_cache is not None
+                and self._all_tasks_msg_body_cache[0] == cache_key
+        ):
+            return self._all_tasks_msg_body_cache[1]
+
+        msg_body = "".join(
+            self.gen_task_msg_lite(task_idx, process)
+            for task_idx, process in enumerate(self.processes.values())
+        )
 
-        self.all_tasks_msg_body = "".join(all_tasks_msg_list)
+        self._all_tasks_msg_body_cache = (cache_key, msg_body)
+        return msg_body
 
     @staticmethod
     def gen_task_msg_lite(task_idx: int, process: GPUProcessInfo) -> str:
@@ -226,55 +344,35 @@ class GPU:
 
     def get_gpu_info(self):
         try:
-            if self.gpu_id not in global_gpu_info:
-                global_gpu_info[self.gpu_id] = {}
-
-            global_gpu_info[self.gpu_id].update(
+            self.gpu_info = MappingProxyType(
                 {
                     "gpuName": self.name_short,
                     "gpuTDP": self.TDP,
-
                 }
             )
-
-            global_variable_gpu_updated()
         except AttributeError as e:
             print(f"Error updating GPU info: Missing attribute {e}")
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
-    def update_global_gpu_status(self):
-        try:
-            # 确保gpu_id对应的字典项存在
-            if self.gpu_id not in global_gpu_usage:
-                global_gpu_usage[self.gpu_id] = {}
-
-            # 直接使用字典的update方法更新信息，同时添加异常处理
-            global_gpu_usage[self.gpu_id].update(
-                {
-                    "coreUsage": self.gpu_utilization,
-                    "memoryUsage": self.memory_percent,
-                    "gpuMemoryTotalMB": Converter.convert_bytes_to_mb(
-                        self.memory_total
-                    ),
-                    "gpuMemoryUsage": self.memory_used_human,
-                    "gpuMemoryTotal": self.memory_total_human,
-                    "gpuPowerUsage": self.power_usage,
-                    "gpuTemperature": self.temperature,
-                }
-            )
-
-            global_variable_gpu_updated()
-        except AttributeError as e:
-            print(f"Error updating GPU status: Missing attribute {e}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-
-    def update_global_gpu_task(self):
-        # 在监视线程中就进行处理，哪怕这里阻塞了，也就是相当于多加一点延时
-        current_gpu_tasks_list = list(self.processes.values()).copy()
-        current_gpu_tasks_list.sort(key=lambda x: x.pid)
-
-        global_gpu_task[self.gpu_id].clear()
-        global_gpu_task[self.gpu_id].extend(current_gpu_tasks_list)
-        global_variable_gpu_updated()
+    def update_global_gpu_history(self):
+        if self.gpu_id >= len(global_gpu_history):
+            return
+
+        global_gpu_history[self.gpu_id].add_snapshot(self.snapshot)
+
+    def update_gpu_state(self):
+        """
+        构建本周期的只读状态，整体替换 `self.state`。
+        监控线程在所有GPU更新完毕后统一发布，读取方不会看到更新了一半的状态。
+        """
+        current_gpu_tasks_list = sorted(self.processes.values(), key=lambda x: x.pid)
+
+        self.state = GpuState(
+            gpu_id=self.gpu_id,
+            info=self.gpu_info,
+            usage=MappingProxyType(self.snapshot.to_usage_dict()),
+            task_list=tuple(
+                process.to_task_record() for process in current_gpu_tasks_list
+            ),
+        )
@@ -4,37 +4,84 @@ import os.path
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import psutil
 from nvitop import GpuProcess
 
-from config.settings import USERS, WEBHOOK_DELAY_SEND_SECONDS, EnvironmentManager
+from config.settings import (
+    EXECUTABLE_CACHE_FILE,
+    EXECUTABLE_CACHE_SIZE,
+    TASK_ENVIRON_KEYS,
+    TASK_MEMORY_TIMELINE_SIZE,
+    USERS,
+    VERSION_DETECT_SUBPROCESS_FALLBACK,
+    WEBHOOK_DELAY_SEND_SECONDS,
+    EnvironmentManager,
+)
 from config.user_info import UserInfo
 from feature.group_center import group_center_message
+from feature.monitor.gpu.device_metadata import device_metadata_cache
 from feature.monitor.gpu.task.for_sql import TaskInfoForSQL
 from feature.monitor.gpu.task.for_webhook import TaskInfoForWebHook
+from feature.monitor.gpu.task.memory_timeline import TaskMemoryTimeline
+from feature.monitor.gpu.task.task_record import TaskRecord
 from feature.monitor.monitor_enum import AllWebhookName, MsgType, TaskEvent, TaskState
 from feature.notify.message_handler import MessageHandler
 from feature.notify.webhook import Webhook
 from feature.sql.sqlite import get_sql
 from feature.utils.logs import get_logger
 from feature.utils.common_utils import do_command
+from feature.utils.executable_metadata_cache import ExecutableMetadataCache
+from feature.utils.process.proc_reader import (
+    ProcInfo,
+    proc_reader,
+    read_proc_detail,
+    read_proc_environ,
+)
+from feature.utils.version_detect import detect_cuda_version, detect_python_version
 
 logger = get_logger()
 sql = get_sql()
+executable_cache = ExecutableMetadataCache(
+    max_size=EXECUTABLE_CACHE_SIZE, persist_file_path=EXECUTABLE_CACHE_FILE
+)
+
+# 监控用到的环境变量总是读取，配置中的变量作为补充
+TASK_ENVIRON_KEY_LIST: tuple[str, ...] = tuple(
+    dict.fromkeys(
+        [
+            "STY",
+            "CONDA_DEFAULT_ENV",
+            "WORLD_SIZE",
+            "LOCAL_RANK",
+            "CUDA_VISIBLE_DEVICES",
+            "CUDA_HOME",
+            "CUDAToolkit_ROOT",
+            *TASK_ENVIRON_KEYS,
+        ]
+    )
+)
 
 
 class GPUProcessInfo:
-    def __init__(self, pid: int, gpu_id: int, gpu_process: GpuProcess) -> None:
+    def __init__(
+            self,
+            pid: int,
+            gpu_id: int,
+            gpu_process: GpuProcess,
+            proc_info: Optional[ProcInfo] = None,
+    ) -> None:
         self.task_id: str = datetime.now().strftime("%Y%m") + str(gpu_id) + str(pid)
 
         self.pid: int = pid
-        self.process_name: str = gpu_process.name()
+        self.process_name: str = ""
 
         # current GPU
         self.gpu_id: int = gpu_id
         self.gpu_process: GpuProcess = gpu_process
+        # 本周期批量读取的 `/proc` 信息
+        self.proc_info: Optional[ProcInfo] = proc_info
 
         self.num_task: int = 0
         self.process_environ: Optional[dict[str, str]] = None
@@ -51,6 +98,8 @@ class GPUProcessInfo:
         self.task_gpu_memory: int = 0
         self.task_gpu_memory_max: int = 0
         self.task_gpu_memory_human: str = ""
+        self.task_gpu_memory_max_human: str = ""
+        self.memory_timeline = TaskMemoryTimeline(TASK_MEMORY_TIMELINE_SIZE)
 
         self.user: Optional[UserInfo] = None
         self.conda_env: str = ""
@@ -79,9 +128,17 @@ class GPUProcessInfo:
         self._state: Optional[TaskState] = TaskState.DEFAULT  # init
         self._running_time_in_seconds: int = 0  # init
 
-        self.__init_info__()
+        # 进程刚被发现时只有上面的基础字段，其余信息由 `enrich` 在后台线程补全
+        self.is_python: bool = False
+        self.is_enriched: bool = False
 
-    def __init_info__(self):
+    def enrich(self) -> "GPUProcessInfo":
+        """补全进程信息(读取/proc、版本探测、用户识别与写入数据库)，可能较慢"""
+        # 读取cmdline可能被挂起的进程阻塞，只在补全线程中读取，不影响监控周期
+        if self.proc_info is not None and not self.proc_info.is_detailed:
+            self.proc_info = read_proc_detail(self.proc_info)
+
+        self.get_process_name()
         self.get_cwd()
         self.get_command()
         self.get_cmdline()
@@ -101,9 +158,12 @@ class GPUProcessInfo:
 
             self.get_nvidia_gpu_version()
 
-            self.update_gpu_process_info()
+            self.update_gpu_process_info(self.proc_info)
+
+            sql.insert_task_data(TaskInfoForSQL(self.to_task_record()))
 
-            sql.insert_task_data(TaskInfoForSQL(self.__dict__))
+        self.is_enriched = True
+        return self
 
     def get_all_env(self):
         self.get_screen_session_name()
@@ -117,12 +177,69 @@ class GPUProcessInfo:
         self.get_cuda_root()
         self.get_cuda_version()
 
-    def update_gpu_process_info(self):
+    def to_task_record(self) -> TaskRecord:
+        """
+        每次调用都构建新的记录(运行时长等字段每个周期都会变化)；
+        只有显存/内存统计按时间序列版本缓存，数据未变化时不重新计算
+        """
+        return TaskRecord(
+            task_id=self.task_id,
+            pid=self.pid,
+            gpu_id=self.gpu_id,
+            state=self._state,
+            user=self.user,
+            num_task=self.num_task,
+            start_time=self.start_time,
+            finish_time=self.finish_time,
+            running_time_in_seconds=self._running_time_in_seconds,
+            running_time_human=self.running_time_human,
+            task_main_memory_mb=self.task_main_memory_mb,
+            task_gpu_memory=self.task_gpu_memory,
+            task_gpu_memory_human=self.task_gpu_memory_human,
+            task_gpu_memory_max=self.task_gpu_memory_max,
+            task_gpu_memory_max_human=self.task_gpu_memory_max_human,
+            is_debug=self.is_debug,
+            is_multi_gpu=self.is_multi_gpu,
+            world_size=self.world_size,
+            local_rank=self.local_rank,
+            cwd=self.cwd,
+            command=self.command,
+            conda_env=self.conda_env,
+            screen_session_name=self.screen_session_name,
+            project_name=self.project_name,
+            python_file=self.python_file,
+            python_version=self.python_version,
+            cuda_root=self.cuda_root,
+            cuda_version=self.cuda_version,
+            cuda_visible_devices=self.cuda_visible_devices,
+            nvidia_driver_version=self.nvidia_driver_version,
+            environ=tuple((self.process_environ or {}).items()),
+            memory_stats=self.memory_timeline.stats(),
+        )
+
+    def update_gpu_process_info(self, proc_info: Optional[ProcInfo] = None):
+        """
+        :param proc_info: 本周期批量读取的 `/proc` 信息，None时回退到 `GpuProcess`
+        """
+        self.proc_info = proc_info
         self.get_task_main_memory_mb()
         self.get_task_gpu_memory_human()
         self.get_task_gpu_memory()
         self.get_running_time_human()
         self.get_running_time_in_seconds()
+        self.update_memory_timeline()
+
+    def update_memory_timeline(self):
+        if not isinstance(self.task_gpu_memory, int) or isinstance(
+                self.running_time_in_seconds, str
+        ):
+            return
+
+        self.memory_timeline.add(
+            self.running_time_in_seconds,
+            self.task_gpu_memory / 1024 / 1024,
+            self.task_main_memory_mb,
+        )
 
     @property
     def gpu(self):
@@ -132,39 +249,64 @@ class GPUProcessInfo:
     def gpu(self, value):
         self._gpu = value
 
+    def read_proc_field(self, field: str, fallback: Callable):
+        """优先使用批量读取的 `/proc` 信息，无法读取时调用 `GpuProcess` 的对应方法"""
+        if self.proc_info is not None:
+            value = getattr(self.proc_info, field)
+            if value is not None:
+                return value
+        return fallback()
+
+    def get_process_name(self):
+        try:
+            self.process_name = self.read_proc_field("name", self.gpu_process.name)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+
     def get_cwd(self):
         try:
-            self.cwd = self.gpu_process.cwd()
+            self.cwd = self.read_proc_field("cwd", self.gpu_process.cwd)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             # self.state = "death"
             pass
 
     def get_command(self):
         try:
-            self.command = self.gpu_process.command()
+            self.command = self.read_proc_field("command", self.gpu_process.command)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             # self.state = "death"
             pass
 
     def get_cmdline(self):
         try:
-            self.cmdline = self.gpu_process.cmdline()
+            self.cmdline = self.read_proc_field("cmdline", self.gpu_process.cmdline)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             # self.state = "death"
             pass
 
     def get_process_environ(self):
+        """只保留 `TASK_ENVIRON_KEY_LIST` 中的环境变量，随任务记录一同发布"""
+        if proc_reader.enable:
+            process_environ = read_proc_environ(self.pid, TASK_ENVIRON_KEY_LIST)
+            if process_environ is not None:
+                self.process_environ = process_environ
+                return
+
+        # 不在 `/proc` 中(如模拟进程)时回退到 `GpuProcess`
         try:
-            process = psutil.Process(self.pid)
-            self.process_environ = process.environ().copy()
+            environ = self.gpu_process.environ()
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
+            return
+        self.process_environ = {
+            key: environ[key] for key in TASK_ENVIRON_KEY_LIST if key in environ
+        }
 
     def get_task_main_memory_mb(self):
         try:
-            self.task_main_memory_mb = (
-                    self.gpu_process.memory_info().rss // 1024 // 1024
+            rss = self.read_proc_field(
+                "rss", lambda: self.gpu_process.memory_info().rss
             )
+            self.task_main_memory_mb = rss // 1024 // 1024
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             pass
 
@@ -197,7 +339,7 @@ class GPUProcessInfo:
 
     def judge_is_python(self):
         try:
-            gpu_process_name = self.gpu_process.name()
+            gpu_process_name = self.read_proc_field("name", self.gpu_process.name)
         except Exception as e:
             e_str = str(e)
             if "process no longer exists" not in e_str:
@@ -220,7 +362,11 @@ class GPUProcessInfo:
         )
 
     def get_user(self):
-        self.user = USERS.get(self.gpu_process.username(), None)
+        try:
+            username = self.read_proc_field("username", self.gpu_process.username)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            username = ""
+        self.user = USERS.get(username, None)
 
         if self.user is not None:
             return
@@ -252,7 +398,7 @@ class GPUProcessInfo:
 
     def get_python_version(self):
         try:
-            binary_path = psutil.Process(self.pid).exe()
+            binary_path = self.read_proc_field("exe", self.gpu_process.exe)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             # self.state = "death"
             binary_path = ""
@@ -269,8 +415,9 @@ class GPUProcessInfo:
         if "python" not in binary_path:
             self.python_version = ""
 
-        command = f"'{binary_path}' --version"
-        python_version = self.get_python_version_by_command(command)
+        python_version = executable_cache.get_or_probe(
+            "python", binary_path, self.probe_python_version_by_path
+        )
 
         self.python_version = python_version
         return python_version
@@ -310,23 +457,9 @@ class GPUProcessInfo:
         if self.cuda_nvcc_bin.strip() == "" or (not os.path.exists(self.cuda_nvcc_bin)):
             return
 
-        try:
-            cmd = f"{self.cuda_nvcc_bin} --version"
-            _, result, _ = do_command(cmd)
-
-            if "release" not in result:
-                return
-            result_list = result.split("\n")
-            version: str = ""
-
-            for line in result_list:
-                if "release" in line:
-                    version = line.split(",")[-1].strip()
-                    break
-
-            self.cuda_version = version.strip().lower().replace("v", "")
-        except Exception:
-            return
+        self.cuda_version = executable_cache.get_or_probe(
+            "cuda", self.cuda_nvcc_bin, self.probe_cuda_version_by_nvcc
+        )
 
     def get_screen_session_name(self):
         self.screen_session_name = self.get_env_value("STY", "").strip()
@@ -362,22 +495,9 @@ class GPUProcessInfo:
             self.python_file = file_name.strip()
 
     def get_nvidia_gpu_version(self) -> str:
-        try:
-            with open("/proc/driver/nvidia/version", "r") as f:
-                nvidia_driver_version = f.read()
-        except Exception:
-            return ""
-
-        version_pattern = re.compile(r"Kernel Module {2}(\d+\.\d+\.\d+)")
-        match = version_pattern.search(nvidia_driver_version)
-
-        if match:
-            version = match.group(1).strip()
-            self.nvidia_driver_version = version
-
-            return version
-        else:
-            return ""
+        version = device_metadata_cache.get_driver_version(self.gpu_id)
+        self.nvidia_driver_version = version
+        return version
 
     @property
     def running_time_in_seconds(self):
@@ -423,41 +543,44 @@ class GPUProcessInfo:
         self._state = new_state
 
     def _handle_state_change(self, new_state):
+        # 每次状态变化只构建一次任务记录，供各个消费者共享
+        record = self.to_task_record()
         if new_state == TaskState.NEWBORN and self._state is TaskState.DEFAULT:
-            self._transition_to_newborn()
+            self._transition_to_newborn(record)
         elif new_state == TaskState.WORKING and self._state == TaskState.NEWBORN:
-            self._transition_newborn_to_working()
+            self._transition_newborn_to_working(record)
         elif new_state == TaskState.DEATH and self._state == TaskState.WORKING:
-            self._transition_working_to_death()
+            self._transition_working_to_death(record)
         elif new_state == TaskState.DEATH and self._state == TaskState.NEWBORN:
-            self._transition_newborn_to_death()
+            self._transition_newborn_to_death(record)
 
-    def _transition_to_newborn(self):
-        log_task_info(self.__dict__, TaskEvent.CREATE)
+    def _transition_to_newborn(self, record: TaskRecord):
+        log_task_info(record, TaskEvent.CREATE)
 
-    def _transition_newborn_to_working(self):
-        sql.update_task_data(TaskInfoForSQL(self.__dict__, TaskState.WORKING))
+    def _transition_newborn_to_working(self, record: TaskRecord):
+        sql.update_task_data(TaskInfoForSQL(record, TaskState.WORKING))
 
-        group_center_message.gpu_task_message(self, TaskEvent.CREATE)
-        self._send_gpu_task_message(TaskEvent.CREATE)
+        group_center_message.gpu_task_message(record, self.gpu, TaskEvent.CREATE)
+        self._send_gpu_task_message(record, TaskEvent.CREATE)
 
-    def _transition_working_to_death(self):
-        log_task_info(self.__dict__, TaskEvent.FINISH)
-        sql.update_finish_task_data(TaskInfoForSQL(self.__dict__, TaskState.DEATH))
+    def _transition_working_to_death(self, record: TaskRecord):
+        log_task_info(record, TaskEvent.FINISH)
+        sql.update_finish_task_data(TaskInfoForSQL(record, TaskState.DEATH))
 
-        group_center_message.gpu_task_message(self, TaskEvent.FINISH)
-        self._send_gpu_task_message(TaskEvent.FINISH)
+        group_center_message.gpu_task_message(record, self.gpu, TaskEvent.FINISH)
+        self._send_gpu_task_message(record, TaskEvent.FINISH)
 
-    def _transition_newborn_to_death(self):
-        log_task_info(self.__dict__, TaskEvent.FINISH)
-        sql.update_finish_task_data(TaskInfoForSQL(self.__dict__, TaskState.DEATH))
+    def _transition_newborn_to_death(self, record: TaskRecord):
+        log_task_info(record, TaskEvent.FINISH)
+        sql.update_finish_task_data(TaskInfoForSQL(record, TaskState.DEATH))
 
-    def _send_gpu_task_message(self, task_event: TaskEvent):
+    def _send_gpu_task_message(self, record: TaskRecord, task_event: TaskEvent):
         """
         发送GPU任务消息函数
+        :param record: 任务记录
         :param task_event: 任务状态
         """
-        task = TaskInfoForWebHook(self.__dict__, task_event)
+        task = TaskInfoForWebHook(record, task_event)
         if task.is_debug:
             return
 
@@ -481,6 +604,39 @@ class GPUProcessInfo:
             enable_webhook_name=AllWebhookName.ALL,
         )
 
+    def probe_python_version_by_path(self, binary_path: str) -> str:
+        python_version = detect_python_version(binary_path, self.pid)
+        if python_version or not VERSION_DETECT_SUBPROCESS_FALLBACK:
+            return python_version
+
+        command = f"'{binary_path}' --version"
+        return self.get_python_version_by_command(command)
+
+    @staticmethod
+    def probe_cuda_version_by_nvcc(nvcc_bin: str) -> str:
+        # <cuda_root>/bin/nvcc
+        cuda_version = detect_cuda_version(os.path.dirname(os.path.dirname(nvcc_bin)))
+        if cuda_version or not VERSION_DETECT_SUBPROCESS_FALLBACK:
+            return cuda_version
+
+        try:
+            cmd = f"{nvcc_bin} --version"
+            _, result, _ = do_command(cmd)
+
+            if "release" not in result:
+                return ""
+            result_list = result.split("\n")
+            version: str = ""
+
+            for line in result_list:
+                if "release" in line:
+                    version = line.split(",")[-1].strip()
+                    break
+
+            return version.strip().lower().replace("v", "")
+        except Exception:
+            return ""
+
     @staticmethod
     def get_python_version_by_command(command) -> str:
         try:
@@ -496,10 +652,10 @@ class GPUProcessInfo:
             return ""
 
 
-def log_task_info(process_info: dict, task_event: TaskEvent):
+def log_task_info(record: TaskRecord, task_event: TaskEvent):
     """
     任务日志函数
-    :param process_info: 进程信息字典
+    :param record: 任务记录
     :task_event: 任务类型, `create` or `finish`
     """
     if task_event is None:
@@ -509,7 +665,7 @@ def log_task_info(process_info: dict, task_event: TaskEvent):
     if not os.path.exists(logfile_dir_path):
         os.makedirs(logfile_dir_path)
 
-    task = TaskInfoForWebHook(process_info, task_event)
+    task = TaskInfoForWebHook(record, task_event)
 
     with open(logfile_dir_path / "user_task.log", "a") as log_writer:
         if task_event == TaskEvent.CREATE:
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import time
+from dataclasses import dataclass
+
+from nvitop import Device
+from nvitop.api.utils import NA, NaType, bytes2human
+
+from feature.monitor.utils import Converter
+
+
+@dataclass(frozen=True)
+class GpuSnapshot:
+    """
+    一次采样周期内某张GPU的全部设备指标。
+
+    由监控线程每个周期采集一次，之后只读地共享给API、Webhook消息与Group Center，
+    保证同一条消息中的数值彼此一致。
+    """
+
+    gpu_id: int
+    timestamp: float = 0.0
+
+    gpu_utilization: int | NaType = NA
+    memory_utilization: int | NaType = NA
+
+    memory_total: int | NaType = NA  # bytes
+    memory_used: int | NaType = NA  # bytes
+    memory_free: int | NaType = NA  # bytes
+    memory_percent: float | NaType = NA
+
+    power_usage: int | NaType = NA  # W
+    temperature: int | NaType = NA  # °C
+
+    @classmethod
+    def collect(cls, gpu_id: int, device: Device) -> "GpuSnapshot":
+        """在一次 `oneshot` 中读取设备指标，每类NVML查询只执行一次。"""
+        with device.oneshot():
+            memory_total, memory_free, memory_used, _ = device.memory_info()
+            power_usage = device.power_usage()  # mW
+
+            return cls(
+                gpu_id=gpu_id,
+                timestamp=time.time(),
+                gpu_utilization=device.gpu_utilization(),
+                memory_utilization=device.memory_utilization(),
+                memory_total=memory_total,
+                memory_used=memory_used,
+                memory_free=memory_free,
+                memory_percent=device.memory_percent(),
+                power_usage=(
+                    NA
+                    if isinstance(power_usage, NaType)
+                    else int(round(power_usage / 1000, 0))
+                ),
+                temperature=device.temperature(),
+            )
+
+    @property
+    def memory_total_human(self) -> str:
+        return bytes2human(self.memory_total)
+
+    @property
+    def memory_used_human(self) -> str:
+        return bytes2human(self.memory_used)
+
+    @property
+    def memory_free_human(self) -> str:
+        return bytes2human(self.memory_free)
+
+    @property
+    def memory_total_mb(self) -> int | NaType:
+        if isinstance(self.memory_total, NaType):
+            return NA
+        return Converter.convert_bytes_to_mb(self.memory_total)
+
+    def to_usage_dict(self) -> dict:
+        """`global_gpu_usage` 中单张GPU的字段"""
+        return {
+            "coreUsage": self.gpu_utilization,
+            "memoryUsage": self.memory_percent,
+            "gpuMemoryTotalMB": self.memory_total_mb,
+            "gpuMemoryUsage": self.memory_used_human,
+            "gpuMemoryTotal": self.memory_total_human,
+            "gpuPowerUsage": self.power_usage,
+            "gpuTemperature": self.temperature,
+        }
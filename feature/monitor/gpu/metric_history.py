@@ -0,0 +1,296 @@
+"""
+GPU指标历史记录。
+
+每张GPU一个 `GpuMetricHistory`，包含若干个分辨率不同的降采样层级(如5秒保留1小时、
+1分钟保留24小时、10分钟保留30天)。每个层级是固定容量的NumPy环形缓冲区，
+落入同一时间桶内的采样取平均值后写入，同时保留桶内的最小值与最大值，
+因此内存占用与运行时长无关，且统计的 min/max 不会被平均值削平。
+"""
+
+import threading
+import warnings
+
+import numpy as np
+from nvitop.api.utils import NaType
+
+from feature.monitor.gpu.gpu_snapshot import GpuSnapshot
+
+METRIC_NAME_LIST: tuple[str, ...] = (
+    "gpu_utilization",  # %
+    "memory_utilization",  # %
+    "memory_percent",  # %
+    "memory_used",  # bytes
+    "power_usage",  # W
+    "temperature",  # °C
+)
+
+STAT_NAME_LIST: tuple[str, ...] = ("min", "max", "mean", "p50", "p95", "p99")
+
+# (分辨率秒数, 保留秒数)
+DEFAULT_TIER_LIST: list[tuple[int, int]] = [
+    (5, 60 * 60),
+    (60, 24 * 60 * 60),
+    (10 * 60, 30 * 24 * 60 * 60),
+]
+
+
+def parse_tier_list(tiers_str: str) -> list[tuple[int, int]]:
+    """
+    解析层级配置，格式为 `分辨率:保留时长`，单位为秒，逗号分隔。
+    如 `5:3600,60:86400,600:2592000`，无效时使用默认层级。
+    """
+    tier_list = []
+    for tier_str in tiers_str.split(","):
+        resolution_str, _, retention_str = tier_str.strip().partition(":")
+        if not resolution_str.strip().isdigit() or not retention_str.strip().isdigit():
+            continue
+        resolution, retention = int(resolution_str), int(retention_str)
+        if resolution <= 0 or retention < resolution:
+            continue
+        tier_list.append((resolution, retention))
+
+    if len(tier_list) == 0:
+        return list(DEFAULT_TIER_LIST)
+    return sorted(tier_list)
+
+
+def snapshot_to_array(snapshot: GpuSnapshot) -> np.ndarray:
+    return np.array(
+        [
+            np.nan if isinstance(value, NaType) else float(value)
+            for value in (getattr(snapshot, name) for name in METRIC_NAME_LIST)
+        ],
+        dtype=np.float64,
+    )
+
+
+class MetricRingBuffer:
+    """单个降采样层级：固定容量的环形缓冲区"""
+
+    def __init__(self, resolution: int, retention: int) -> None:
+        self.resolution: int = resolution
+        self.retention: int = retention
+        self.capacity: int = max(1, retention // resolution)
+
+        self.timestamps = np.zeros(self.capacity, dtype=np.float64)
+        # 每个时间桶的平均值、最小值、最大值
+        self.values = np.full(
+            (self.capacity, len(METRIC_NAME_LIST)), np.nan, dtype=np.float32
+        )
+        self.values_min = np.full_like(self.values, np.nan)
+        self.values_max = np.full_like(self.values, np.nan)
+        self.head: int = 0  # 下一个写入位置
+        self.size: int = 0
+
+        # 当前未写入的时间桶
+        self._bucket: int = -1
+        self._bucket_sum = np.zeros(len(METRIC_NAME_LIST), dtype=np.float64)
+        self._bucket_count = np.zeros(len(METRIC_NAME_LIST), dtype=np.int64)
+        self._bucket_min = np.full(len(METRIC_NAME_LIST), np.inf, dtype=np.float64)
+        self._bucket_max = np.full(len(METRIC_NAME_LIST), -np.inf, dtype=np.float64)
+
+    def add(self, timestamp: float, value: np.ndarray) -> None:
+        bucket = int(timestamp // self.resolution)
+        if bucket < self._bucket:
+            # 系统时钟回拨，丢弃该采样以保证时间戳有序
+            return
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+
+        valid = ~np.isnan(value)
+        self._bucket_sum[valid] += value[valid]
+        self._bucket_count[valid] += 1
+        np.fmin(self._bucket_min, value, out=self._bucket_min)
+        np.fmax(self._bucket_max, value, out=self._bucket_max)
+
+    def bucket_mean(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                self._bucket_count > 0,
+                self._bucket_sum / self._bucket_count,
+                np.nan,
+            )
+
+    def bucket_extrema(self) -> tuple[np.ndarray, np.ndarray]:
+        """:return: (最小值, 最大值)，没有采样的指标为NaN"""
+        has_value = self._bucket_count > 0
+        return (
+            np.where(has_value, self._bucket_min, np.nan),
+            np.where(has_value, self._bucket_max, np.nan),
+        )
+
+    def flush(self) -> None:
+        """将当前时间桶的平均值与极值写入缓冲区"""
+        if self._bucket < 0:
+            return
+
+        self.timestamps[self.head] = self._bucket * self.resolution
+        self.values[self.head] = self.bucket_mean()
+        self.values_min[self.head], self.values_max[self.head] = self.bucket_extrema()
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+        self._bucket = -1
+        self._bucket_sum.fill(0)
+        self._bucket_count.fill(0)
+        self._bucket_min.fill(np.inf)
+        self._bucket_max.fill(-np.inf)
+
+    def ordered(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        按时间顺序返回副本，包含尚未写入的当前时间桶
+        :return: (时间戳, 平均值, 最小值, 最大值)
+        """
+        array_list = [self.timestamps, self.values, self.values_min, self.values_max]
+        if self.size < self.capacity:
+            part_list_list = [[array[:self.size]] for array in array_list]
+        else:
+            part_list_list = [
+                [array[self.head:], array[:self.head]] for array in array_list
+            ]
+
+        if self._bucket >= 0:
+            bucket_min, bucket_max = self.bucket_extrema()
+            part_list_list[0].append(
+                np.array([self._bucket * self.resolution], dtype=np.float64)
+            )
+            for part_list, bucket_value in zip(
+                    part_list_list[1:], (self.bucket_mean(), bucket_min, bucket_max)
+            ):
+                part_list.append(bucket_value.astype(np.float32)[np.newaxis, :])
+
+        timestamps, values, values_min, values_max = (
+            np.concatenate(part_list) for part_list in part_list_list
+        )
+        return timestamps, values, values_min, values_max
+
+    def window(
+            self, start: float, end: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """:return: 同 `ordered`，只保留 [start, end] 范围内的时间桶"""
+        timestamps, values, values_min, values_max = self.ordered()
+        left = np.searchsorted(timestamps, start, side="left")
+        right = np.searchsorted(timestamps, end, side="right")
+        return (
+            timestamps[left:right],
+            values[left:right],
+            values_min[left:right],
+            values_max[left:right],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return (
+                self.timestamps.nbytes
+                + self.values.nbytes
+                + self.values_min.nbytes
+                + self.values_max.nbytes
+        )
+
+
+class GpuMetricHistory:
+    def __init__(self, gpu_id: int, tier_list: list[tuple[int, int]] = None) -> None:
+        self.gpu_id: int = gpu_id
+        self.tier_list: list[MetricRingBuffer] = [
+            MetricRingBuffer(resolution, retention)
+            for resolution, retention in (tier_list or DEFAULT_TIER_LIST)
+        ]
+        self._lock = threading.Lock()
+
+    def add_snapshot(self, snapshot: GpuSnapshot) -> None:
+        if snapshot.timestamp <= 0:
+            return
+
+        value = snapshot_to_array(snapshot)
+        with self._lock:
+            for tier in self.tier_list:
+                tier.add(snapshot.timestamp, value)
+
+    def select_tier(self, duration: float, resolution: int = 0) -> MetricRingBuffer:
+        """
+        选择层级：指定分辨率时使用不低于该分辨率的最细层级，
+        否则使用能覆盖整个时间范围的最细层级。
+        """
+        for tier in self.tier_list:
+            if resolution > 0:
+                if tier.resolution >= resolution:
+                    return tier
+            elif tier.retention >= duration:
+                return tier
+        return self.tier_list[-1]
+
+    def query(
+            self,
+            start: float,
+            end: float,
+            metric_name_list: list[str] = None,
+            resolution: int = 0,
+    ) -> tuple[
+        int,
+        np.ndarray,
+        dict[str, np.ndarray],
+        dict[str, tuple[np.ndarray, np.ndarray]],
+    ]:
+        """
+        :return: (分辨率秒数, 时间戳数组, {指标名: 各时间桶平均值},
+            {指标名: (各时间桶最小值, 各时间桶最大值)})
+        """
+        metric_name_list = metric_name_list or list(METRIC_NAME_LIST)
+        column_list = [METRIC_NAME_LIST.index(name) for name in metric_name_list]
+
+        with self._lock:
+            tier = self.select_tier(end - start, resolution)
+            timestamps, values, values_min, values_max = tier.window(start, end)
+
+        return (
+            tier.resolution,
+            timestamps,
+            {
+                name: values[:, column]
+                for name, column in zip(metric_name_list, column_list)
+            },
+            {
+                name: (values_min[:, column], values_max[:, column])
+                for name, column in zip(metric_name_list, column_list)
+            },
+        )
+
+    @staticmethod
+    def get_stats(
+            values: np.ndarray,
+            min_values: np.ndarray = None,
+            max_values: np.ndarray = None,
+    ) -> dict[str, float | None]:
+        """
+        窗口内的 min/max/mean/p50/p95/p99，忽略缺失值。
+        min/max 为原始采样的极值，mean 与分位数基于各时间桶的平均值。
+        :param values: 各时间桶的平均值
+        :param min_values: 各时间桶的最小值，默认使用 `values`
+        :param max_values: 各时间桶的最大值，默认使用 `values`
+        """
+        if values.size == 0 or np.isnan(values).all():
+            return {stat_name: None for stat_name in STAT_NAME_LIST}
+
+        min_values = values if min_values is None else min_values
+        max_values = values if max_values is None else max_values
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            p50, p95, p99 = np.nanpercentile(values, [50, 95, 99])
+            stat_list = [
+                np.nanmin(min_values),
+                np.nanmax(max_values),
+                np.nanmean(values),
+                p50,
+                p95,
+                p99,
+            ]
+
+        return {
+            stat_name: round(float(stat), 2)
+            for stat_name, stat in zip(STAT_NAME_LIST, stat_list)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tier.nbytes for tier in self.tier_list)
@@ -2,74 +2,175 @@
 
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from types import MappingProxyType
 
 from config.settings import (
+    DEVICE_BACKEND,
+    GPU_HISTORY_ENABLE,
+    GPU_HISTORY_TIERS,
+    GPU_MONITOR_ADAPTIVE_SAMPLING,
+    GPU_MONITOR_CONCURRENT_UPDATE,
+    GPU_MONITOR_DEVICE_TIMEOUT,
+    GPU_MONITOR_IDLE_UTILIZATION_THRESHOLD,
+    GPU_MONITOR_MAX_WORKERS,
     GPU_MONITOR_SAMPLING_INTERVAL,
+    GPU_MONITOR_SAMPLING_INTERVAL_MAX,
+    GPU_MONITOR_SAMPLING_INTERVAL_MIN,
+    GPU_MONITOR_UTILIZATION_CHANGE_THRESHOLD,
     NUM_GPU,
     WEBHOOK_SEND_LAUNCH_MESSAGE,
 )
-from feature.global_variable.gpu import (
-    global_gpu_info,
-    global_gpu_task,
-    global_gpu_usage,
-    global_variable_gpu_updated
-)
+from feature.global_variable.gpu import GpuState, global_gpu_history, publish_gpu_state
 from feature.group_center import group_center_message
+from feature.monitor.gpu.backend.base import DeviceBackend
 from feature.monitor.gpu.gpu import GPU
+from feature.monitor.gpu.metric_history import GpuMetricHistory, parse_tier_list
+from feature.monitor.gpu.sampling_scheduler import AdaptiveSamplingScheduler
 from feature.monitor.monitor import Monitor
 from feature.monitor.monitor_enum import AllWebhookName, MsgType
 from feature.notify.message_handler import MessageHandler
 from feature.notify.webhook import Webhook
 from feature.sql.sqlite import get_sql
 from feature.utils.logs import get_logger
+from feature.utils.process.proc_reader import proc_reader
 
 logger = get_logger()
 sql = get_sql()
 
 
 class NvidiaMonitor(Monitor):
-    def __init__(self, num_gpu: int):
+    def __init__(self, num_gpu: int, device_backend: DeviceBackend = DEVICE_BACKEND):
         super().__init__("GPU")
         self.num_gpu = num_gpu
+        self.device_backend: DeviceBackend = device_backend
         self.is_multi_gpu_machine: bool = num_gpu > 1
         self.monitor_launch_flag = True
         self.total_num_task = 0
 
         self.gpu_obj_dict: dict[int, GPU] = self.get_gpu_obj()
 
-        from feature.monitor.gpu.gpu_process import GPUProcessInfo
+        self.executor: ThreadPoolExecutor | None = None
+        self.running_future_dict: dict[int, Future] = {}
+        if GPU_MONITOR_CONCURRENT_UPDATE and self.num_gpu > 1:
+            self.executor = ThreadPoolExecutor(
+                max_workers=max(1, min(GPU_MONITOR_MAX_WORKERS, self.num_gpu)),
+                thread_name_prefix="gpu_update",
+            )
 
-        self.all_processes: dict[int, GPUProcessInfo] = {}
+        self.sampling_scheduler: AdaptiveSamplingScheduler | None = None
+        if GPU_MONITOR_ADAPTIVE_SAMPLING:
+            self.sampling_scheduler = AdaptiveSamplingScheduler(
+                base_interval=GPU_MONITOR_SAMPLING_INTERVAL,
+                min_interval=GPU_MONITOR_SAMPLING_INTERVAL_MIN,
+                max_interval=GPU_MONITOR_SAMPLING_INTERVAL_MAX,
+                utilization_change_threshold=GPU_MONITOR_UTILIZATION_CHANGE_THRESHOLD,
+                idle_utilization_threshold=GPU_MONITOR_IDLE_UTILIZATION_THRESHOLD,
+            )
 
     def get_gpu_obj(self) -> dict[int, GPU]:
         gpu_dict = {}
-        for idx in range(NUM_GPU):
-            gpu_dict[idx] = GPU(idx, self.is_multi_gpu_machine)
+        for idx in range(self.num_gpu):
+            gpu_dict[idx] = GPU(
+                idx, self.is_multi_gpu_machine, self.device_backend.get_device(idx)
+            )
 
         return gpu_dict
 
     def gpu_monitor_thread(self):
         while self.monitor_thread_work:
-            self.total_num_task = 0
-            for idx, gpu in self.gpu_obj_dict.items():
-                gpu.update()
-                self.total_num_task += gpu.num_task
-                self.all_processes.update(gpu.processes)
+            tick_start_time = time.monotonic()
 
-                # Get gpu status info for webhook msg
-                if sys.gettrace() or not self.monitor_launch_flag:
-                    continue
-
-                # Send to Group Center
-                group_center_message.gpu_monitor_start(idx)
-                sql.check_finish_task(gpu.processes, idx)
-
-            self.all_processes.clear()
+            self.update_all_gpu()
 
             if self.should_send_monitor_launch_msg:
                 self.send_gpu_monitor_launch_msg()
 
-            time.sleep(GPU_MONITOR_SAMPLING_INTERVAL)
+            # 扣除本周期的耗时，避免采样周期随更新耗时漂移
+            next_tick_time = tick_start_time + self.get_next_sampling_interval()
+            time.sleep(max(0.0, next_tick_time - time.monotonic()))
+
+    def get_next_sampling_interval(self) -> float:
+        if self.sampling_scheduler is None:
+            return GPU_MONITOR_SAMPLING_INTERVAL
+
+        gpu_state_list = [
+            (
+                idx,
+                frozenset(gpu.all_processes or ()),
+                gpu.snapshot.gpu_utilization,
+            )
+            for idx, gpu in self.gpu_obj_dict.items()
+        ]
+        return self.sampling_scheduler.next_interval(gpu_state_list)
+
+    def update_all_gpu(self):
+        # 新周期重新读取 `/proc`，同一周期内各GPU共享读取结果
+        proc_reader.new_tick()
+        if self.executor is None:
+            updated_gpu_id_list = self.update_gpu_sequentially()
+        else:
+            updated_gpu_id_list = self.update_gpu_concurrently()
+
+        # 所有GPU更新完毕后整体发布，超时的GPU沿用上一周期的状态
+        publish_gpu_state(gpu.state for gpu in self.gpu_obj_dict.values())
+
+        self.total_num_task = 0
+        for idx, gpu in self.gpu_obj_dict.items():
+            self.total_num_task += gpu.num_task
+
+            # 超时未完成的GPU仍在工作线程中修改processes，本周期不读取
+            if idx not in updated_gpu_id_list:
+                continue
+
+            # Get gpu status info for webhook msg
+            if sys.gettrace() or not self.monitor_launch_flag:
+                continue
+
+            # Send to Group Center
+            group_center_message.gpu_monitor_start(idx)
+            sql.check_finish_task(gpu.processes, idx)
+
+    def update_gpu_sequentially(self) -> list[int]:
+        for gpu in self.gpu_obj_dict.values():
+            gpu.update()
+
+        return list(self.gpu_obj_dict.keys())
+
+    def update_gpu_concurrently(self) -> list[int]:
+        """
+        在线程池中并行更新所有GPU，等待全部完成(或超时)后再汇总。
+
+        单张GPU超时不会阻塞其他GPU；其上一次更新未结束前不会重复提交。
+        :return: 本周期成功完成更新的GPU编号
+        """
+        future_dict: dict[int, Future] = {}
+        for idx, gpu in self.gpu_obj_dict.items():
+            running_future = self.running_future_dict.get(idx)
+            if running_future is not None and not running_future.done():
+                logger.warning(f"[GPU:{idx}]Last update is still running, skip.")
+                continue
+            future_dict[idx] = self.executor.submit(gpu.update)
+        self.running_future_dict.update(future_dict)
+
+        wait(future_dict.values(), timeout=GPU_MONITOR_DEVICE_TIMEOUT)
+
+        updated_gpu_id_list = []
+        for idx, future in future_dict.items():
+            if not future.done():
+                logger.warning(
+                    f"[GPU:{idx}]Update timeout({GPU_MONITOR_DEVICE_TIMEOUT}s)."
+                )
+                continue
+
+            exception = future.exception()
+            if exception is not None:
+                logger.error(f"[GPU:{idx}]Update error: {exception}")
+                continue
+
+            updated_gpu_id_list.append(idx)
+
+        return updated_gpu_id_list
 
     @property
     def should_send_monitor_launch_msg(self):
@@ -83,7 +184,6 @@ class NvidiaMonitor(Monitor):
         launch_msg_text = []
 
         for gpu in self.gpu_obj_dict.values():
-            gpu.get_all_tasks_msg_body()
             launch_msg_text.append(
                 "\n"
                 + gpu.gpu_tasks_num_msg_header
@@ -98,7 +198,7 @@ class NvidiaMonitor(Monitor):
             )
 
 
-def init_global_gpu_var():
+def init_global_gpu_var(num_gpu: int = NUM_GPU):
     default_gpu_info_dict = {
         "gpuName": "NVIDIA GeForce RTX",
         "gpuTDP": "0W",
@@ -112,11 +212,20 @@ def init_global_gpu_var():
         "gpuTemperature": "0",
     }
 
-    global_gpu_info.extend(default_gpu_info_dict.copy() for _ in range(NUM_GPU))
-    global_gpu_usage.extend(default_gpu_usage_dict.copy() for _ in range(NUM_GPU))
-    global_gpu_task.extend([].copy() for _ in range(NUM_GPU))
-
-    global_variable_gpu_updated()
+    if GPU_HISTORY_ENABLE:
+        tier_list = parse_tier_list(GPU_HISTORY_TIERS)
+        global_gpu_history.extend(
+            GpuMetricHistory(idx, tier_list) for idx in range(num_gpu)
+        )
+
+    publish_gpu_state(
+        GpuState(
+            gpu_id=idx,
+            info=MappingProxyType(default_gpu_info_dict),
+            usage=MappingProxyType(default_gpu_usage_dict),
+        )
+        for idx in range(num_gpu)
+    )
 
 
 def start_gpu_monitor_all():
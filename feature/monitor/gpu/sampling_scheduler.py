@@ -0,0 +1,84 @@
+from nvitop.api.utils import NaType
+
+
+class AdaptiveSamplingScheduler:
+    """
+    GPU监控的自适应采样间隔。
+
+    - 有进程出现/结束，或核心占用变化超过阈值时，立即切换到最短间隔；
+    - 所有GPU都空闲(没有进程且核心占用低于 `idle_utilization_threshold`)且没有变化时，间隔按 `backoff_factor` 逐步延长至最长间隔；
+    - 其余(有任务但稳定运行)情况下逐步恢复到基础间隔。
+    """
+
+    def __init__(
+            self,
+            base_interval: float,
+            min_interval: float,
+            max_interval: float,
+            utilization_change_threshold: int = 10,
+            idle_utilization_threshold: int = 5,
+            backoff_factor: float = 2.0,
+    ) -> None:
+        self.min_interval: float = max(0.1, min_interval)
+        self.max_interval: float = max(self.min_interval, max_interval)
+        self.base_interval: float = min(
+            max(base_interval, self.min_interval), self.max_interval
+        )
+        self.utilization_change_threshold: int = utilization_change_threshold
+        self.idle_utilization_threshold: int = idle_utilization_threshold
+        self.backoff_factor: float = max(1.0, backoff_factor)
+
+        self.interval: float = self.base_interval
+
+        self._last_pid_set_dict: dict[int, frozenset[int]] = {}
+        self._last_utilization_dict: dict[int, int] = {}
+
+    @staticmethod
+    def _get_utilization(utilization: int | NaType) -> int:
+        return utilization if isinstance(utilization, int) else 0
+
+    def observe(
+            self, gpu_id: int, pid_set: frozenset[int], utilization: int | NaType
+    ) -> tuple[bool, bool]:
+        """
+        记录一张GPU本周期的状态。
+        :return: (与上周期相比是否有变化, 是否空闲)
+        """
+        utilization = self._get_utilization(utilization)
+
+        last_pid_set = self._last_pid_set_dict.get(gpu_id)
+        last_utilization = self._last_utilization_dict.get(gpu_id, utilization)
+
+        is_changed = (
+                last_pid_set is not None and pid_set != last_pid_set
+        ) or abs(utilization - last_utilization) >= self.utilization_change_threshold
+        is_idle = len(pid_set) == 0 and utilization < self.idle_utilization_threshold
+
+        self._last_pid_set_dict[gpu_id] = pid_set
+        self._last_utilization_dict[gpu_id] = utilization
+
+        return is_changed, is_idle
+
+    def next_interval(
+            self, gpu_state_list: list[tuple[int, frozenset[int], int | NaType]]
+    ) -> float:
+        """
+        根据所有GPU本周期的状态计算下一次采样间隔。
+        :param gpu_state_list: [(gpu_id, 进程pid集合, 核心占用)]
+        :return: 采样间隔(秒)
+        """
+        any_changed = False
+        all_idle = True
+        for gpu_id, pid_set, utilization in gpu_state_list:
+            is_changed, is_idle = self.observe(gpu_id, pid_set, utilization)
+            any_changed = any_changed or is_changed
+            all_idle = all_idle and is_idle
+
+        if any_changed:
+            self.interval = self.min_interval
+        elif all_idle:
+            self.interval = min(self.interval * self.backoff_factor, self.max_interval)
+        else:
+            self.interval = min(self.interval * self.backoff_factor, self.base_interval)
+
+        return self.interval
@@ -1,41 +1,36 @@
 from typing import Optional
 
+from feature.monitor.gpu.task.task_record import TaskRecord
 from feature.monitor.monitor_enum import TaskState
 
 
 class TaskInfoForSQL:
-    def __init__(self, info: dict, new_state: Optional[TaskState] = None) -> None:
-        self._task_idx: str = info.get("task_id", "Unknown")
-        self._pid: int = info.get("pid", 0)
-        self._gpu_id: int = info.get("gpu_id", 0)
-
-        self._user: str = info.get("user").name_cn
-
-        self._create_timestamp: int = round(info.get("start_time", 0.0))
-        self._finish_timestamp: int = self._get_finish_timestamp(info)
-        self._running_time_in_seconds: int = round(
-            info.get("_running_time_in_seconds", 0.0)
-        )
-        self._gpu_mem_usage_max: str = info.get("task_gpu_memory_max_human", "0MiB")
-
-        self._task_state: str = (
-            new_state
-            if new_state is not None
-            else info.get("_state", TaskState.NEWBORN)
-        )
-
-        self._is_debug: bool = info.get("is_debug", True)
-        self._is_multi_gpu: bool = info.get("is_multi_gpu", False)
-        self._conda_env: str = info.get("conda_env", "Unknown")
-
-        self._screen_session_name: str = info.get("screen_session_name", "None")
-        self._project_name: str = info.get("project_name", "Unknown")
-        self._python_file: str = info.get("python_file", "Unknown")
+    def __init__(self, record: TaskRecord, new_state: Optional[TaskState] = None) -> None:
+        self._task_idx: str = record.task_id
+        self._pid: int = record.pid
+        self._gpu_id: int = record.gpu_id
+
+        self._user: str = record.user.name_cn
+
+        self._create_timestamp: int = round(record.start_time)
+        self._finish_timestamp: int = self._get_finish_timestamp(record)
+        self._running_time_in_seconds: int = round(record.running_time_in_seconds)
+        self._gpu_mem_usage_max: str = record.task_gpu_memory_max_human
+
+        self._task_state: str = new_state if new_state is not None else record.state
+
+        self._is_debug: bool = record.is_debug
+        self._is_multi_gpu: bool = record.is_multi_gpu
+        self._conda_env: str = record.conda_env
+
+        self._screen_session_name: str = record.screen_session_name
+        self._project_name: str = record.project_name
+        self._python_file: str = record.python_file
 
     @staticmethod
-    def _get_finish_timestamp(info: dict) -> int:
+    def _get_finish_timestamp(record: TaskRecord) -> int:
         try:
-            return round(info.get("finish_time", 0.0))
+            return round(record.finish_time)
         except (TypeError, ValueError):
             return 0
 
@@ -1,35 +1,39 @@
+import datetime
 from typing import Optional, Union
 
+from nvitop.api.utils import bytes2human, timedelta2human
+
 from config.settings import NUM_GPU
 from config.user_info import UserInfo
+from feature.monitor.gpu.task.memory_timeline import TaskMemoryStats
+from feature.monitor.gpu.task.task_record import TaskRecord
 from feature.monitor.monitor_enum import TaskEvent
 
 
 class TaskInfoForWebHook:
-    def __init__(self, info: dict, task_event: TaskEvent) -> None:
+    def __init__(self, record: TaskRecord, task_event: TaskEvent) -> None:
         self._task_event: TaskEvent = task_event
-        self._pid: int = info.get("pid", 0)
-        self._gpu_id: int = info.get("gpu_id", 0)
+        self._pid: int = record.pid
+        self._gpu_id: int = record.gpu_id
         self._gpu_name: str = f"[GPU:{self._gpu_id}]" if NUM_GPU > 1 else "GPU"
-        self._gpu_status_msg: str = info.get("gpu_status_msg", "")
 
-        self._user: UserInfo = info.get("user")
+        self._user: UserInfo = record.user
 
-        self._running_time_human: Optional[str] = info.get("running_time_human")
-        self._task_gpu_memory_max_human: str = info.get(
-            "task_gpu_memory_max_human", "0MiB"
-        )
+        self._running_time_human: Optional[str] = record.running_time_human
+        self._task_gpu_memory_max_human: str = record.task_gpu_memory_max_human
 
-        self._is_debug: bool = info.get("is_debug", True)
-        self._is_multi_gpu: bool = info.get("is_multi_gpu", False)
-        self._world_size: int = info.get("world_size", 1)
-        self._local_rank: int = info.get("local_rank", 0)
+        self._is_debug: bool = record.is_debug
+        self._is_multi_gpu: bool = record.is_multi_gpu
+        self._world_size: int = record.world_size
+        self._local_rank: int = record.local_rank
 
-        self._screen_name: str = info.get("screen_session_name", "")
-        self._project_name: str = info.get("project_name", "Unknown")
-        self._python_file: str = info.get("python_file", "Unknown")
+        self._screen_name: str = record.screen_session_name
+        self._project_name: str = record.project_name
+        self._python_file: str = record.python_file
 
-        self._num_task: int = info.get("num_task", 0)
+        self._num_task: int = record.num_task
+
+        self._memory_stats: Optional[TaskMemoryStats] = record.memory_stats
 
     @property
     def pid(self) -> int:
@@ -112,6 +116,30 @@ class TaskInfoForWebHook:
     def python_file(self) -> str:
         return self._python_file
 
+    @property
+    def memory_stats(self) -> Optional[TaskMemoryStats]:
+        return self._memory_stats
+
+    @property
+    def memory_stats_msg(self) -> str:
+        stats = self.memory_stats
+        if stats is None or stats.sample_count == 0:
+            return ""
+
+        def mib2human(mib: float) -> str:
+            return bytes2human(int(mib * 1024 * 1024))
+
+        peak_at = timedelta2human(
+            datetime.timedelta(seconds=stats.gpu_memory_peak_at_seconds)
+        )
+        return (
+            f"📈显存P50/P95: {mib2human(stats.gpu_memory_p50)}/"
+            f"{mib2human(stats.gpu_memory_p95)}，"
+            f"峰值出现于{peak_at}，"
+            f"增长{stats.gpu_memory_growth_per_hour:+.0f}MiB/h"
+            "\n"
+        )
+
     @property
     def task_msg_body(self) -> str:
         if self.task_event == TaskEvent.CREATE:
@@ -137,6 +165,7 @@ class TaskInfoForWebHook:
             f"用时{self.running_time_human}，"
             f"最大显存{self.task_gpu_memory_max_human}"
             "\n"
+            f"{self.memory_stats_msg}"
         )
 
     @staticmethod
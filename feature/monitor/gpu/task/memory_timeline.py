@@ -0,0 +1,186 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+# 列: 运行时长(秒), GPU显存(MiB), 内存RSS(MiB)
+COLUMN_RUNNING_TIME = 0
+COLUMN_GPU_MEMORY = 1
+COLUMN_HOST_MEMORY = 2
+
+
+@dataclass(frozen=True)
+class TaskMemoryStats:
+    """任务显存/内存统计，单位均为MiB，增长率为MiB/h"""
+
+    sample_count: int = 0
+
+    gpu_memory_p50: float = 0.0
+    gpu_memory_p95: float = 0.0
+    gpu_memory_peak: float = 0.0
+    gpu_memory_growth_per_hour: float = 0.0
+    # 首次达到峰值时已运行的秒数
+    gpu_memory_peak_at_seconds: int = 0
+
+    host_memory_p50: float = 0.0
+    host_memory_p95: float = 0.0
+    host_memory_peak: float = 0.0
+    host_memory_growth_per_hour: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "memorySampleCount": self.sample_count,
+            "gpuMemoryP50": self.gpu_memory_p50,
+            "gpuMemoryP95": self.gpu_memory_p95,
+            "gpuMemoryPeak": self.gpu_memory_peak,
+            "gpuMemoryGrowthPerHour": self.gpu_memory_growth_per_hour,
+            "gpuMemoryPeakAtSeconds": self.gpu_memory_peak_at_seconds,
+            "mainMemoryP50": self.host_memory_p50,
+            "mainMemoryP95": self.host_memory_p95,
+            "mainMemoryPeak": self.host_memory_peak,
+            "mainMemoryGrowthPerHour": self.host_memory_growth_per_hour,
+        }
+
+
+class TaskMemoryTimeline:
+    """
+    单个任务的显存与内存时间序列。
+
+    容量固定，写满后丢弃一半(隔一个保留一个)并将采样步长加倍，
+    因此任意运行时长下采样点在时间上保持大致均匀，内存占用不变。
+    峰值不受抽稀影响，单独精确记录。
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        # 容量取偶数，抽稀后恰好剩下一半
+        self.max_size: int = max(4, max_size // 2 * 2)
+        self.data = np.zeros((self.max_size, 3), dtype=np.float64)
+        self.size: int = 0
+
+        # 每 `stride` 个采样保留一个
+        self.stride: int = 1
+        self._pending: int = 0
+
+        self.gpu_memory_peak: float = 0.0
+        self.gpu_memory_peak_running_time: float = 0.0
+        self.host_memory_peak: float = 0.0
+
+        # 数据变化时加一，统计信息按版本缓存
+        self.version: int = 0
+        self._stats_cache: tuple[int, TaskMemoryStats] | None = None
+
+        self._lock = threading.Lock()
+
+    def add(
+            self, running_time: float, gpu_memory_mib: float, host_memory_mib: float
+    ) -> None:
+        """
+        :param running_time: 任务已运行的秒数
+        """
+        with self._lock:
+            if gpu_memory_mib > self.gpu_memory_peak:
+                self.gpu_memory_peak = gpu_memory_mib
+                self.gpu_memory_peak_running_time = running_time
+                self.version += 1
+            if host_memory_mib > self.host_memory_peak:
+                self.host_memory_peak = host_memory_mib
+                self.version += 1
+
+            self._pending += 1
+            if self._pending < self.stride:
+                return
+            self._pending = 0
+
+            if self.size == self.max_size:
+                half_size = self.max_size // 2
+                self.data[:half_size] = self.data[::2]
+                self.size = half_size
+                self.stride *= 2
+
+            self.data[self.size] = (running_time, gpu_memory_mib, host_memory_mib)
+            self.size += 1
+            self.version += 1
+
+    @staticmethod
+    def get_growth_per_hour(running_times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        最小二乘拟合的斜率，用于发现显存/内存泄漏
+        :param values: 每列一个序列
+        :return: 每列的斜率(每小时)
+        """
+        if running_times.size < 2 or running_times[-1] <= running_times[0]:
+            return np.zeros(values.shape[1])
+        # 一元线性回归的闭式解，比 `np.polyfit` 快
+        x = running_times - running_times.mean()
+        return (x @ (values - values.mean(axis=0))) / (x @ x) * 3600
+
+    @staticmethod
+    def get_percentiles(
+            values: np.ndarray, quantile_list: tuple[float, ...]
+    ) -> list[np.ndarray]:
+        """
+        与 `np.percentile` 的默认(线性插值)结果相同，只排序一次，样本较少时快得多
+        :param values: 每列一个序列
+        :return: 每个分位数对应一行
+        """
+        sorted_values = np.sort(values, axis=0)
+        last_index = sorted_values.shape[0] - 1
+        result = []
+        for quantile in quantile_list:
+            position = last_index * quantile
+            low = int(position)
+            high = min(low + 1, last_index)
+            result.append(
+                sorted_values[low]
+                + (sorted_values[high] - sorted_values[low]) * (position - low)
+            )
+        return result
+
+    def stats(self) -> TaskMemoryStats:
+        with self._lock:
+            stats_cache = self._stats_cache
+            if stats_cache is not None and stats_cache[0] == self.version:
+                return stats_cache[1]
+
+            version = self.version
+            data = self.data[:self.size].copy()
+            gpu_memory_peak = self.gpu_memory_peak
+            gpu_memory_peak_running_time = self.gpu_memory_peak_running_time
+            host_memory_peak = self.host_memory_peak
+
+        stats = self.compute_stats(
+            data, gpu_memory_peak, gpu_memory_peak_running_time, host_memory_peak
+        )
+        with self._lock:
+            self._stats_cache = (version, stats)
+        return stats
+
+    def compute_stats(
+            self,
+            data: np.ndarray,
+            gpu_memory_peak: float,
+            gpu_memory_peak_running_time: float,
+            host_memory_peak: float,
+    ) -> TaskMemoryStats:
+        if data.shape[0] == 0:
+            return TaskMemoryStats()
+
+        # 两列一起计算，每行为 (GPU显存, 内存)
+        memory_data = data[:, COLUMN_GPU_MEMORY:COLUMN_HOST_MEMORY + 1]
+        p50, p95 = self.get_percentiles(memory_data, (0.5, 0.95))
+        gpu_growth, host_growth = self.get_growth_per_hour(
+            data[:, COLUMN_RUNNING_TIME], memory_data
+        )
+
+        return TaskMemoryStats(
+            sample_count=int(data.shape[0]),
+            gpu_memory_p50=round(float(p50[0]), 2),
+            gpu_memory_p95=round(float(p95[0]), 2),
+            gpu_memory_peak=round(gpu_memory_peak, 2),
+            gpu_memory_growth_per_hour=round(float(gpu_growth), 2),
+            gpu_memory_peak_at_seconds=int(gpu_memory_peak_running_time),
+            host_memory_p50=round(float(p50[1]), 2),
+            host_memory_p95=round(float(p95[1]), 2),
+            host_memory_peak=round(host_memory_peak, 2),
+            host_memory_growth_per_hour=round(float(host_growth), 2),
+        )
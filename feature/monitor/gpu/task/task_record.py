@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from config.user_info import UserInfo
+from feature.monitor.gpu.task.memory_timeline import TaskMemoryStats
+from feature.monitor.monitor_enum import TaskState
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRecord:
+    """
+    任务在某次状态变化时的只读记录。
+
+    每次状态变化只构建一次，由数据库、WebHook、日志与Group Center共享；
+    只保留这些消费者需要的字段，不包含完整的进程环境变量、命令行列表等大对象；
+    环境变量只保留 `TASK_ENVIRON_KEYS` 白名单中的少量条目。
+    """
+
+    task_id: str
+    pid: int
+    gpu_id: int
+    state: TaskState
+
+    user: Optional[UserInfo] = None
+    num_task: int = 0
+
+    start_time: float = 0.0
+    finish_time: float = 0.0
+    running_time_in_seconds: int = 0
+    running_time_human: str = ""
+
+    task_main_memory_mb: int = 0
+    task_gpu_memory: int = 0
+    task_gpu_memory_human: str = ""
+    task_gpu_memory_max: int = 0
+    task_gpu_memory_max_human: str = ""
+
+    is_debug: Optional[bool] = None
+    is_multi_gpu: bool = False
+    world_size: int = 0
+    local_rank: int = 0
+
+    cwd: str = ""
+    command: str = ""
+    conda_env: str = ""
+    screen_session_name: str = ""
+    project_name: str = ""
+    python_file: str = ""
+    python_version: str = ""
+    cuda_root: str = ""
+    cuda_version: str = ""
+    cuda_visible_devices: str = ""
+    nvidia_driver_version: str = ""
+    # `TASK_ENVIRON_KEYS` 中进程已设置的环境变量，(key, value)
+    environ: tuple[tuple[str, str], ...] = ()
+
+    memory_stats: Optional[TaskMemoryStats] = None
@@ -19,7 +19,7 @@ from feature.notify.message_handler import MessageHandler
 from feature.utils.logs import get_logger
 from feature.utils.common_utils import do_command
 from feature.utils.system.linux_system import check_is_root, check_is_linux
-from feature.global_variable.disk_status import disk_info_response_dict
+from feature.global_variable.disk_status import publish_disk_info
 
 logger = get_logger()
 
@@ -90,8 +90,8 @@ class HardDiskMonitor(Monitor):
             }
 
             new_dict[mount_point] = current_dict
-        disk_info_response_dict.clear()
-        disk_info_response_dict.update(new_dict)
+
+        publish_disk_info(new_dict)
 
     def hard_disk_monitor_thread(self):
         """
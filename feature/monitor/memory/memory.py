@@ -1,6 +1,9 @@
 import psutil
 
-from feature.global_variable.system import global_system_info
+from feature.global_variable.system import (
+    global_system_info,
+    global_variable_system_updated,
+)
 from feature.monitor.utils import Converter
 
 
@@ -16,6 +19,7 @@ class MemoryInfo:
                 "memorySwapTotalMb": Converter.convert_bytes_to_mb(memory_swap.total),
             }
         )
+        global_variable_system_updated()
 
     @staticmethod
     def update():
@@ -29,6 +33,7 @@ class MemoryInfo:
                 # "memorySwapFreeMb": Converter.convert_bytes_to_mb(memory_swap.free),
             }
         )
+        global_variable_system_updated()
 
 
 class Memory:
@@ -1,5 +1,7 @@
+import functools
 import os
 import sqlite3
+import threading
 
 from config.settings import NUM_GPU, SERVER_NAME
 from feature.monitor.gpu.task.for_sql import TaskInfoForSQL
@@ -9,9 +11,21 @@ from feature.utils.logs import get_logger
 logger = get_logger()
 
 
+def synchronized(func):
+    """GPU并行更新时多个线程共享同一连接与游标，需要串行访问"""
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 class SQLite:
     def __init__(self, db_file_path: str = "task_info.db") -> None:
         self.table_name_header = "gpu_"
+        self.lock = threading.RLock()
         self.connect(db_file_path)
 
     def connect(self, db_file_path):
@@ -22,6 +36,7 @@ class SQLite:
         except sqlite3.Error as e:
             logger.error(f"连接数据库失败: {e}")
 
+    @synchronized
     def create_table(self, gpu_id: int):
         table_name = self.table_name_header + str(gpu_id)
         try:
@@ -48,6 +63,7 @@ class SQLite:
             """
             self.cur.execute(sql_text.format(table_name))
 
+    @synchronized
     def insert_task_data(self, task_info: TaskInfoForSQL):
         table_name = self.table_name_header + str(task_info.gpu_id)
         self.cur.execute(
@@ -97,6 +113,7 @@ class SQLite:
         )
         self.conn.commit()
 
+    @synchronized
     def update_task_data(self, task_info: TaskInfoForSQL):
         update_sql_text = (
             "UPDATE {} "
@@ -116,6 +133,7 @@ class SQLite:
         )
         self.conn.commit()
 
+    @synchronized
     def update_finish_task_data(self, task_info: TaskInfoForSQL):
         update_sql_text = (
             "UPDATE {} "
@@ -137,6 +155,7 @@ class SQLite:
         )
         self.conn.commit()
 
+    @synchronized
     def get_running_task_data(self, gpu_id):
         try:
             self.cur.execute(
@@ -148,6 +167,7 @@ class SQLite:
             logger.error(e)
             raise
 
+    @synchronized
     def check_finish_task(self, all_task_info: dict, gpu_id: int):
         unfinished_task_datas = self.get_running_task_data(gpu_id)
         running_task_pids = all_task_info.keys()
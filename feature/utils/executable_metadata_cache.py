@@ -0,0 +1,200 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from feature.utils.logs import get_logger
+
+logger = get_logger()
+
+# (探测类型, 真实路径, inode, mtime_ns)
+CacheKey = Tuple[str, str, int, int]
+
+
+class ExecutableMetadataCache:
+    """
+    可执行文件元数据(如Python、CUDA版本)的进程级缓存。
+
+    以 (真实路径, inode, mtime) 标识可执行文件，文件被替换或修改后自动失效；
+    同一文件只探测一次，并发探测同一文件时只有一个线程真正执行探测。
+    探测失败(空结果)只在短时间内缓存且不写入文件，之后会重新探测。
+    """
+
+    def __init__(
+            self,
+            max_size: int = 256,
+            persist_file_path: str = "",
+            failed_ttl_seconds: float = 60,
+            save_delay_seconds: float = 10,
+    ) -> None:
+        """
+        :param failed_ttl_seconds: 探测失败的结果缓存多久，避免短时间内反复探测
+        :param save_delay_seconds: 缓存变化后延迟写入文件，期间的变化合并为一次写入
+        """
+        self.max_size: int = max(1, max_size)
+        self.persist_file_path: str = persist_file_path.strip()
+        self.failed_ttl_seconds: float = failed_ttl_seconds
+        self.save_delay_seconds: float = save_delay_seconds
+
+        self._cache: OrderedDict[CacheKey, str] = OrderedDict()
+        # 探测失败的键 -> 过期时间(monotonic)
+        self._failed: dict[CacheKey, float] = {}
+        self._inflight: dict[CacheKey, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self._dirty: bool = False
+        self._save_timer: Optional[threading.Timer] = None
+
+        self.load()
+        if self.persist_file_path:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def get_executable_identity(path: str) -> Optional[Tuple[str, int, int]]:
+        try:
+            real_path = os.path.realpath(path)
+            stat_result = os.stat(real_path)
+        except (OSError, ValueError):
+            return None
+        return real_path, stat_result.st_ino, stat_result.st_mtime_ns
+
+    def get_or_probe(self, kind: str, path: str, probe: Callable[[str], str]) -> str:
+        """
+        获取缓存的探测结果，未命中时调用 `probe(path)` 并缓存。
+        :param kind: 探测类型，如 `python`、`cuda`
+        :param path: 可执行文件路径
+        :param probe: 探测函数
+        :return: 探测结果，文件不存在时为空字符串
+        """
+        identity = self.get_executable_identity(path)
+        if identity is None:
+            return ""
+        key: CacheKey = (kind, *identity)
+
+        while True:
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    return self._cache[key]
+
+                failed_expire_time = self._failed.get(key)
+                if failed_expire_time is not None:
+                    if time.monotonic() < failed_expire_time:
+                        return ""
+                    del self._failed[key]
+
+                event = self._inflight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    break
+
+            # 其他线程正在探测同一文件，等待其完成后读取缓存
+            event.wait()
+
+        value = ""
+        try:
+            value = probe(path)
+        finally:
+            with self._lock:
+                if value:
+                    self._put(key, value)
+                    self._dirty = True
+                else:
+                    # 可能是暂时的超时或权限错误，不长期缓存
+                    self._put_failed(key)
+                del self._inflight[key]
+            event.set()
+
+        if value:
+            self.schedule_save()
+        return value
+
+    def _put(self, key: CacheKey, value: str) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _put_failed(self, key: CacheKey) -> None:
+        now = time.monotonic()
+        if len(self._failed) >= self.max_size:
+            self._failed = {
+                k: expire_time
+                for k, expire_time in self._failed.items()
+                if expire_time > now
+            }
+        self._failed[key] = now + self.failed_ttl_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._failed.clear()
+
+    def load(self) -> None:
+        if not self.persist_file_path or not os.path.exists(self.persist_file_path):
+            return
+
+        try:
+            with open(self.persist_file_path, "r", encoding="utf-8") as f:
+                entry_list = json.load(f)
+        except Exception as e:
+            logger.warning(f"[ExecutableCache]Load {self.persist_file_path} error: {e}")
+            return
+
+        with self._lock:
+            for entry in entry_list:
+                try:
+                    kind, real_path, inode, mtime_ns, value = entry
+                    if not value:
+                        # 旧版本会保存探测失败的结果
+                        continue
+                    self._put((kind, real_path, int(inode), int(mtime_ns)), str(value))
+                except (TypeError, ValueError):
+                    continue
+
+        logger.info(f"[ExecutableCache]Loaded {len(self._cache)} entries.")
+
+    def schedule_save(self) -> None:
+        """延迟写入文件，已有待执行的写入时不重复安排"""
+        if not self.persist_file_path:
+            return
+
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay_seconds, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """立即写入尚未保存的变化"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+
+        self.save()
+
+    def save(self) -> None:
+        if not self.persist_file_path:
+            return
+
+        with self._lock:
+            entry_list = [[*key, value] for key, value in self._cache.items()]
+            self._dirty = False
+
+        try:
+            tmp_file_path = self.persist_file_path + ".tmp"
+            with open(tmp_file_path, "w", encoding="utf-8") as f:
+                json.dump(entry_list, f)
+            os.replace(tmp_file_path, self.persist_file_path)
+        except Exception as e:
+            with self._lock:
+                self._dirty = True
+            logger.warning(f"[ExecutableCache]Save {self.persist_file_path} error: {e}")
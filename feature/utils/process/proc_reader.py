@@ -0,0 +1,290 @@
+"""
+批量读取 `/proc/<pid>` 中的进程信息。
+
+与逐个调用psutil相比，每个进程只打开必要的文件(`status`、`cmdline`)并读取 `exe`、`cwd`
+两个符号链接，`status` 只解析一次。同一周期内的读取结果在所有GPU之间共享。
+
+字段为None表示无法读取(进程已结束、无权限或不在 `/proc` 中，如模拟进程)，
+调用方应回退到 `GpuProcess` 的对应方法。
+
+环境变量由 `read_proc_environ` 按需流式读取，只保留指定的变量。
+"""
+
+import os
+import pwd
+import threading
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from nvitop.api.process import command_join
+
+PROC_PATH = "/proc"
+
+# 进程名在status中最多15个字符
+PROC_NAME_MAX_LENGTH = 15
+
+ENVIRON_READ_CHUNK_SIZE = 8192
+
+
+@dataclass(frozen=True)
+class ProcInfo:
+    pid: int
+
+    # 来自status
+    name: Optional[str] = None
+    uid: Optional[int] = None
+    username: Optional[str] = None
+    rss: Optional[int] = None  # bytes
+
+    # 详细信息，仅在 `detail=True` 时读取
+    is_detailed: bool = False
+    exe: Optional[str] = None
+    cwd: Optional[str] = None
+    cmdline: Optional[list[str]] = None
+
+    @property
+    def command(self) -> Optional[str]:
+        if self.cmdline is None:
+            return None
+        return command_join(self.cmdline)
+
+
+@lru_cache(maxsize=1024)
+def get_username_by_uid(uid: int) -> str:
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+def parse_status(
+        data: bytes,
+) -> tuple[Optional[str], Optional[int], Optional[int]]:
+    """
+    :return: (进程名, 真实uid, RSS字节数)，
+        没有 `VmRSS` 行(如内核线程、僵尸进程)时RSS为None，由调用方回退到psutil
+    """
+    name = None
+    uid = None
+    rss = None
+    for line in data.split(b"\n"):
+        if line.startswith(b"Name:"):
+            name = line[5:].strip().decode("utf-8", "replace")
+        elif line.startswith(b"Uid:"):
+            uid = int(line.split()[1])
+        elif line.startswith(b"VmRSS:"):
+            # VmRSS:    123456 kB
+            rss = int(line.split()[1]) * 1024
+            break  # VmRSS 位于 Name、Uid 之后
+    return name, uid, rss
+
+
+def parse_cmdline(data: bytes) -> list[str]:
+    """与psutil的解析规则一致"""
+    text = data.decode("utf-8", "surrogateescape")
+    if not text:
+        return []
+    sep = "\x00" if text.endswith("\x00") else " "
+    if text.endswith(sep):
+        text = text[:-1]
+    cmdline = text.split(sep)
+    if sep == "\x00" and len(cmdline) == 1 and " " in text:
+        cmdline = text.split(" ")
+    return cmdline
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_link(path: str) -> Optional[str]:
+    try:
+        return os.readlink(path)
+    except OSError:
+        return None
+
+
+def read_proc_info(pid: int, detail: bool = False) -> Optional[ProcInfo]:
+    """
+    读取单个进程的信息。
+    :return: 进程不存在时为None
+    """
+    proc_dir = f"{PROC_PATH}/{pid}"
+    try:
+        name, uid, rss = parse_status(read_file(f"{proc_dir}/status"))
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+    except (OSError, ValueError, IndexError):
+        name, uid, rss = None, None, None
+
+    proc_info = ProcInfo(
+        pid=pid,
+        name=name,
+        uid=uid,
+        username=get_username_by_uid(uid) if uid is not None else None,
+        rss=rss,
+    )
+    if not detail:
+        return proc_info
+
+    return read_proc_detail(proc_info)
+
+
+def read_proc_detail(proc_info: ProcInfo) -> ProcInfo:
+    proc_dir = f"{PROC_PATH}/{proc_info.pid}"
+
+    try:
+        cmdline = parse_cmdline(read_file(f"{proc_dir}/cmdline"))
+    except OSError:
+        cmdline = None
+
+    name = proc_info.name
+    if name is not None and len(name) >= PROC_NAME_MAX_LENGTH and cmdline:
+        # 与psutil一致，进程名被截断时尝试使用cmdline中的完整名称
+        extended_name = os.path.basename(cmdline[0])
+        if extended_name.startswith(name):
+            name = extended_name
+
+    exe = read_link(f"{proc_dir}/exe")
+    if exe is not None and exe.endswith(" (deleted)") and not os.path.exists(exe):
+        exe = exe[: -len(" (deleted)")]
+
+    return replace(
+        proc_info,
+        name=name,
+        is_detailed=True,
+        exe=exe,
+        cwd=read_link(f"{proc_dir}/cwd"),
+        cmdline=cmdline,
+    )
+
+
+def read_proc_environ(
+        pid: int, key_list: Iterable[str], chunk_size: int = ENVIRON_READ_CHUNK_SIZE
+) -> Optional[dict[str, str]]:
+    """
+    分块读取 `/proc/<pid>/environ`，只解析 `key_list` 中的环境变量，
+    全部找到后立即停止读取，不会复制整份环境变量。
+    同名变量出现多次时取第一个，与 `getenv` 一致。
+    :return: {变量名: 值}，无法读取时为None
+    """
+    remaining_key_set = {key.encode("utf-8") for key in key_list}
+    environ: dict[str, str] = {}
+    if len(remaining_key_set) == 0:
+        return environ
+    max_key_length = max(len(key) for key in remaining_key_set)
+
+    def parse_entry(entry: bytes) -> None:
+        key, sep, value = entry.partition(b"=")
+        if sep and key in remaining_key_set:
+            remaining_key_set.discard(key)
+            environ[key.decode("utf-8", "surrogateescape")] = \
+                value.decode("utf-8", "surrogateescape")
+
+    try:
+        with open(f"{PROC_PATH}/{pid}/environ", "rb", buffering=0) as f:
+            # 跨块的不完整变量
+            buffer = b""
+            # 当前变量不需要(如很长的PATH)，跳过直到下一个\0，避免反复拼接
+            skipping = False
+            while len(remaining_key_set) > 0:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    # 最后一个变量可能没有结尾的\0
+                    if not skipping:
+                        parse_entry(buffer)
+                    break
+
+                if skipping:
+                    index = chunk.find(b"\x00")
+                    if index == -1:
+                        continue
+                    chunk = chunk[index + 1:]
+                    skipping = False
+
+                entry_list = (buffer + chunk).split(b"\x00")
+                buffer = entry_list.pop()
+                for entry in entry_list:
+                    parse_entry(entry)
+
+                key_end = buffer.find(b"=")
+                if key_end == -1:
+                    is_unwanted = len(buffer) > max_key_length
+                else:
+                    is_unwanted = buffer[:key_end] not in remaining_key_set
+                if is_unwanted:
+                    buffer = b""
+                    skipping = True
+    except OSError:
+        return None
+
+    return environ
+
+
+class ProcReader:
+    """
+    周期内共享的批量读取器。
+
+    监控线程在每个周期开始时调用 `new_tick`，之后各GPU对同一pid的读取直接复用结果。
+    """
+
+    def __init__(self, proc_path: str = PROC_PATH) -> None:
+        self.enable: bool = os.path.isdir(proc_path)
+        self._cache: dict[int, Optional[ProcInfo]] = {}
+        self._lock = threading.Lock()
+
+    def new_tick(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def read(
+            self, pid_list: Iterable[int], detail: bool = False
+    ) -> dict[int, ProcInfo]:
+        """
+        批量读取进程信息。
+        :param pid_list: 进程号
+        :param detail: 是否读取 exe、cwd、cmdline
+        :return: {pid: ProcInfo}，不存在或无法读取的进程不在结果中
+        """
+        if not self.enable:
+            return {}
+
+        result: dict[int, ProcInfo] = {}
+        read_pid_list: list[int] = []
+        # 本周期已读取status，只需补充详细信息的进程
+        upgrade_list: list[ProcInfo] = []
+        with self._lock:
+            for pid in pid_list:
+                if pid not in self._cache:
+                    read_pid_list.append(pid)
+                    continue
+
+                proc_info = self._cache[pid]
+                if proc_info is None:
+                    continue
+                if proc_info.is_detailed or not detail:
+                    result[pid] = proc_info
+                else:
+                    upgrade_list.append(proc_info)
+
+        if len(read_pid_list) == 0 and len(upgrade_list) == 0:
+            return result
+
+        read_result: dict[int, Optional[ProcInfo]] = {}
+        for pid in read_pid_list:
+            read_result[pid] = read_proc_info(pid, detail)
+        for proc_info in upgrade_list:
+            read_result[proc_info.pid] = read_proc_detail(proc_info)
+
+        with self._lock:
+            self._cache.update(read_result)
+
+        result.update(
+            {pid: proc_info for pid, proc_info in read_result.items() if proc_info}
+        )
+        return result
+
+
+proc_reader = ProcReader()
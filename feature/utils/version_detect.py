@@ -0,0 +1,197 @@
+"""
+不启动子进程的Python/CUDA版本检测。
+
+通过读取解释器或CUDA工具包旁的元数据文件推断版本，只有全部失败时才需要调用方回退到
+`python --version`、`nvcc --version`。
+"""
+
+import json
+import os
+import re
+from glob import glob
+
+PYTHON_FULL_VERSION_PATTERN = re.compile(r"^(\d+\.\d+\.\d+)")
+PYTHON_CONDA_META_PATTERN = re.compile(r"^python-(\d+\.\d+\.\d+)-")
+PYTHON_MAJOR_MINOR_PATTERN = re.compile(r"python(\d+\.\d+)")
+PYTHON_LIB_DIR_PATTERN = re.compile(r"^python(\d+\.\d+)$")
+PYTHON_PATCHLEVEL_PATTERN = re.compile(r'#define\s+PY_VERSION\s+"(\d+\.\d+\.\d+)')
+CUDA_VERSION_TXT_PATTERN = re.compile(r"CUDA Version\s+(\d+(?:\.\d+)*)")
+
+
+def get_python_prefix_list(binary_path: str) -> list[str]:
+    """`<prefix>/bin/python`，软链接(venv)与其真实路径各对应一个prefix"""
+    prefix_list = []
+    for path in (binary_path, os.path.realpath(binary_path)):
+        prefix = os.path.dirname(os.path.dirname(path))
+        if prefix and prefix not in prefix_list:
+            prefix_list.append(prefix)
+    return prefix_list
+
+
+def detect_python_version_by_pyvenv_cfg(prefix: str) -> str:
+    try:
+        with open(os.path.join(prefix, "pyvenv.cfg"), "r") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip() not in ("version", "version_info"):
+                    continue
+                match = PYTHON_FULL_VERSION_PATTERN.match(value.strip())
+                if match:
+                    return match.group(1)
+    except OSError:
+        pass
+    return ""
+
+
+def is_python_version_matched(version: str, major_minor: str) -> bool:
+    """:param major_minor: X.Y，为空时不限制"""
+    return not major_minor or version == major_minor or version.startswith(
+        major_minor + "."
+    )
+
+
+def select_python_version(version_list: list[str], major_minor: str) -> str:
+    """
+    同一prefix下可能有多个解释器的元数据，只接受与X.Y一致的版本；
+    X.Y未知时只在候选唯一时接受，避免返回其他解释器的版本。
+    """
+    version_set = {
+        version
+        for version in version_list
+        if is_python_version_matched(version, major_minor)
+    }
+    if len(version_set) == 1:
+        return version_set.pop()
+    return ""
+
+
+def detect_python_version_by_conda_meta(prefix: str, major_minor: str = "") -> str:
+    # e.g. conda-meta/python-3.10.12-h955ad1f_0.json
+    version_list = []
+    for meta_path in glob(os.path.join(prefix, "conda-meta", "python-[0-9]*.json")):
+        match = PYTHON_CONDA_META_PATTERN.match(os.path.basename(meta_path))
+        if match:
+            version_list.append(match.group(1))
+    return select_python_version(version_list, major_minor)
+
+
+def detect_python_version_by_patchlevel(prefix: str, major_minor: str = "") -> str:
+    # e.g. include/python3.11/patchlevel.h: #define PY_VERSION "3.11.7"
+    version_list = []
+    for header_path in glob(os.path.join(prefix, "include", "python*", "patchlevel.h")):
+        try:
+            with open(header_path, "r") as f:
+                match = PYTHON_PATCHLEVEL_PATTERN.search(f.read())
+        except OSError:
+            continue
+        if match:
+            version_list.append(match.group(1))
+    return select_python_version(version_list, major_minor)
+
+
+def detect_python_version_by_lib_dir(prefix: str) -> str:
+    """只能得到X.Y，lib下有多个 `pythonX.Y` 目录时无法确定，返回空字符串"""
+    try:
+        lib_name_list = os.listdir(os.path.join(prefix, "lib"))
+    except OSError:
+        return ""
+
+    version_list = []
+    for lib_name in lib_name_list:
+        match = PYTHON_LIB_DIR_PATTERN.match(lib_name)
+        if match:
+            version_list.append(match.group(1))
+    return select_python_version(version_list, "")
+
+
+def detect_python_version_by_maps(pid: int) -> str:
+    """动态链接libpython的解释器会在内存映射中出现 `libpythonX.Y`"""
+    try:
+        with open(f"/proc/{pid}/maps", "r") as f:
+            for line in f:
+                if "libpython" not in line:
+                    continue
+                match = PYTHON_MAJOR_MINOR_PATTERN.search(line)
+                if match:
+                    return match.group(1)
+    except OSError:
+        pass
+    return ""
+
+
+def detect_python_version_by_exe_name(binary_path: str) -> str:
+    for path in (binary_path, os.path.realpath(binary_path)):
+        match = PYTHON_MAJOR_MINOR_PATTERN.search(os.path.basename(path))
+        if match:
+            return match.group(1)
+    return ""
+
+
+def detect_python_version(binary_path: str, pid: int = -1) -> str:
+    """
+    推断解释器版本，优先返回完整版本号(X.Y.Z)，其次为X.Y。
+    :param binary_path: 解释器路径
+    :param pid: 解释器进程号，用于读取 `/proc/<pid>/maps`
+    :return: 版本号，无法推断时为空字符串
+    """
+    if not binary_path:
+        return ""
+
+    # 先由内存映射或文件名确定X.Y，用于筛选同一prefix下多个解释器的元数据
+    major_minor = detect_python_version_by_maps(pid) if pid > 0 else ""
+    major_minor = major_minor or detect_python_version_by_exe_name(binary_path)
+
+    prefix_list = get_python_prefix_list(binary_path)
+    for prefix in prefix_list:
+        version = detect_python_version_by_pyvenv_cfg(prefix)
+        if version and is_python_version_matched(version, major_minor):
+            return version
+
+    for detect in (
+            detect_python_version_by_conda_meta,
+            detect_python_version_by_patchlevel,
+    ):
+        for prefix in prefix_list:
+            version = detect(prefix, major_minor)
+            if version:
+                return version
+
+    if major_minor:
+        return major_minor
+
+    for prefix in prefix_list:
+        version = detect_python_version_by_lib_dir(prefix)
+        if version:
+            return version
+
+    return ""
+
+
+def detect_cuda_version(cuda_root: str) -> str:
+    """
+    读取CUDA工具包中的 `version.json`(11.1+) 或 `version.txt`。
+
+    与 `nvcc --version` 保持一致，优先使用nvcc组件的版本号。
+    """
+    if not cuda_root:
+        return ""
+
+    try:
+        with open(os.path.join(cuda_root, "version.json"), "r") as f:
+            version_dict: dict = json.load(f)
+        for component in ("cuda_nvcc", "cuda"):
+            version = str(version_dict.get(component, {}).get("version", "")).strip()
+            if version:
+                return version
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        with open(os.path.join(cuda_root, "version.txt"), "r") as f:
+            match = CUDA_VERSION_TXT_PATTERN.search(f.read())
+        if match:
+            return match.group(1)
+    except OSError:
+        pass
+
+    return ""